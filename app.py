@@ -5,7 +5,6 @@ Streamlit app for mass contact enrichment
 """
 
 import streamlit as st
-import pandas as pd
 import os
 import sys
 from pathlib import Path
@@ -18,10 +17,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 # Load environment
 load_dotenv()
 
-from src.apollo_client import ApolloClient
-from src.notion_client import NotionClient
-from src.llm_helper import AITargeting
 from src.auth_manager import AuthManager
+from src.enrichment import enrich_contact_flexible, contact_work_item, target_company, targeting_work_item
+from src.retry_queue import RetryQueue, PERMANENT_ERROR_CLASSES
+from src.client_registry import get_client_registry
+from src.telemetry import set_tags, tagged, get_telemetry
+from src.ops_metrics import get_ops_metrics
+from src.credit_ledger import CreditLedger
 from datetime import datetime, timedelta
 
 # Page config
@@ -278,103 +280,6 @@ def validate_env():
     return len(missing) == 0, missing
 
 
-def enrich_contact_flexible(row, apollo, notion):
-    """
-    Enrich contact with flexible search priority:
-    1. LinkedIn URL (unique key)
-    2. Email (unique key)
-    3. Name + Company (composite key)
-    """
-    try:
-        # Extract available fields
-        linkedin_url = row.get('linkedin_url', '').strip() if 'linkedin_url' in row else ''
-        email = row.get('email', '').strip() if 'email' in row else ''
-        person_name = row.get('person_name', '').strip() if 'person_name' in row else ''
-        company_name = row.get('company_name', '').strip() if 'company_name' in row else ''
-
-        person_data = None
-        company_data = None
-        search_method = ''
-
-        # Priority 1: LinkedIn URL (highest priority)
-        if linkedin_url and 'linkedin.com' in linkedin_url.lower():
-            search_method = 'LinkedIn'
-            person_data, company_data = apollo.search_by_linkedin_url(linkedin_url)
-
-        # Priority 2: Email
-        if not person_data and email and '@' in email:
-            search_method = 'Email'
-            person_data, company_data = apollo.search_by_email(email)
-
-        # Priority 3: Name + Company
-        if not person_data and person_name and company_name:
-            search_method = 'Name+Company'
-            company_data = apollo.search_company(company_name)
-            if company_data:
-                person_data = apollo.search_person_by_name(person_name, company_name)
-
-        # If still no data found
-        if not person_data:
-            identifier = linkedin_url or email or person_name or 'Unknown'
-            return {
-                'status': 'failed',
-                'person': identifier,
-                'company': company_name or 'Unknown',
-                'message': f'Not found in Apollo (tried: {search_method or "none"})',
-                'data': {}
-            }
-
-        # Extract final names
-        final_person_name = person_data.get('name', person_name or email or linkedin_url)
-        final_company_name = company_data.get('name', company_name) if company_data else company_name
-
-        # Check if exists in Notion
-        existing = notion.find_contact(final_person_name, final_company_name)
-        if existing:
-            return {
-                'status': 'skipped',
-                'person': final_person_name,
-                'company': final_company_name,
-                'message': f'Already exists (found via {search_method})',
-                'data': person_data
-            }
-
-        # Upsert to Notion
-        success, action = notion.upsert_contact(
-            contact_name=final_person_name,
-            company_name=final_company_name,
-            enriched_data=person_data,
-            company_data=company_data
-        )
-
-        if success:
-            return {
-                'status': 'success',
-                'person': final_person_name,
-                'company': final_company_name,
-                'message': f'{action.capitalize()}d via {search_method}',
-                'data': person_data
-            }
-        else:
-            return {
-                'status': 'failed',
-                'person': final_person_name,
-                'company': final_company_name,
-                'message': 'Failed to write to Notion',
-                'data': {}
-            }
-
-    except Exception as e:
-        identifier = row.get('person_name') or row.get('email') or row.get('linkedin_url') or 'Unknown'
-        return {
-            'status': 'failed',
-            'person': str(identifier),
-            'company': row.get('company_name', 'Unknown'),
-            'message': str(e),
-            'data': {}
-        }
-
-
 def check_session_timeout():
     """Check if session has timed out (20 minutes)"""
     if 'last_activity' in st.session_state:
@@ -384,8 +289,7 @@ def check_session_timeout():
 
         if time_elapsed > timedelta(minutes=timeout_minutes):
             # Session expired
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
+            end_user_session()
             return True
 
     # Update last activity
@@ -393,6 +297,47 @@ def check_session_timeout():
     return False
 
 
+def start_user_session(user_data):
+    """
+    Mark the session logged in and register the user's credentials server-side
+
+    Decrypted keys live in the process-wide client registry keyed by user id,
+    never in os.environ, so concurrent users can't see each other's keys.
+    """
+    get_client_registry().register(user_data)
+
+    # Store in session state
+    st.session_state.user_id = user_data['id']
+    st.session_state.user_email = user_data['email']
+    st.session_state.logged_in = True
+    st.session_state.last_activity = datetime.now()
+    st.session_state.ai_provider = user_data['ai_provider']
+
+
+def end_user_session():
+    """Log out: drop the user's cached credentials and clear all session state"""
+    if 'user_id' in st.session_state:
+        get_client_registry().evict(st.session_state.user_id)
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+def get_user_clients():
+    """
+    Get this user's warm API clients from the registry
+
+    Returns None if the registry entry expired (e.g. after a server restart);
+    the caller should send the user back to the login screen.
+    """
+    clients = get_client_registry().get(st.session_state.get('user_id'))
+    if clients is not None:
+        # Same objects every rerun; kept in session_state for existing call sites.
+        # Pipelines write to the local warehouse; its worker syncs Notion in the background
+        st.session_state.apollo = clients.apollo
+        st.session_state.notion = clients.crm
+    return clients
+
+
 def show_login_screen():
     """Show login screen for existing users"""
     st.markdown('<p class="main-header">🏥 Ping CRM - Login</p>', unsafe_allow_html=True)
@@ -448,23 +393,7 @@ def show_login_screen():
                         st.success(f"✅ {message}")
                         st.balloons()
 
-                        # Store in session state
-                        st.session_state.user_email = user_data['email']
-                        st.session_state.logged_in = True
-                        st.session_state.last_activity = datetime.now()
-
-                        # Set environment variables for this session
-                        os.environ['APOLLO_API_KEY'] = user_data['apollo_key']
-                        os.environ['NOTION_TOKEN'] = user_data['notion_token']
-                        os.environ['NOTION_DB_ID'] = user_data['notion_db_id']
-
-                        if user_data.get('ai_key'):
-                            if user_data['ai_provider'] == 'openai':
-                                os.environ['OPENAI_API_KEY'] = user_data['ai_key']
-                            else:
-                                os.environ['GEMINI_API_KEY'] = user_data['ai_key']
-
-                        st.session_state.ai_provider = user_data['ai_provider']
+                        start_user_session(user_data)
 
                         time.sleep(1)  # Brief pause to show success message
                         st.rerun()
@@ -624,23 +553,7 @@ def show_register_screen():
                         # Auto-login after registration
                         _, _, user_data = auth.login_user(email, password)
 
-                        # Store in session state
-                        st.session_state.user_email = user_data['email']
-                        st.session_state.logged_in = True
-                        st.session_state.last_activity = datetime.now()
-
-                        # Set environment variables
-                        os.environ['APOLLO_API_KEY'] = user_data['apollo_key']
-                        os.environ['NOTION_TOKEN'] = user_data['notion_token']
-                        os.environ['NOTION_DB_ID'] = user_data['notion_db_id']
-
-                        if user_data.get('ai_key'):
-                            if user_data['ai_provider'] == 'openai':
-                                os.environ['OPENAI_API_KEY'] = user_data['ai_key']
-                            else:
-                                os.environ['GEMINI_API_KEY'] = user_data['ai_key']
-
-                        st.session_state.ai_provider = user_data['ai_provider']
+                        start_user_session(user_data)
 
                         time.sleep(2)  # Show success message
                         st.rerun()
@@ -656,6 +569,266 @@ def show_register_screen():
             st.rerun()
 
 
+def get_retry_queue():
+    """Get the retry queue for this session"""
+    if 'retry_queue' not in st.session_state:
+        st.session_state.retry_queue = RetryQueue()
+    return st.session_state.retry_queue
+
+
+def get_fingerprints():
+    """Get the content fingerprint store for this user's Notion database"""
+    return get_user_clients().fingerprints
+
+
+def record_failed_row(row, result):
+    """Queue a failed CSV row for deferred retry (transient errors only)"""
+    error_class = result.get('error_class', 'unknown')
+    if result['status'] != 'failed' or error_class in PERMANENT_ERROR_CLASSES:
+        return
+
+    get_retry_queue().enqueue(
+        kind='contact',
+        payload=contact_work_item(row),
+        error_class=error_class,
+        error_message=result['message'],
+        owner=st.session_state.user_email
+    )
+
+
+def record_failed_target(work_item, result):
+    """Queue a failed AI targeting row for deferred retry (transient errors only)"""
+    error_class = result.get('error_class', 'unknown')
+    if result['status'] != 'error' or error_class in PERMANENT_ERROR_CLASSES:
+        return
+
+    get_retry_queue().enqueue(
+        kind='targeting',
+        payload=work_item,
+        error_class=error_class,
+        error_message=result['message'],
+        owner=st.session_state.user_email
+    )
+
+
+def replay_due_rows():
+    """Replay this user's due retry-queue items with the session clients"""
+    with tagged(job='retry_queue'):
+        return get_retry_queue().process_due(
+            handlers={
+                'contact': lambda payload: enrich_contact_flexible(
+                    payload,
+                    st.session_state.apollo,
+                    st.session_state.notion,
+                    get_fingerprints()
+                ),
+                'targeting': lambda payload: target_company(
+                    apollo=st.session_state.apollo,
+                    notion=st.session_state.notion,
+                    fingerprints=get_fingerprints(),
+                    **payload
+                )
+            },
+            owner=st.session_state.user_email
+        )
+
+
+def get_credit_ledger():
+    """Get the Apollo credit ledger for this session"""
+    if 'credit_ledger' not in st.session_state:
+        st.session_state.credit_ledger = CreditLedger()
+    return st.session_state.credit_ledger
+
+
+def record_job_row(job, status, started, credits_before):
+    """Feed the operations dashboard: row throughput and Apollo credits spent"""
+    get_ops_metrics().record_rows(job, status, time.perf_counter() - started)
+    get_credit_ledger().record(job, st.session_state.apollo.credits_used - credits_before)
+
+
+def show_retry_queue():
+    """Show failed rows waiting for retry, with replay controls"""
+    queue = get_retry_queue()
+    owner = st.session_state.user_email
+    counts = queue.counts(owner=owner)
+
+    st.subheader("🔁 Retry Queue")
+    st.caption("Rows that failed with transient errors are retried automatically with backoff")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("⏳ Pending", counts['pending'])
+    col2.metric("✅ Recovered", counts['resolved'])
+    col3.metric("☠️ Gave Up", counts['dead'])
+
+    if not counts['pending'] and not counts['dead']:
+        return
+
+    with st.expander("📋 Queued rows", expanded=False):
+        import pandas as pd
+        items = queue.list_items(owner=owner)
+        st.dataframe(pd.DataFrame([{
+            'ID': item['id'],
+            'Row': ', '.join(v for v in item['payload'].values() if v and isinstance(v, str)),
+            'Status': item['status'].upper(),
+            'Error': item['error_class'],
+            'Attempts': item['attempts'],
+            'Next Attempt (UTC)': item['next_attempt_at'] if item['status'] == 'pending' else '—',
+            'Message': item['error_message']
+        } for item in items if item['status'] != 'resolved']), use_container_width=True, hide_index=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if st.button("▶️ Retry Due Now", use_container_width=True, key="retry_due_now"):
+            with st.spinner("Replaying failed rows..."):
+                summary = replay_due_rows()
+            st.success(f"Recovered {summary['resolved']}, still failing {summary['failed']}")
+
+    with col2:
+        if st.button("♻️ Requeue All", use_container_width=True, key="retry_requeue_all"):
+            queue.requeue(status='dead', owner=owner)
+            queue.requeue(status='pending', owner=owner)
+            st.rerun()
+
+    with col3:
+        if st.button("🧹 Clear Recovered", use_container_width=True, key="retry_clear_resolved"):
+            queue.purge(status='resolved', owner=owner)
+            st.rerun()
+
+
+def show_notion_sync():
+    """Show changes waiting to be pushed from the warehouse to Notion"""
+    warehouse = get_user_clients().warehouse
+    counts = warehouse.counts()
+
+    st.subheader("🔄 Notion Sync")
+    st.caption("Contacts are saved locally first and pushed to Notion in the background")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📇 Contacts", counts['contacts'])
+    col2.metric("⏳ Waiting for Notion", counts['outbox_pending'])
+    col3.metric("☠️ Gave Up", counts['outbox_dead'])
+
+    if counts['outbox_dead']:
+        with st.expander("📋 Failed changes", expanded=False):
+            import pandas as pd
+            st.dataframe(pd.DataFrame([{
+                'Change': change['op'],
+                'Error': change['error_class'],
+                'Attempts': change['attempts'],
+                'Message': change['error_message'],
+                'Updated (UTC)': change['updated_at']
+            } for change in warehouse.failed_changes()]), use_container_width=True, hide_index=True)
+
+        if st.button("♻️ Retry Failed Changes", use_container_width=True, key="sync_requeue_dead"):
+            warehouse.requeue_failed()
+            get_user_clients().sync_worker.notify()
+            st.rerun()
+
+
+def show_ops_dashboard(ops):
+    """Admin-only view of throughput, provider latency, caches, queues and credits"""
+    import pandas as pd
+    from src.password_hasher import get_hasher
+
+    ops.register_queue("Retry queue (pending)", lambda: get_retry_queue().counts()['pending'])
+    ops.register_queue("Logins in progress", lambda: get_hasher().pending)
+    warehouse = get_user_clients().warehouse
+    ops.register_queue("Notion sync backlog", lambda: warehouse.backlog(all_scopes=True))
+
+    st.subheader("📊 Operations")
+    col_window, col_refresh = st.columns([3, 1])
+    window = col_window.select_slider(
+        "Live window",
+        options=[5, 15, 60, 240],
+        value=15,
+        format_func=lambda minutes: f"{minutes} min"
+    )
+    with col_refresh:
+        if st.button("🔄 Refresh", use_container_width=True, key="ops_refresh"):
+            st.rerun()
+
+    # Rows/sec per job (all app sessions and CLI jobs)
+    st.markdown("#### Throughput")
+    throughput = ops.job_throughput(window)
+    if throughput:
+        for col, (job, stats) in zip(st.columns(len(throughput)), throughput.items()):
+            col.metric(
+                job,
+                f"{stats['rows_per_sec']} rows/s",
+                f"{stats['rows']} rows · {stats['failed']} failed",
+                delta_color="off"
+            )
+        st.caption("Rows/sec is measured over processing time, excluding the delay between requests")
+    else:
+        st.caption("No rows processed in this window")
+
+    # Per-provider latency and 429s
+    st.markdown("#### API Providers")
+    providers = ops.provider_totals(window)
+    live = get_telemetry().snapshot()['services']
+    if providers:
+        st.dataframe(pd.DataFrame([{
+            'Provider': name,
+            'Calls': stats['calls'],
+            'Mean (ms)': stats['mean_ms'],
+            'p50 (ms)': live.get(name, {}).get('p50_ms', '—'),
+            'p99 (ms)': live.get(name, {}).get('p99_ms', '—'),
+            '429s': stats['rate_limited'],
+            'Retries': stats['retries'],
+            'Errors': stats['errors']
+        } for name, stats in providers.items()]), use_container_width=True, hide_index=True)
+        st.caption("Calls, mean latency and 429s cover every process; p50/p99 are this server since it started")
+    else:
+        st.caption("No API calls in this window")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("#### Cache Hit Ratio (24h)")
+        caches = ops.cache_ratios(hours=24)
+        for name, stats in caches.items():
+            st.metric(name, f"{stats['hit_ratio']:.0%}", f"{stats['hits']} hits · {stats['misses']} misses", delta_color="off")
+        if not caches:
+            st.caption("No cache lookups recorded")
+
+    with col2:
+        st.markdown("#### Queue Depths")
+        for name, depth in ops.queue_depths().items():
+            st.metric(name, '—' if depth is None else depth)
+
+    with col3:
+        st.markdown("#### Apollo Credits")
+        ledger = get_credit_ledger()
+        st.metric("Spent today", ledger.spent())
+        credit_history = ledger.history(days=14)
+
+    # Historical charts
+    st.markdown("#### Last 24 Hours")
+    history = ops.history(hours=24)
+
+    if history['rows']:
+        st.caption("Rows per minute by job")
+        st.line_chart(pd.DataFrame(history['rows']).pivot_table(
+            index='minute', columns='job', values='rows', aggfunc='sum'
+        ).fillna(0))
+
+    if history['api']:
+        api = pd.DataFrame(history['api'])
+        st.caption("Mean latency per provider (ms)")
+        st.line_chart(api.pivot_table(index='minute', columns='service', values='mean_ms', aggfunc='mean'))
+        if api['rate_limited'].sum():
+            st.caption("429 responses per minute")
+            st.bar_chart(api.pivot_table(index='minute', columns='service', values='rate_limited', aggfunc='sum').fillna(0))
+
+    if credit_history:
+        st.caption("Apollo credits per day by job")
+        st.bar_chart(pd.DataFrame.from_dict(credit_history, orient='index').fillna(0))
+
+    if not (history['rows'] or history['api'] or credit_history):
+        st.caption("No activity recorded yet")
+
+
 def main():
     """Main app"""
 
@@ -675,6 +848,21 @@ def main():
         st.rerun()
         return
 
+    # Credentials are held server-side; gone after a restart or idle eviction
+    if get_user_clients() is None:
+        end_user_session()
+        st.warning("🔐 Please login again to continue.")
+        time.sleep(2)
+        st.rerun()
+        return
+
+    # Tag this run's API calls for telemetry (jobs below narrow `job`)
+    set_tags(user=st.session_state.user_email, job='app')
+    ops = get_ops_metrics()
+
+    # Loaded after login so the login screen paints without pandas/numpy
+    import pandas as pd
+
     # Show user info in sidebar
     with st.sidebar:
         st.markdown(f"### 👤 Logged in as:")
@@ -689,9 +877,7 @@ def main():
             st.caption(f"⏱️ Session expires in: {minutes_remaining} min")
 
         if st.button("🚪 Logout", use_container_width=True):
-            # Clear all session state
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
+            end_user_session()
             st.rerun()
 
         st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
@@ -748,6 +934,21 @@ def main():
                 label_visibility="collapsed"
             )
 
+            st.markdown("**Login Performance**")
+            login_stats = AuthManager().login_metrics()
+            login_latency = login_stats['latency_ms'].get('login')
+            if login_latency:
+                st.caption(
+                    f"p50 {login_latency['p50']} ms · p90 {login_latency['p90']} ms · "
+                    f"p99 {login_latency['p99']} ms ({login_latency['count']} logins)"
+                )
+            else:
+                st.caption("No logins recorded yet")
+            st.caption(
+                f"bcrypt cost {login_stats['rounds']} · {login_stats['workers']} workers · "
+                f"{login_stats['pending']}/{login_stats['max_pending']} in progress"
+            )
+
         st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
 
         # Templates Section
@@ -797,19 +998,13 @@ def main():
         st.caption("Version 1.0 with AI Targeting")
 
     # Main content - AI Company Targeting is now the primary feature
-    tab1, tab2 = st.tabs(["🎯 AI Company Targeting", "👥 Enrich Profiles"])
+    tab_names = ["🎯 AI Company Targeting", "👥 Enrich Profiles"]
+    if AuthManager.is_admin(st.session_state.user_email):
+        tab_names.append("📊 Operations")
+    tab1, tab2, *admin_tabs = st.tabs(tab_names)
 
     with tab1:
         # AI Company Targeting Tab (Primary Feature)
-        # Initialize clients
-        if 'apollo' not in st.session_state:
-            with st.spinner("Initializing API clients..."):
-                st.session_state.apollo = ApolloClient(os.getenv('APOLLO_API_KEY'))
-                st.session_state.notion = NotionClient(
-                    os.getenv('NOTION_TOKEN'),
-                    os.getenv('NOTION_DB_ID')
-                )
-
         # Streamlined header
         st.markdown("### 🎯 AI-Powered Company Targeting")
         st.markdown("---")
@@ -991,7 +1186,7 @@ def main():
             # Preview AI strategy
             if preview_button and user_description:
                 with st.spinner("🤖 AI is analyzing your request..."):
-                    ai = AITargeting()
+                    ai = get_user_clients().ai_targeting
 
                     # Get industry context from first company
                     first_company = st.session_state.df_companies.iloc[0]['company_name']
@@ -1036,7 +1231,7 @@ def main():
                 # Get or generate AI strategy
                 if 'ai_strategy' not in st.session_state:
                     with st.spinner("🤖 AI is analyzing your goal..."):
-                        ai = AITargeting()
+                        ai = get_user_clients().ai_targeting
 
                         # Get industry context from first company
                         first_company = st.session_state.df_companies.iloc[0]['company_name']
@@ -1095,111 +1290,40 @@ def main():
                 # Process each company
                 df_companies = st.session_state.df_companies
                 total_companies = len(df_companies)
+                set_tags(job='ai_targeting')
 
                 for idx, row in df_companies.iterrows():
                     company_name = row['company_name']
 
                     status_text.info(f"Processing {idx + 1}/{total_companies}: {company_name}")
 
-                    try:
-                        # Search company
-                        company_data = st.session_state.apollo.search_company(company_name)
-
-                        if not company_data:
-                            st.session_state.company_results.append({
-                                'company': company_name,
-                                'status': 'not_found',
-                                'found': 0,
-                                'added': 0,
-                                'people': []
-                            })
-                            continue
-
-                        # Search people with AI strategy
-                        people = st.session_state.apollo.search_people_by_company(
-                            company_id=company_data['apollo_id'],
-                            titles=strategy['titles'],
-                            seniorities=strategy['seniorities'],
-                            locations=strategy.get('locations'),
-                            max_results=num_people
-                        )
-
-                        # Add to Notion
-                        added_count = 0
-                        skipped_count = 0
-
-                        for person in people:
-                            # Check if exists
-                            existing = st.session_state.notion.find_contact(
-                                person['name'],
-                                company_data['name']
-                            )
-
-                            if existing:
-                                skipped_count += 1
-                                continue
-
-                            # Filter person data based on user's field selections
-                            field_selections = st.session_state.get('field_selections', {})
-                            filtered_person = {'name': person['name']}  # Name is always included
-
-                            if field_selections.get('email', True):
-                                filtered_person['email'] = person.get('email')
-                            if field_selections.get('phone', True):
-                                filtered_person['phone'] = person.get('phone')
-                            if field_selections.get('linkedin_url', True):
-                                filtered_person['linkedin_url'] = person.get('linkedin_url')
-                            if field_selections.get('title', True):
-                                filtered_person['title'] = person.get('title')
-                            if field_selections.get('city', True):
-                                filtered_person['city'] = person.get('city')
-                            if field_selections.get('state', True):
-                                filtered_person['state'] = person.get('state')
-                            if field_selections.get('country', True):
-                                filtered_person['country'] = person.get('country')
-                            if field_selections.get('seniority', True):
-                                filtered_person['seniority'] = person.get('seniority')
-
-                            # Filter company data if not selected
-                            filtered_company = company_data if field_selections.get('company_info', True) else None
-
-                            # Add to Notion with personalized outreach context and filtered data
-                            success, action = st.session_state.notion.upsert_contact(
-                                contact_name=person['name'],
-                                company_name=company_data['name'],
-                                enriched_data=filtered_person,
-                                company_data=filtered_company,
-                                outreach_context=user_description  # Pass user's goal as context
-                            )
-
-                            if success:
-                                added_count += 1
-
-                        # Store results
-                        st.session_state.company_results.append({
-                            'company': company_name,
-                            'status': 'success',
-                            'found': len(people),
-                            'added': added_count,
-                            'skipped': skipped_count,
-                            'people': people
-                        })
+                    row_started = time.perf_counter()
+                    credits_before = st.session_state.apollo.credits_used
+                    work_item = targeting_work_item(
+                        company_name,
+                        strategy,
+                        field_selections=st.session_state.get('field_selections', {}),
+                        outreach_context=user_description,  # Pass user's goal as context
+                        max_results=num_people
+                    )
+                    result = target_company(
+                        apollo=st.session_state.apollo,
+                        notion=st.session_state.notion,
+                        fingerprints=get_fingerprints(),
+                        **work_item
+                    )
+                    st.session_state.company_results.append(result)
+                    record_job_row('ai_targeting', result['status'], row_started, credits_before)
+                    record_failed_target(work_item, result)
 
+                    if result['status'] == 'success':
                         # Update stats
                         st.session_state.company_stats['companies_processed'] += 1
-                        st.session_state.company_stats['total_found'] += len(people)
-                        st.session_state.company_stats['total_added'] += added_count
-                        st.session_state.company_stats['total_skipped'] += skipped_count
-
-                    except Exception as e:
-                        st.session_state.company_results.append({
-                            'company': company_name,
-                            'status': 'error',
-                            'found': 0,
-                            'added': 0,
-                            'error': str(e),
-                            'people': []
-                        })
+                        st.session_state.company_stats['total_found'] += result['found']
+                        st.session_state.company_stats['total_added'] += result['added']
+                        st.session_state.company_stats['total_skipped'] += result['skipped']
+                    elif result['status'] == 'not_found':
+                        continue
 
                     # Update progress
                     progress = (idx + 1) / total_companies
@@ -1316,15 +1440,6 @@ def main():
         st.subheader("💼 Quick Single Lookup")
         st.caption("🔍 Look up a single contact by LinkedIn URL or Email address")
 
-        # Initialize clients if not already
-        if 'apollo' not in st.session_state:
-            with st.spinner("Initializing API clients..."):
-                st.session_state.apollo = ApolloClient(os.getenv('APOLLO_API_KEY'))
-                st.session_state.notion = NotionClient(
-                    os.getenv('NOTION_TOKEN'),
-                    os.getenv('NOTION_DB_ID')
-                )
-
         # Input for LinkedIn or Email
         single_input = st.text_input(
             "LinkedIn URL or Email",
@@ -1458,22 +1573,25 @@ def main():
                 # Check if already exists
                 existing = st.session_state.notion.find_contact(
                     person_data['name'],
-                    company_data.get('name', '') if company_data else ''
+                    company_data.get('name', '') if company_data else '',
+                    email=person_data.get('email'),
+                    linkedin_url=person_data.get('linkedin_url')
                 )
 
                 if existing:
                     st.warning(f"⚠️ Contact already exists in Notion: {person_data['name']}")
                 else:
-                    # Add to Notion
-                    success, action = st.session_state.notion.upsert_contact(
+                    # Add to Notion (the check above already found nothing)
+                    result = st.session_state.notion.upsert_contact(
                         contact_name=person_data['name'],
                         company_name=company_data.get('name', '') if company_data else '',
                         enriched_data=person_data,
-                        company_data=company_data
+                        company_data=company_data,
+                        checked=True
                     )
 
-                    if success:
-                        st.success(f"✅ Successfully {action}d **{person_data['name']}** to Notion!")
+                    if result.success:
+                        st.success(f"✅ Successfully {result.action} **{person_data['name']}** (syncing to Notion in the background)")
                         st.balloons()
                         # Clear results after successful add
                         st.session_state.show_single_lookup_results = False
@@ -1519,15 +1637,6 @@ def main():
 
                 st.success(f"✅ Loaded {len(df)} contacts")
 
-                # Initialize clients
-                if 'apollo' not in st.session_state:
-                    with st.spinner("Initializing API clients..."):
-                        st.session_state.apollo = ApolloClient(os.getenv('APOLLO_API_KEY'))
-                        st.session_state.notion = NotionClient(
-                            os.getenv('NOTION_TOKEN'),
-                            os.getenv('NOTION_DB_ID')
-                        )
-
                 # Start enrichment
                 st.subheader("3️⃣ Start Enrichment")
 
@@ -1565,6 +1674,7 @@ def main():
 
                     # Process contacts
                     total = len(df)
+                    set_tags(job='csv_enrichment')
 
                     for idx in range(st.session_state.current_index, total):
                         row = df.iloc[idx]
@@ -1580,15 +1690,20 @@ def main():
                         status_text.info(f"Processing {idx + 1}/{total}: {identifier}")
 
                         # Enrich using flexible priority search
+                        row_started = time.perf_counter()
+                        credits_before = st.session_state.apollo.credits_used
                         result = enrich_contact_flexible(
                             row,
                             st.session_state.apollo,
-                            st.session_state.notion
+                            st.session_state.notion,
+                            get_fingerprints()
                         )
 
-                        # Store result
+                        # Store result (transient failures go to the retry queue)
                         st.session_state.results.append(result)
                         st.session_state.stats[result['status']] += 1
+                        record_failed_row(row, result)
+                        record_job_row('csv_enrichment', result['status'], row_started, credits_before)
                         st.session_state.current_index = idx + 1
 
                         # Update progress
@@ -1624,6 +1739,11 @@ def main():
                     st.session_state.enrichment_running = False
                     status_text.success(f"✅ Enrichment complete! Processed {total} contacts")
 
+                    # Replay earlier failures whose backoff has elapsed
+                    replayed = replay_due_rows()
+                    if replayed['resolved'] or replayed['failed']:
+                        st.info(f"🔁 Retry queue: recovered {replayed['resolved']}, still failing {replayed['failed']}")
+
                     # Final summary
                     st.balloons()
 
@@ -1637,6 +1757,18 @@ def main():
             except Exception as e:
                 st.error(f"❌ Error: {e}")
 
+        # Failed rows waiting for retry
+        st.markdown("---")
+        show_retry_queue()
+
+        # Local changes not yet in Notion
+        st.markdown("---")
+        show_notion_sync()
+
+    if admin_tabs:
+        with admin_tabs[0]:
+            show_ops_dashboard(ops)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+HTTP Connection Pool Benchmark
+Bursts of concurrent people searches share one ApolloClient against a local
+mock Apollo (benchmarks/mock_servers.py). Reports requests/sec, p50/p99 and
+how many connections each pool size had to open: a pool smaller than the
+burst keeps only that many connections when the burst ends, so every burst
+opens the rest again.
+
+Usage:
+    python benchmarks/bench_http_pool.py [--workers 32] [--bursts 20] [--pool-sizes 10,32]
+                                         [--latency-ms 20] [--per-page 100]
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mock_servers import MockConfig, MockServer, apollo_routes
+from src.apollo_client import ApolloClient
+from src.company_index import CompanyIndex
+from src.password_hasher import LatencyTracker
+from src.people_cache import PeopleSearchCache
+
+console = Console()
+
+
+def option(args: list, name: str, default: str) -> str:
+    """Read a `--name value` option"""
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def bench(base_url: str, pool_size: int, workers: int, bursts: int, per_page: int) -> dict:
+    """Run `bursts` rounds of `workers` simultaneous people searches through one client"""
+    latency = LatencyTracker(window=workers * bursts)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        apollo = ApolloClient(
+            'bench',
+            base_url=base_url,
+            company_index=CompanyIndex(db_path=f'{tmp}/company_index.db'),
+            people_cache=PeopleSearchCache(db_path=f'{tmp}/people_cache.db'),
+            pool_size=pool_size
+        )
+
+        def search(company_id):
+            started = time.perf_counter()
+            apollo.fetch_people_by_company(company_id, ['CEO'], max_results=per_page)
+            latency.record('search', time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Like a page of CSV rows enriched at once, then the next page
+            for burst in range(bursts):
+                list(pool.map(search, [f'org_{burst}_{n}' for n in range(workers)]))
+        elapsed = time.perf_counter() - started
+
+    stats = apollo.session.get_adapter(base_url).stats()
+    return {
+        **stats,
+        'throughput': stats['requests'] / elapsed,
+        'search': latency.percentiles('search')
+    }
+
+
+def main():
+    """Run the benchmark"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        console.print(__doc__)
+        return 0
+
+    workers = int(option(args, '--workers', '32'))
+    bursts = int(option(args, '--bursts', '20'))
+    pool_sizes = [int(size) for size in option(args, '--pool-sizes', f'10,{workers}').split(',')]
+    per_page = int(option(args, '--per-page', '100'))
+    latency_ms = float(option(args, '--latency-ms', '20'))
+
+    # urllib3 warns on every connection an undersized pool discards
+    logging.getLogger('urllib3').setLevel(logging.ERROR)
+
+    server = MockServer('apollo', apollo_routes(), MockConfig(latency_ms=latency_ms)).start()
+    try:
+        table = Table(
+            title=f"\n{bursts} bursts of {workers} people searches ({per_page} per page, {latency_ms:.0f} ms latency)",
+            show_header=True, header_style="bold cyan"
+        )
+        table.add_column("Pool size", justify="right", style="cyan")
+        table.add_column("Requests/sec", justify="right", style="magenta")
+        table.add_column("p50", justify="right")
+        table.add_column("p99", justify="right", style="yellow")
+        table.add_column("Connections opened", justify="right")
+        table.add_column("Reused", justify="right", style="green")
+
+        for pool_size in pool_sizes:
+            console.print(f"Benchmarking pool size {pool_size}...")
+            result = bench(f"{server.url}/v1", pool_size, workers, bursts, per_page)
+            table.add_row(
+                str(pool_size),
+                f"{result['throughput']:.0f}",
+                f"{result['search']['p50']} ms",
+                f"{result['search']['p99']} ms",
+                str(result['connections_opened']),
+                f"{result['reuse_ratio']:.0%}"
+            )
+    finally:
+        server.stop()
+
+    console.print(table)
+    console.print(
+        "\n[dim]Set APOLLO_POOL_SIZE (or HTTP_POOL_SIZE) to at least the number of "
+        "threads calling Apollo at once.[/dim]\n"
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+JSON Decode Benchmark
+Decodes 100-person Apollo people-search pages (mock people padded to the
+size of real ones) with the standard library, orjson and msgspec's typed
+decoder (src/fast_json.py), and reports decode time alone and decode +
+normalization per page. Backends that aren't installed are skipped.
+
+Usage:
+    python benchmarks/bench_json.py [--pages 200] [--per-page 100] [--repeat 5]
+"""
+
+import gc
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mock_servers import fake_organization, fake_person
+from src import fast_json
+from src.apollo_client import ApolloClient
+from src.company_index import CompanyIndex
+from src.people_cache import PeopleSearchCache
+
+console = Console()
+
+
+def option(args: list, name: str, default: str) -> str:
+    """Read a `--name value` option"""
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def apollo_extras(i: int) -> dict:
+    """Fields a real Apollo person carries that the mock's doesn't (and ApolloClient never reads)"""
+    return {
+        'headline': f'Executive at Health Company {i}',
+        'photo_url': f'https://static.licdn.com/aero-v1/sc/h/{i:08x}',
+        'twitter_url': None,
+        'github_url': None,
+        'facebook_url': None,
+        'email_status': 'verified',
+        'extrapolated_email_confidence': None,
+        'departments': ['c_suite', 'master_operations'],
+        'subdepartments': ['operations_executive'],
+        'functions': ['operations'],
+        'intent_strength': None,
+        'show_intent': False,
+        'is_likely_to_engage': True,
+        'employment_history': [
+            {
+                'id': f'emp_{i}_{job}',
+                'organization_name': f'Previous Employer {job}',
+                'title': 'Vice President',
+                'start_date': f'{2010 + job}-01-01',
+                'end_date': None if job == 0 else f'{2012 + job}-01-01',
+                'current': job == 0,
+                'description': None,
+                'degree': None,
+                'kind': None,
+                'key': f'emp_{i}_{job}',
+            }
+            for job in range(4)
+        ],
+    }
+
+
+def recorded_pages(pages: int, per_page: int) -> list:
+    """Apollo people-search response bodies, as bytes off the wire"""
+    bodies = []
+    for page in range(pages):
+        organization = fake_organization(f'Health Company {page}')
+        people = [
+            {**fake_person(f'bench-{page}-{i}', organization), **apollo_extras(i)}
+            for i in range(per_page)
+        ]
+        bodies.append(json.dumps({'people': people, 'pagination': {'page': 1, 'per_page': per_page}}).encode('utf-8'))
+    return bodies
+
+
+def decoders() -> dict:
+    """Installed decoders by name"""
+    available = {'json': json.loads}
+    if fast_json.orjson is not None:
+        available['orjson'] = fast_json.orjson.loads
+    if fast_json.msgspec is not None:
+        available['msgspec (typed)'] = fast_json.decode_apollo
+    return available
+
+
+def best_of(repeat: int, bodies: list, fn) -> float:
+    """Fastest of `repeat` passes of fn over every body, in seconds (GC paused, like timeit)"""
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for body in bodies:
+                fn(body)
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return min(timings)
+
+
+def main():
+    """Run the benchmark"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        console.print(__doc__)
+        return 0
+
+    pages = int(option(args, '--pages', '200'))
+    per_page = int(option(args, '--per-page', '100'))
+    repeat = int(option(args, '--repeat', '5'))
+
+    bodies = recorded_pages(pages, per_page)
+    size_kb = sum(len(body) for body in bodies) / len(bodies) / 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        apollo = ApolloClient(
+            'bench',
+            company_index=CompanyIndex(db_path=f'{tmp}/company_index.db'),
+            people_cache=PeopleSearchCache(db_path=f'{tmp}/people_cache.db')
+        )
+
+        def normalize(data):
+            return [apollo._normalize_contact(person) for person in data.get('people', [])]
+
+        results = {}
+        for name, decode in decoders().items():
+            normalize(decode(bodies[0]))  # warm up
+            decode_only = best_of(repeat, bodies, decode)
+            with_normalize = best_of(repeat, bodies, lambda body: normalize(decode(body)))
+            results[name] = (decode_only / pages, with_normalize / pages)
+
+    table = Table(
+        title=f"\n{pages} pages of {per_page} people (~{size_kb:.0f} KB each), best of {repeat}",
+        show_header=True, header_style="bold cyan"
+    )
+    table.add_column("Decoder", style="cyan")
+    table.add_column("Decode/page", justify="right", style="magenta")
+    table.add_column("Decode + normalize/page", justify="right")
+    table.add_column("vs json", justify="right", style="yellow")
+
+    baseline = results['json'][1]
+    for name, (decode_only, with_normalize) in results.items():
+        table.add_row(
+            name,
+            f"{decode_only * 1000:.2f} ms",
+            f"{with_normalize * 1000:.2f} ms",
+            f"{baseline / with_normalize:.1f}x"
+        )
+
+    console.print(table)
+    console.print(f"\n[dim]ApolloClient uses: {'msgspec (typed)' if fast_json.msgspec else fast_json.BACKEND}[/dim]\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Record Memory Benchmark
+Normalizes a large decoded Apollo people response into Contact/Company
+records (src/records.py) and into the plain dicts they replaced, and reports
+memory kept per record, peak allocation and build time for each.
+
+Usage:
+    python benchmarks/bench_records.py [--records 50000] [--repeat 3]
+"""
+
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mock_servers import fake_organization, fake_person
+from src.apollo_client import ApolloClient
+from src.company_index import CompanyIndex
+from src.people_cache import PeopleSearchCache
+from src.profiling import profiled
+
+console = Console()
+
+
+def option(args: list, name: str, default: str) -> str:
+    """Read a `--name value` option"""
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+@profiled('normalization')
+def dict_contact(raw_data: dict) -> dict:
+    """The dict ApolloClient._normalize_contact built before records (baseline)"""
+    return {
+        'apollo_id': raw_data.get('id'),
+        'name': raw_data.get('name', ''),
+        'first_name': raw_data.get('first_name', ''),
+        'last_name': raw_data.get('last_name', ''),
+        'title': raw_data.get('title', ''),
+        'seniority': raw_data.get('seniority', ''),
+        'email': raw_data.get('email'),
+        'phone': raw_data.get('phone'),
+        'linkedin_url': raw_data.get('linkedin_url', ''),
+        'city': raw_data.get('city', ''),
+        'state': raw_data.get('state', ''),
+        'country': raw_data.get('country', ''),
+    }
+
+
+@profiled('normalization')
+def dict_company(apollo: ApolloClient, raw_data: dict) -> dict:
+    """The dict ApolloClient._normalize_company built before records (baseline)"""
+    return {
+        'apollo_id': raw_data.get('id'),
+        'name': raw_data.get('name', ''),
+        'domain': raw_data.get('website_url', '').replace('http://', '').replace('https://', '').rstrip('/'),
+        'linkedin_url': raw_data.get('linkedin_url', ''),
+        'industry': raw_data.get('industry', ''),
+        'employee_count': raw_data.get('estimated_num_employees', 0),
+        'revenue_range': apollo._format_revenue(raw_data.get('estimated_annual_revenue')),
+        'location': apollo._format_location(raw_data),
+        'technologies': raw_data.get('technologies', []),
+        'funding_stage': raw_data.get('funding_stage', 'Unknown'),
+    }
+
+
+def decoded_people(count: int) -> list:
+    """A decoded Apollo people response (each person with its organization)"""
+    people = [
+        fake_person(f'bench-{i}', fake_organization(f'Health Company {i % 500}'))
+        for i in range(count)
+    ]
+    return json.loads(json.dumps({'people': people}))['people']
+
+
+def measure(people: list, normalize) -> dict:
+    """Normalize every person and organization, tracing allocations"""
+    def build():
+        return [(normalize[0](p), normalize[1](p['organization'])) for p in people]
+
+    # Timed without tracing (tracemalloc slows every allocation down)
+    gc.collect()
+    started = time.perf_counter()
+    normalized = build()
+    elapsed = time.perf_counter() - started
+    del normalized
+
+    gc.collect()
+    tracemalloc.start()
+    normalized = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(normalized)
+    del normalized
+    return {
+        'bytes_per_person': retained / count if count else 0.0,
+        'retained_mb': retained / 1_000_000,
+        'peak_mb': peak / 1_000_000,
+        'seconds': elapsed
+    }
+
+
+def main():
+    """Run the benchmark"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        console.print(__doc__)
+        return 0
+
+    count = int(option(args, '--records', '50000'))
+    repeat = int(option(args, '--repeat', '3'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        apollo = ApolloClient(
+            'bench',
+            company_index=CompanyIndex(db_path=f'{tmp}/company_index.db'),
+            people_cache=PeopleSearchCache(db_path=f'{tmp}/people_cache.db')
+        )
+        variants = {
+            'dict': (dict_contact, lambda raw: dict_company(apollo, raw)),
+            'record': (apollo._normalize_contact, apollo._normalize_company)
+        }
+
+        console.print(f"Decoding {count} Apollo people...")
+        people = decoded_people(count)
+
+        results = {}
+        for name, normalize in variants.items():
+            runs = [measure(people, normalize) for _ in range(repeat)]
+            # Memory is deterministic; time is the best of the runs
+            results[name] = {**runs[-1], 'seconds': min(run['seconds'] for run in runs)}
+
+    table = Table(
+        title=f"\n{count} contacts + companies, best of {repeat}",
+        show_header=True, header_style="bold cyan"
+    )
+    table.add_column("Type", style="cyan")
+    table.add_column("Bytes/person", justify="right", style="magenta")
+    table.add_column("Retained", justify="right")
+    table.add_column("Peak", justify="right")
+    table.add_column("Build time", justify="right", style="yellow")
+
+    for name, result in results.items():
+        table.add_row(
+            name,
+            f"{result['bytes_per_person']:.0f}",
+            f"{result['retained_mb']:.1f} MB",
+            f"{result['peak_mb']:.1f} MB",
+            f"{result['seconds'] * 1000:.0f} ms"
+        )
+
+    console.print(table)
+    baseline, records = results['dict'], results['record']
+    if baseline['bytes_per_person']:
+        saved = 1 - records['bytes_per_person'] / baseline['bytes_per_person']
+        console.print(f"\n[green]Records keep {saved:.0%} less memory per contact + company.[/green]\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Mock API Servers for Benchmarks
+Local stand-ins for Apollo, Notion and an OpenAI-compatible LLM endpoint with
+configurable latency, rate limiting and error injection.
+
+Responses are shaped like the real APIs closely enough for ApolloClient,
+both NotionClients and SmartLLM to run unmodified. Data is derived from the
+request (hash of the name/email/URL) so repeated runs see identical records.
+Connections are kept alive and bodies over 1 KB are gzipped for clients that
+accept it, as the real APIs do.
+
+Usage:
+    python benchmarks/mock_servers.py [--latency-ms 50] [--rate-limit 10] [--error-rate 0.02]
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Smallest response body sent gzip-compressed (when the client accepts gzip)
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass
+class MockConfig:
+    """Behaviour shared by every route of one server"""
+    latency_ms: float = 0.0      # Added to every response
+    jitter_ms: float = 0.0       # Uniform +/- jitter on top of latency
+    rate_limit: float = 0.0      # Requests/sec before 429s (0 = unlimited)
+    error_rate: float = 0.0      # Fraction of requests failed on purpose
+    error_status: int = 500      # Status code for injected errors
+    seed: Optional[int] = None   # Seed for jitter/error decisions
+
+
+class TokenBucket:
+    """Requests/sec limiter with a one-second burst"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Consume a token, False if the bucket is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+# (method, path regex, handler(body, match) -> (status, json body))
+Route = Tuple[str, str, Callable[[Dict, re.Match], Tuple[int, Dict]]]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real APIs
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.mock.dispatch(self)
+
+    def do_POST(self):
+        self.server.mock.dispatch(self)
+
+    def do_PATCH(self):
+        self.server.mock.dispatch(self)
+
+    def log_message(self, format, *args):
+        # Silence per-request logging
+        pass
+
+
+class MockServer:
+    """One threaded HTTP server with a route table and injected behaviour"""
+
+    def __init__(self, name: str, routes: List[Route], config: MockConfig = None,
+                 error_body: Callable[[int, str], Dict] = None):
+        """
+        Args:
+            name: Label used in stats output
+            routes: Route table
+            config: Latency / rate limit / error settings
+            error_body: Builds the JSON body for 429 and injected errors
+        """
+        self.name = name
+        self.routes = [(method, re.compile(pattern), handler) for method, pattern, handler in routes]
+        self.config = config or MockConfig()
+        self.error_body = error_body or (lambda status, message: {'error': message})
+        self.bucket = TokenBucket(self.config.rate_limit) if self.config.rate_limit else None
+        self.stats = {'requests': 0, 'rate_limited': 0, 'errors_injected': 0}
+
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockServer':
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f'mock-{self.name}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def dispatch(self, request: BaseHTTPRequestHandler) -> None:
+        """Route one request, applying latency, rate limit and error injection"""
+        length = int(request.headers.get('Content-Length') or 0)
+        raw = request.rfile.read(length) if length else b''
+
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = self.config.latency_ms + self._random.uniform(-1, 1) * self.config.jitter_ms
+            fail = self._random.random() < self.config.error_rate
+
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        path = request.path.split('?', 1)[0]
+
+        if self.bucket and not self.bucket.take():
+            with self._lock:
+                self.stats['rate_limited'] += 1
+            self._send(request, 429, self.error_body(429, 'Rate limited'), {'Retry-After': '1'})
+            return
+
+        if fail:
+            with self._lock:
+                self.stats['errors_injected'] += 1
+            self._send(request, self.config.error_status,
+                       self.error_body(self.config.error_status, 'Injected error'))
+            return
+
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match and method == request.command:
+                try:
+                    body = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    self._send(request, 400, self.error_body(400, 'Invalid JSON'))
+                    return
+                status, payload = handler(body, match)
+                self._send(request, status, payload)
+                return
+
+        self._send(request, 404, self.error_body(404, f'No route for {request.command} {path}'))
+
+    @staticmethod
+    def _send(request: BaseHTTPRequestHandler, status: int, payload: Dict, headers: Dict = None) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        # Compress larger bodies when the client accepts it, like the real APIs
+        gzipped = len(data) >= GZIP_MIN_BYTES and 'gzip' in request.headers.get('Accept-Encoding', '')
+        if gzipped:
+            data = gzip.compress(data, compresslevel=5)
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        if gzipped:
+            request.send_header('Content-Encoding', 'gzip')
+        request.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            request.send_header(key, value)
+        request.end_headers()
+        request.wfile.write(data)
+
+
+# ============================================================
+# FAKE DATA
+# ============================================================
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn', 'Drew']
+LAST_NAMES = ['Chen', 'Patel', 'Garcia', 'Smith', 'Nguyen', 'Okafor', 'Kim', 'Rossi', 'Cohen', 'Silva']
+INDUSTRIES = ['hospital & health care', 'insurance', 'pharmaceuticals', 'medical devices', 'health, wellness & fitness']
+TITLES = ['Chief Executive Officer', 'VP of Partnerships', 'Chief Medical Officer',
+          'Director of Business Development', 'Chief Technology Officer', 'VP Sales']
+
+
+def _seed(*parts) -> int:
+    """Stable integer derived from request values"""
+    digest = hashlib.md5('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return int(digest[:12], 16)
+
+
+def fake_organization(name: str) -> Dict:
+    """Apollo organization record for a company name"""
+    n = _seed('org', name.lower())
+    slug = re.sub(r'[^a-z0-9]+', '', name.lower()) or 'company'
+    return {
+        'id': f'org_{n:x}',
+        'name': name,
+        'website_url': f'https://www.{slug}.com',
+        'linkedin_url': f'http://www.linkedin.com/company/{slug}',
+        'industry': INDUSTRIES[n % len(INDUSTRIES)],
+        'estimated_num_employees': 50 + n % 20000,
+        'estimated_annual_revenue': (n % 900 + 10) * 1_000_000,
+        'city': 'Boston',
+        'state': 'Massachusetts',
+        'country': 'United States',
+        'technologies': ['Salesforce', 'Epic'][: n % 3],
+        'funding_stage': ['Series A', 'Series B', 'Public'][n % 3],
+    }
+
+
+def fake_person(key: str, organization: Dict = None, name: str = None) -> Dict:
+    """Apollo person record, optionally with a nested organization"""
+    n = _seed('person', key)
+    first = FIRST_NAMES[n % len(FIRST_NAMES)]
+    last = LAST_NAMES[(n // 10) % len(LAST_NAMES)]
+    if name:
+        first, _, last = name.partition(' ')
+    full_name = f'{first} {last}'.strip()
+    person = {
+        'id': f'per_{n:x}',
+        'name': full_name,
+        'first_name': first,
+        'last_name': last,
+        'title': TITLES[n % len(TITLES)],
+        'seniority': ['c_suite', 'vp', 'director'][n % 3],
+        'email': f'{first.lower()}.{last.lower()}@example.com' if n % 4 else None,
+        'phone': None,
+        'linkedin_url': f'http://www.linkedin.com/in/{first.lower()}-{last.lower()}-{n % 10000}',
+        'city': 'Boston',
+        'state': 'Massachusetts',
+        'country': 'United States',
+    }
+    if organization:
+        person['organization'] = organization
+    return person
+
+
+# ============================================================
+# APOLLO
+# ============================================================
+
+def apollo_routes() -> List[Route]:
+    """Apollo v1 search and match endpoints"""
+
+    def organizations_search(body, match):
+        name = body.get('q_organization_name', '')
+        # Names containing "unknown" exercise the not-found paths
+        if not name or 'unknown' in name.lower():
+            return 200, {'organizations': []}
+        return 200, {'organizations': [fake_organization(name)]}
+
+    def people_search(body, match):
+        org_ids = body.get('organization_ids') or ['org_none']
+        per_page = int(body.get('per_page', 10))
+        keywords = body.get('q_keywords')
+        if keywords:
+            return 200, {'people': [fake_person(f'{org_ids[0]}:{keywords}', name=keywords)]}
+        return 200, {'people': [fake_person(f'{org_ids[0]}:{i}') for i in range(per_page)]}
+
+    def people_match(body, match):
+        key = body.get('linkedin_url') or body.get('email') or ''
+        if not key or 'unknown' in key.lower():
+            return 200, {'person': None}
+        company = f"Company {_seed('employer', key) % 500}"
+        return 200, {'person': fake_person(key, organization=fake_organization(company))}
+
+    return [
+        ('POST', r'/v1/organizations/search', organizations_search),
+        ('POST', r'/v1/people/search', people_search),
+        ('POST', r'/v1/people/match', people_match),
+    ]
+
+
+# ============================================================
+# NOTION
+# ============================================================
+
+# Properties both NotionClients write, so schema checks pass
+NOTION_PROPERTIES = {
+    name: {'id': name.lower().replace(' ', '_'), 'type': kind}
+    for name, kind in [
+        ('Contact Name', 'title'), ('Company', 'rich_text'), ('Title', 'rich_text'),
+        ('Email', 'email'), ('LinkedIn', 'url'), ('Phone', 'phone_number'),
+        ('Industry', 'select'), ('Outreach Status', 'status'), ('Notes', 'rich_text'),
+        ('Last Enriched', 'date'), ('Priority', 'number'),
+    ]
+}
+
+
+def notion_error(status: int, message: str) -> Dict:
+    """Notion error envelope (the SDK reads `code` and `message`)"""
+    codes = {400: 'validation_error', 404: 'object_not_found', 429: 'rate_limited'}
+    return {'object': 'error', 'status': status, 'code': codes.get(status, 'internal_server_error'), 'message': message}
+
+
+def notion_routes() -> List[Route]:
+    """Database query/retrieve/update and page create/update"""
+
+    def database(body, match):
+        return 200, {'object': 'database', 'id': match['db'], 'properties': NOTION_PROPERTIES}
+
+    def query(body, match):
+        # Empty database: every contact takes the create path
+        return 200, {'object': 'list', 'results': [], 'next_cursor': None, 'has_more': False}
+
+    def create_page(body, match):
+        return 200, {'object': 'page', 'id': str(uuid.uuid4()), 'properties': body.get('properties', {})}
+
+    def update_page(body, match):
+        return 200, {'object': 'page', 'id': match['page'], 'properties': body.get('properties', {})}
+
+    return [
+        ('GET', r'/v1/databases/(?P<db>[^/]+)', database),
+        ('PATCH', r'/v1/databases/(?P<db>[^/]+)', database),
+        ('POST', r'/v1/databases/(?P<db>[^/]+)/query', query),
+        ('POST', r'/v1/pages', create_page),
+        ('PATCH', r'/v1/pages/(?P<page>[^/]+)', update_page),
+    ]
+
+
+# ============================================================
+# LLM (OpenAI-compatible)
+# ============================================================
+
+TARGETING_STRATEGY = {
+    'titles': ['CTO', 'Chief Technology Officer', 'VP IT', 'CIO', 'Director IT'],
+    'seniorities': ['c_suite', 'vp', 'director'],
+    'locations': None,
+    'explanation': 'Technology decision-makers (mock response)'
+}
+
+
+def llm_error(status: int, message: str) -> Dict:
+    """OpenAI error envelope"""
+    return {'error': {'message': message, 'type': 'server_error', 'code': status}}
+
+
+def llm_routes() -> List[Route]:
+    """Chat completions and model listing"""
+
+    def chat_completions(body, match):
+        content = json.dumps(TARGETING_STRATEGY)
+        return 200, {
+            'id': f'chatcmpl-{uuid.uuid4().hex[:12]}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'gpt-4o-mini'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': 600, 'completion_tokens': 60, 'total_tokens': 660}
+        }
+
+    def models(body, match):
+        return 200, {'object': 'list', 'data': [{'id': 'gpt-4o-mini', 'object': 'model', 'owned_by': 'mock'}]}
+
+    return [
+        ('POST', r'/v1/chat/completions', chat_completions),
+        ('GET', r'/v1/models', models),
+    ]
+
+
+def start_mock_services(config: MockConfig = None, llm_config: MockConfig = None) -> Dict[str, MockServer]:
+    """
+    Start Apollo, Notion and LLM stand-ins
+
+    Args:
+        config: Behaviour for the Apollo and Notion servers
+        llm_config: Behaviour for the LLM server (defaults to config)
+
+    Returns:
+        Dict of name -> started MockServer
+    """
+    config = config or MockConfig()
+    return {
+        'apollo': MockServer('apollo', apollo_routes(), config).start(),
+        'notion': MockServer('notion', notion_routes(), config, notion_error).start(),
+        'llm': MockServer('llm', llm_routes(), llm_config or config, llm_error).start(),
+    }
+
+
+def service_env(servers: Dict[str, MockServer]) -> Dict[str, str]:
+    """Environment variables that point the app's clients at the mocks"""
+    return {
+        'APOLLO_BASE_URL': f"{servers['apollo'].url}/v1",
+        'NOTION_BASE_URL': servers['notion'].url,
+        'OPENAI_BASE_URL': f"{servers['llm'].url}/v1",
+    }
+
+
+def option(args: list, name: str, default: str) -> str:
+    """Read a `--name value` option"""
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def main():
+    """Run the mock servers in the foreground (for pointing the app at them)"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        print(__doc__)
+        return 0
+
+    config = MockConfig(
+        latency_ms=float(option(args, '--latency-ms', '0')),
+        jitter_ms=float(option(args, '--jitter-ms', '0')),
+        rate_limit=float(option(args, '--rate-limit', '0')),
+        error_rate=float(option(args, '--error-rate', '0')),
+        error_status=int(option(args, '--error-status', '500'))
+    )
+    servers = start_mock_services(config)
+
+    print("Mock services running. Export these before starting the app or a script:\n")
+    for key, value in service_env(servers).items():
+        print(f"  export {key}={value}")
+    print("\nCtrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for server in servers.values():
+            server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
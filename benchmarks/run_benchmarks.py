@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Enrichment Throughput Benchmarks
+Runs each enrichment entry point against local mock Apollo, Notion and LLM
+servers (benchmarks/mock_servers.py) and reports rows/sec and p50/p99 latency.
+
+Entry points:
+    enrich_company      - per-company path of scripts/enrich.py (without its 1.5s sleep)
+    enrich_contact      - enrich_contact_flexible (CSV contacts in the web app)
+    ai_strategy         - AITargeting.analyze_targeting_request (LLM round trip)
+    ai_targeting        - target_company (the AI targeting loop in the web app)
+
+Usage:
+    python benchmarks/run_benchmarks.py [--rows 100] [--latency-ms 20] [--jitter-ms 5]
+                                        [--rate-limit 0] [--error-rate 0] [--only enrich_contact]
+                                        [--save results.json] [--compare baseline.json] [--tolerance 15]
+
+Exit code is 1 when --compare finds a regression beyond --tolerance percent.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mock_servers import MockConfig, start_mock_services, service_env
+from src.password_hasher import LatencyTracker
+from src.telemetry import get_telemetry, tagged
+
+console = Console()
+
+BENCHMARKS = ['enrich_company', 'enrich_contact', 'ai_strategy', 'ai_targeting']
+
+
+def option(args: list, name: str, default: str) -> str:
+    """Read a `--name value` option"""
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def company_names(rows: int) -> list:
+    """Company names, every 20th one unknown to Apollo"""
+    return [f"Unknown Co {i}" if i % 20 == 19 else f"Health Company {i}" for i in range(rows)]
+
+
+def contact_rows(rows: int) -> list:
+    """CSV-style contact rows cycling through LinkedIn, email and name+company lookups"""
+    items = []
+    for i in range(rows):
+        kind = i % 3
+        if i % 20 == 19:
+            items.append({'email': f'unknown{i}@example.com'})
+        elif kind == 0:
+            items.append({'linkedin_url': f'linkedin.com/in/bench-contact-{i}'})
+        elif kind == 1:
+            items.append({'email': f'bench.contact{i}@example.com'})
+        else:
+            items.append({'person_name': f'Bench Contact{i}', 'company_name': f'Health Company {i}'})
+    return items
+
+
+def timed(name: str, items: list, fn) -> dict:
+    """Run fn over items sequentially (like the app does), timing each row"""
+    latency = LatencyTracker(window=max(len(items), 1))
+    statuses = Counter()
+
+    started = time.perf_counter()
+    # The clients print progress and swallowed errors; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()), tagged(job=name):
+        for item in items:
+            row_started = time.perf_counter()
+            try:
+                statuses[fn(item)] += 1
+            except Exception as e:
+                statuses[f'exception:{type(e).__name__}'] += 1
+            latency.record(name, time.perf_counter() - row_started)
+    elapsed = time.perf_counter() - started
+
+    summary = latency.percentiles(name)
+    return {
+        'rows': len(items),
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(len(items) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': summary['p50'],
+        'p99_ms': summary['p99'],
+        'statuses': dict(statuses)
+    }
+
+
+def run(selected: list, rows: int) -> dict:
+    """Run the selected benchmarks (mock services must already be in the environment)"""
+    # Imported after the env points at the mocks; clients read base URLs at construction
+    from src.apollo_client import ApolloClient
+    from src.company_index import CompanyIndex
+    from src.people_cache import PeopleSearchCache
+    from src.notion_client import NotionClient as UnifiedNotionClient
+    from src.notion_sync_adapted import NotionClient as AdaptedNotionClient
+    from src.processors import TierAssigner, PriorityScorer
+    from src.enrichment import enrich_company, enrich_contact_flexible, target_company
+    from src.llm_helper import AITargeting
+
+    def apollo_client(benchmark: str) -> ApolloClient:
+        # Empty alias index and people cache per benchmark, so runs start cold and stay comparable
+        return ApolloClient(
+            'bench-apollo-key',
+            company_index=CompanyIndex(db_path=f'{benchmark}-companies.db'),
+            people_cache=PeopleSearchCache(db_path=f'{benchmark}-people.db')
+        )
+
+    results = {}
+
+    if 'enrich_company' in selected:
+        apollo = apollo_client('enrich_company')
+        notion = AdaptedNotionClient('bench-notion-token', 'bench-db')
+        tier_assigner, priority_scorer = TierAssigner(), PriorityScorer()
+        results['enrich_company'] = timed('enrich_company', company_names(rows), lambda name: enrich_company(
+            company_name=name,
+            apollo=apollo,
+            notion=notion,
+            tier_assigner=tier_assigner,
+            priority_scorer=priority_scorer,
+            skip_duplicates=True
+        )['status'])
+
+    if 'enrich_contact' in selected:
+        apollo = apollo_client('enrich_contact')
+        notion = UnifiedNotionClient('bench-notion-token', 'bench-db')
+        results['enrich_contact'] = timed('enrich_contact', contact_rows(rows), lambda row: enrich_contact_flexible(
+            row, apollo, notion
+        )['status'])
+
+    ai = None
+    if 'ai_strategy' in selected or 'ai_targeting' in selected:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai = AITargeting(openai_key='bench-openai-key')
+
+    if 'ai_strategy' in selected:
+        # One LLM call per targeting run, so fewer rows are plenty
+        requests = [f"technology buyers batch {i}" for i in range(max(rows // 10, 5))]
+        results['ai_strategy'] = timed('ai_strategy', requests, lambda text: (
+            'success' if ai.analyze_targeting_request(text, 'Healthcare').get('titles') else 'empty'
+        ))
+
+    if 'ai_targeting' in selected:
+        with contextlib.redirect_stdout(io.StringIO()):
+            strategy = ai.analyze_targeting_request('technology buyers', 'Healthcare')
+        apollo = apollo_client('ai_targeting')
+        notion = UnifiedNotionClient('bench-notion-token', 'bench-db')
+        results['ai_targeting'] = timed('ai_targeting', company_names(rows), lambda name: target_company(
+            company_name=name,
+            strategy=strategy,
+            apollo=apollo,
+            notion=notion,
+            max_results=10
+        )['status'])
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare against a saved run
+
+    Returns:
+        List of (benchmark, metric, baseline, current, change %) regressions
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+
+        # Lower throughput or higher tail latency is worse
+        checks = [
+            ('rows/sec', previous['rows_per_sec'], current['rows_per_sec'], -1),
+            ('p99 ms', previous['p99_ms'], current['p99_ms'], 1),
+        ]
+        for metric, before, after, worse_sign in checks:
+            if not before:
+                continue
+            change = (after - before) / before * 100
+            if change * worse_sign > tolerance:
+                regressions.append((name, metric, before, after, change))
+    return regressions
+
+
+def main():
+    """Start the mocks, run the benchmarks and report"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        console.print(__doc__)
+        return 0
+
+    rows = int(option(args, '--rows', '100'))
+    only = option(args, '--only', '')
+    selected = [name for name in BENCHMARKS if not only or name in only.split(',')]
+    # Resolved now; the run happens in a temp directory
+    save_path = option(args, '--save', None)
+    save_path = Path(save_path).resolve() if save_path else None
+    baseline_path = option(args, '--compare', None)
+    baseline_path = Path(baseline_path).resolve() if baseline_path else None
+    tolerance = float(option(args, '--tolerance', '15'))
+
+    config = MockConfig(
+        latency_ms=float(option(args, '--latency-ms', '20')),
+        jitter_ms=float(option(args, '--jitter-ms', '5')),
+        rate_limit=float(option(args, '--rate-limit', '0')),
+        error_rate=float(option(args, '--error-rate', '0')),
+        error_status=int(option(args, '--error-status', '500')),
+        seed=42
+    )
+
+    servers = start_mock_services(config)
+    os.environ.update(service_env(servers))
+    os.environ['OPENAI_API_KEY'] = 'bench-openai-key'
+
+    # Keep fingerprint / retry databases out of data/
+    os.chdir(tempfile.mkdtemp(prefix='ping-crm-bench-'))
+
+    console.print(
+        f"\n[bold]Benchmarking {', '.join(selected)}[/bold] — {rows} rows, "
+        f"{config.latency_ms:.0f}±{config.jitter_ms:.0f} ms latency, "
+        f"rate limit {config.rate_limit or 'off'}, error rate {config.error_rate:.0%}"
+    )
+
+    try:
+        results = run(selected, rows)
+    finally:
+        mock_stats = {name: dict(server.stats) for name, server in servers.items()}
+        for server in servers.values():
+            server.stop()
+
+    table = Table(title="\nEnrichment Throughput", show_header=True, header_style="bold cyan")
+    table.add_column("Entry point", style="cyan")
+    table.add_column("Rows", justify="right")
+    table.add_column("Rows/sec", justify="right", style="magenta")
+    table.add_column("p50", justify="right")
+    table.add_column("p99", justify="right", style="yellow")
+    table.add_column("Statuses")
+    for name, result in results.items():
+        table.add_row(
+            name,
+            str(result['rows']),
+            f"{result['rows_per_sec']:.1f}",
+            f"{result['p50_ms']} ms",
+            f"{result['p99_ms']} ms",
+            ', '.join(f"{status}: {count}" for status, count in sorted(result['statuses'].items()))
+        )
+    console.print(table)
+
+    services = Table(title="\nMock service traffic", show_header=True, header_style="bold cyan")
+    services.add_column("Service", style="cyan")
+    services.add_column("Requests", justify="right")
+    services.add_column("429s", justify="right")
+    services.add_column("Injected errors", justify="right")
+    for name, stats in mock_stats.items():
+        services.add_row(name, str(stats['requests']), str(stats['rate_limited']), str(stats['errors_injected']))
+    console.print(services)
+
+    # Client-side view of the same traffic (src.telemetry)
+    telemetry = get_telemetry().snapshot()
+    api = Table(title="\nAPI time by service (client telemetry)", show_header=True, header_style="bold cyan")
+    api.add_column("Service", style="cyan")
+    api.add_column("Calls", justify="right")
+    api.add_column("Time", justify="right", style="magenta")
+    api.add_column("Errors", justify="right")
+    api.add_column("Retries", justify="right")
+    for name, stats in telemetry['services'].items():
+        api.add_row(name, str(stats['calls']), f"{stats['seconds']:.2f}s", str(stats['errors']), str(stats['retries']))
+    console.print(api)
+
+    report = {
+        'config': {'rows': rows, **{k: v for k, v in vars(config).items() if k != 'seed'}},
+        'benchmarks': results,
+        'mock_requests': mock_stats,
+        'telemetry': telemetry
+    }
+
+    if save_path:
+        save_path.write_text(json.dumps(report, indent=2))
+        console.print(f"\n[green]✓ Saved results to {save_path}[/green]")
+
+    if baseline_path:
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare(results, baseline, tolerance)
+        if regressions:
+            console.print(f"\n[bold red]✗ {len(regressions)} regression(s) beyond {tolerance:.0f}%:[/bold red]")
+            for name, metric, before, after, change in regressions:
+                console.print(f"  {name} {metric}: {before} → {after} ({change:+.1f}%)")
+            return 1
+        console.print(f"\n[green]✓ No regressions beyond {tolerance:.0f}% vs {baseline_path}[/green]")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
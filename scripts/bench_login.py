@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark Login Capacity
+Measures bcrypt verification throughput and latency on this machine for
+several cost factors, to pick BCRYPT_ROUNDS / BCRYPT_WORKERS for the server.
+
+Usage:
+    python scripts/bench_login.py [--logins 40] [--rounds 10,11,12,13] [--workers N]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.password_hasher import PasswordHasher
+
+console = Console()
+
+
+def option(args: list, name: str, default: str) -> str:
+    """Read a `--name value` option"""
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def bench(rounds: int, logins: int, workers: int = None) -> dict:
+    """Simulate `logins` users signing in at the same moment"""
+    hasher = PasswordHasher(rounds=rounds, workers=workers, max_pending=logins)
+    stored = hasher.hash('correct horse battery staple')
+
+    def login(_):
+        started = time.perf_counter()
+        hasher.verify('correct horse battery staple', stored)
+        hasher.latency.record('login', time.perf_counter() - started)
+
+    started = time.perf_counter()
+    # One client thread per user, all hitting the shared pool at once
+    with ThreadPoolExecutor(max_workers=logins) as clients:
+        list(clients.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'workers': hasher.workers,
+        'throughput': logins / elapsed,
+        'login': hasher.latency.percentiles('login'),
+        'work': hasher.latency.percentiles('verify_work')
+    }
+
+
+def main():
+    """Run the benchmark"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        console.print(__doc__)
+        return 0
+
+    logins = int(option(args, '--logins', '40'))
+    rounds_list = [int(r) for r in option(args, '--rounds', '10,11,12,13').split(',')]
+    workers = option(args, '--workers', None)
+    workers = int(workers) if workers else None
+
+    table = Table(title=f"\n{logins} simultaneous logins", show_header=True, header_style="bold cyan")
+    table.add_column("Rounds", justify="right", style="cyan")
+    table.add_column("Workers", justify="right")
+    table.add_column("One hash", justify="right")
+    table.add_column("Logins/sec", justify="right", style="magenta")
+    table.add_column("p50", justify="right")
+    table.add_column("p90", justify="right")
+    table.add_column("p99", justify="right", style="yellow")
+
+    for rounds in rounds_list:
+        console.print(f"Benchmarking cost factor {rounds}...")
+        result = bench(rounds, logins, workers)
+        table.add_row(
+            str(rounds),
+            str(result['workers']),
+            f"{result['work']['p50']} ms",
+            f"{result['throughput']:.1f}",
+            f"{result['login']['p50']} ms",
+            f"{result['login']['p90']} ms",
+            f"{result['login']['p99']} ms"
+        )
+
+    console.print(table)
+    console.print(
+        "\n[dim]Pick the highest cost factor whose p99 is acceptable for your "
+        "expected burst of sign-ins, then set BCRYPT_ROUNDS.[/dim]\n"
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
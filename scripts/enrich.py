@@ -20,7 +20,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.apollo_client import ApolloClient
 from src.notion_sync_adapted import NotionClient
+from src.warehouse_sync import open_sync
 from src.processors import TierAssigner, PriorityScorer
+from src.enrichment import enrich_company
+from src.retry_queue import RetryQueue, PERMANENT_ERROR_CLASSES
+from src.telemetry import set_tags, get_telemetry
+from src.ops_metrics import get_ops_metrics
+from src.credit_ledger import CreditLedger
+from src.profiling import profile_from_argv, step
 
 # Load environment variables
 load_dotenv()
@@ -48,83 +55,6 @@ def validate_config():
     return required
 
 
-def enrich_company(
-    company_name: str,
-    apollo: ApolloClient,
-    notion: NotionClient,
-    tier_assigner: TierAssigner,
-    priority_scorer: PriorityScorer,
-    skip_duplicates: bool = True
-) -> dict:
-    """
-    Enrich a single company
-
-    Args:
-        company_name: Name of company to enrich
-        apollo: Apollo API client
-        notion: Notion API client
-        tier_assigner: Tier assignment logic
-        priority_scorer: Priority scoring logic
-        skip_duplicates: Skip if already exists in Notion
-
-    Returns:
-        Result dict with status and details
-    """
-    result = {
-        'company': company_name,
-        'status': 'pending',
-        'message': '',
-        'priority': 0
-    }
-
-    try:
-        # Check if exists
-        if skip_duplicates and notion.page_exists(company_name):
-            result['status'] = 'skipped'
-            result['message'] = 'Already exists in Notion'
-            return result
-
-        # Search company in Apollo
-        company_data = apollo.search_company(company_name)
-
-        if not company_data:
-            result['status'] = 'failed'
-            result['message'] = 'Company not found in Apollo'
-            return result
-
-        # Get decision makers
-        titles = apollo.get_target_titles(company_data.get('industry', ''))
-        contacts = apollo.search_people(
-            company_id=company_data['apollo_id'],
-            titles=titles,
-            max_results=10
-        )
-
-        # Assign tier and priority
-        tier = tier_assigner.assign_tier(company_data)
-        priority = priority_scorer.calculate_priority(company_data, contacts, tier)
-
-        # Sync contacts to Notion (creates one page per contact)
-        page_ids = notion.create_contact_pages(
-            company_data=company_data,
-            contacts=contacts,
-            tier=tier,
-            priority=priority
-        )
-
-        result['status'] = 'success'
-        result['message'] = f'Added {len(page_ids)} contacts (Priority: {priority})'
-        result['priority'] = priority
-        result['contacts_found'] = len([c for c in contacts if c.get('email')])
-        result['pages_created'] = len(page_ids)
-
-    except Exception as e:
-        result['status'] = 'failed'
-        result['message'] = str(e)
-
-    return result
-
-
 def main():
     """Main enrichment flow"""
     console.print(Panel.fit(
@@ -135,11 +65,14 @@ def main():
 
     # Validate configuration
     config = validate_config()
+    set_tags(job='enrich_companies')
+    ops = get_ops_metrics()
+    ledger = CreditLedger()
 
     # Check for CSV file
     if len(sys.argv) < 2:
         console.print("\n[bold red]Error: No CSV file provided[/bold red]")
-        console.print("[yellow]Usage: python scripts/enrich.py companies.csv[/yellow]\n")
+        console.print("[yellow]Usage: python scripts/enrich.py companies.csv [--profile[=sample]] [--profile-dir DIR][/yellow]\n")
         sys.exit(1)
 
     csv_file = sys.argv[1]
@@ -162,11 +95,15 @@ def main():
 
     console.print(f"\n[bold green]Found {len(companies)} companies to enrich[/bold green]\n")
 
-    # Initialize clients
+    # Initialize clients (writes go to the local warehouse; Notion syncs in the background)
     apollo = ApolloClient(config['APOLLO_API_KEY'])
-    notion = NotionClient(config['NOTION_TOKEN'], config['NOTION_DB_ID'])
+    notion, sync = open_sync(
+        NotionClient(config['NOTION_TOKEN'], config['NOTION_DB_ID']),
+        config['NOTION_DB_ID']
+    )
     tier_assigner = TierAssigner()
     priority_scorer = PriorityScorer()
+    retry_queue = RetryQueue()
 
     # Results tracking
     results = {
@@ -191,6 +128,8 @@ def main():
         for company_name in companies:
             progress.update(task, description=f"[cyan]Processing: {company_name[:40]}...")
 
+            row_started = time.perf_counter()
+            credits_before = apollo.credits_used
             result = enrich_company(
                 company_name=company_name,
                 apollo=apollo,
@@ -200,12 +139,24 @@ def main():
                 skip_duplicates=True
             )
 
-            # Update stats
+            # Update stats (and the app's operations dashboard)
             results[result['status']] += 1
             details.append(result)
+            ops.record_rows('enrich_companies', result['status'], time.perf_counter() - row_started)
+            ledger.record('enrich_companies', apollo.credits_used - credits_before)
+
+            # Queue transient failures for scripts/retry_failed.py
+            if result['status'] == 'failed' and result.get('error_class') not in PERMANENT_ERROR_CLASSES:
+                retry_queue.enqueue(
+                    kind='company',
+                    payload={'company_name': company_name},
+                    error_class=result.get('error_class', 'unknown'),
+                    error_message=result['message']
+                )
 
             # Rate limiting - be nice to APIs
-            time.sleep(1.5)
+            with step('rate_limit_sleep'):
+                time.sleep(1.5)
 
             progress.update(task, advance=1)
 
@@ -247,8 +198,31 @@ def main():
 
         console.print(details_table)
 
+    # Where the time went
+    services = get_telemetry().snapshot()['services']
+    if services:
+        api_table = Table(title="\nAPI Time by Service", show_header=True, header_style="bold cyan")
+        api_table.add_column("Service", style="cyan")
+        api_table.add_column("Calls", justify="right")
+        api_table.add_column("Time", justify="right", style="magenta")
+        api_table.add_column("Errors", justify="right")
+        api_table.add_column("Retries", justify="right")
+        for name, stats in services.items():
+            api_table.add_row(name, str(stats['calls']), f"{stats['seconds']:.1f}s", str(stats['errors']), str(stats['retries']))
+        console.print(api_table)
+
+    # Push whatever the background sync hasn't yet
+    with console.status(f"[cyan]Syncing {sync.warehouse.backlog()} pending changes to Notion..."):
+        synced = sync.finish()
+    waiting = f", {synced['remaining']} waiting for retry (python scripts/sync_notion.py push)" if synced['remaining'] else ''
+    console.print(f"\n[bold]Notion sync:[/bold] {sync.totals['synced']} changes pushed{waiting}")
+
     console.print("\n[bold green]Done! Check your Notion database for results.[/bold green]\n")
 
 
 if __name__ == '__main__':
-    main()
+    # --profile[=cprofile|sample] writes reports to data/profiles/ (or --profile-dir)
+    with profile_from_argv('enrich') as profile:
+        main()
+    if profile:
+        console.print(f"\n{profile.summary()}\n")
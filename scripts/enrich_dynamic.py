@@ -21,7 +21,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.apollo_client import ApolloClient
 from src.notion_sync_adapted import NotionClient
+from src.warehouse_sync import open_sync
 from src.processors import TierAssigner, PriorityScorer
+from src.enrichment import enrich_company
+from src.retry_queue import RetryQueue, PERMANENT_ERROR_CLASSES
+from src.profiling import profile_from_argv, step
 
 # Load environment variables
 load_dotenv()
@@ -88,83 +92,6 @@ def get_companies_interactive() -> list:
     return companies
 
 
-def enrich_company(
-    company_name: str,
-    apollo: ApolloClient,
-    notion: NotionClient,
-    tier_assigner: TierAssigner,
-    priority_scorer: PriorityScorer,
-    skip_duplicates: bool = True
-) -> dict:
-    """
-    Enrich a single company
-
-    Args:
-        company_name: Name of company to enrich
-        apollo: Apollo API client
-        notion: Notion API client
-        tier_assigner: Tier assignment logic
-        priority_scorer: Priority scoring logic
-        skip_duplicates: Skip if already exists in Notion
-
-    Returns:
-        Result dict with status and details
-    """
-    result = {
-        'company': company_name,
-        'status': 'pending',
-        'message': '',
-        'priority': 0
-    }
-
-    try:
-        # Check if exists
-        if skip_duplicates and notion.page_exists(company_name):
-            result['status'] = 'skipped'
-            result['message'] = 'Already exists in Notion'
-            return result
-
-        # Search company in Apollo
-        company_data = apollo.search_company(company_name)
-
-        if not company_data:
-            result['status'] = 'failed'
-            result['message'] = 'Company not found in Apollo'
-            return result
-
-        # Get decision makers
-        titles = apollo.get_target_titles(company_data.get('industry', ''))
-        contacts = apollo.search_people(
-            company_id=company_data['apollo_id'],
-            titles=titles,
-            max_results=10
-        )
-
-        # Assign tier and priority
-        tier = tier_assigner.assign_tier(company_data)
-        priority = priority_scorer.calculate_priority(company_data, contacts, tier)
-
-        # Sync contacts to Notion (creates one page per contact)
-        page_ids = notion.create_contact_pages(
-            company_data=company_data,
-            contacts=contacts,
-            tier=tier,
-            priority=priority
-        )
-
-        result['status'] = 'success'
-        result['message'] = f'Added {len(page_ids)} contacts (Priority: {priority})'
-        result['priority'] = priority
-        result['contacts_found'] = len([c for c in contacts if c.get('email')])
-        result['pages_created'] = len(page_ids)
-
-    except Exception as e:
-        result['status'] = 'failed'
-        result['message'] = str(e)
-
-    return result
-
-
 def show_usage():
     """Show usage examples"""
     console.print(Panel.fit(
@@ -175,7 +102,10 @@ def show_usage():
         "python scripts/enrich_dynamic.py \"UnitedHealth Group\" \"CVS Health\" \"Anthem\"\n\n"
         "[yellow]Method 3: Interactive mode[/yellow]\n"
         "python scripts/enrich_dynamic.py\n"
-        "(will prompt for company names)",
+        "(will prompt for company names)\n\n"
+        "[yellow]Profiling (any method)[/yellow]\n"
+        "Add --profile (cProfile) or --profile=sample (stack sampling);\n"
+        "reports go to data/profiles/ unless --profile-dir DIR is given",
         border_style="blue"
     ))
 
@@ -233,11 +163,15 @@ def main():
         console.print("\n[yellow]Enrichment cancelled[/yellow]\n")
         return 0
 
-    # Initialize clients
+    # Initialize clients (writes go to the local warehouse; Notion syncs in the background)
     apollo = ApolloClient(config['APOLLO_API_KEY'])
-    notion = NotionClient(config['NOTION_TOKEN'], config['NOTION_DB_ID'])
+    notion, sync = open_sync(
+        NotionClient(config['NOTION_TOKEN'], config['NOTION_DB_ID']),
+        config['NOTION_DB_ID']
+    )
     tier_assigner = TierAssigner()
     priority_scorer = PriorityScorer()
+    retry_queue = RetryQueue()
 
     # Results tracking
     results = {
@@ -275,8 +209,18 @@ def main():
             results[result['status']] += 1
             details.append(result)
 
+            # Queue transient failures for scripts/retry_failed.py
+            if result['status'] == 'failed' and result.get('error_class') not in PERMANENT_ERROR_CLASSES:
+                retry_queue.enqueue(
+                    kind='company',
+                    payload={'company_name': company_name},
+                    error_class=result.get('error_class', 'unknown'),
+                    error_message=result['message']
+                )
+
             # Rate limiting - be nice to APIs
-            time.sleep(1.5)
+            with step('rate_limit_sleep'):
+                time.sleep(1.5)
 
             progress.update(task, advance=1)
 
@@ -318,10 +262,20 @@ def main():
 
         console.print(details_table)
 
+    # Push whatever the background sync hasn't yet
+    with console.status(f"[cyan]Syncing {sync.warehouse.backlog()} pending changes to Notion..."):
+        synced = sync.finish()
+    waiting = f", {synced['remaining']} waiting for retry (python scripts/sync_notion.py push)" if synced['remaining'] else ''
+    console.print(f"\n[bold]Notion sync:[/bold] {sync.totals['synced']} changes pushed{waiting}")
+
     console.print("\n[bold green]Done! Check your Notion database for results.[/bold green]\n")
 
     return 0
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    with profile_from_argv('enrich_dynamic') as profile:
+        exit_code = main()
+    if profile:
+        console.print(f"\n{profile.summary()}\n")
+    sys.exit(exit_code)
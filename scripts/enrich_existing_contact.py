@@ -20,6 +20,8 @@ load_dotenv()
 
 from src.apollo_client import ApolloClient
 from src.notion_sync_updater import NotionUpdater
+from src.profiling import profile_from_argv
+from src.warehouse import Warehouse
 
 console = Console()
 
@@ -162,7 +164,11 @@ def enrich_contact(person_name: str, company_name: str, dry_run: bool = False):
             console.print("\n[yellow]Update cancelled[/yellow]")
             return 0
 
-        # Update Notion
+        # Save to the local warehouse first, then update Notion directly (interactive run)
+        warehouse = Warehouse(scope=db_id)
+        warehouse.save_company(company_data)
+        contact_id, _ = warehouse.save_contact(person_name, company_name, person_data, page_id=existing_page['id'])
+
         console.print(f"\n[cyan]4. Updating Notion page...[/cyan]")
         success = notion.enrich_contact(
             page_id=existing_page['id'],
@@ -171,6 +177,7 @@ def enrich_contact(person_name: str, company_name: str, dry_run: bool = False):
         )
 
         if success:
+            warehouse.mark_synced(contact_id)
             console.print("   ✓ Successfully updated Notion!")
             console.print("\n" + "=" * 60)
             console.print(Panel.fit(
@@ -204,7 +211,8 @@ def main():
             'python scripts/enrich_existing_contact.py "John Smith" "Humana"\n'
             'python scripts/enrich_existing_contact.py "Sarah Johnson" "UnitedHealth Group"\n\n'
             "[yellow]Add --dry-run to preview without updating:[/yellow]\n"
-            'python scripts/enrich_existing_contact.py "John Smith" "Humana" --dry-run',
+            'python scripts/enrich_existing_contact.py "John Smith" "Humana" --dry-run\n\n'
+            "[yellow]Add --profile (or --profile=sample) to write a profile to data/profiles/[/yellow]",
             border_style="red"
         ))
         return 1
@@ -217,4 +225,8 @@ def main():
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    with profile_from_argv('enrich_existing_contact') as profile:
+        exit_code = main()
+    if profile:
+        console.print(f"\n{profile.summary()}\n")
+    sys.exit(exit_code)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Import-Time Report
+Measures cold import cost of the app's startup imports and each src module
+using `python -X importtime` in a fresh interpreter per target.
+
+Usage:
+    python scripts/import_times.py                 # app login imports + every src module
+    python scripts/import_times.py src.enrichment  # specific modules
+    python scripts/import_times.py --top 20        # show more of the slowest imports
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+ROOT = Path(__file__).parent.parent
+
+console = Console()
+
+# What app.py imports before the login screen is drawn
+APP_LOGIN_IMPORTS = [
+    'streamlit',
+    'dotenv',
+    'src.auth_manager',
+    'src.enrichment',
+    'src.retry_queue',
+    'src.fingerprints',
+    'src.client_registry',
+]
+
+# Packages slower than this (microseconds) are called out per target
+HEAVY_US = 50_000
+
+# Interpreter start-up modules, imported no matter what we measure
+STARTUP_MODULES = {'site', 'encodings', 'src'}
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def option(args: list, name: str, default: str) -> str:
+    """Read a `--name value` option"""
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def measure(modules: list) -> list:
+    """
+    Import modules in a fresh interpreter
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in import order
+    """
+    code = f"import sys; sys.path.insert(0, {str(ROOT)!r}); " + '; '.join(f'import {m}' for m in modules)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=ROOT
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def src_modules() -> list:
+    """Every module in src/"""
+    return sorted(f'src.{path.stem}' for path in (ROOT / 'src').glob('*.py') if path.stem != '__init__')
+
+
+def main():
+    """Print import-time tables"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        console.print(__doc__)
+        return 0
+
+    top = int(option(args, '--top', '10'))
+    if '--top' in args:
+        index = args.index('--top')
+        del args[index:index + 2]
+
+    targets = [(name, [name]) for name in args] or (
+        [('app (login screen)', APP_LOGIN_IMPORTS)] + [(name, [name]) for name in src_modules()]
+    )
+
+    summary = Table(title="\nCold Import Time", show_header=True, header_style="bold cyan")
+    summary.add_column("Target", style="cyan")
+    summary.add_column("Total", justify="right", style="magenta")
+    summary.add_column("Heavy dependencies loaded", style="yellow")
+
+    slowest = {}
+    for label, modules in targets:
+        try:
+            rows = measure(modules)
+        except RuntimeError as e:
+            summary.add_row(label, "-", f"[red]{e}[/red]")
+            continue
+
+        # Top-level imports (depth 0) add up to the total
+        total_ms = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+        heavy = [
+            name for name, _, cumulative, _ in rows
+            if cumulative > HEAVY_US and '.' not in name and name not in STARTUP_MODULES
+        ]
+        summary.add_row(label, f"{total_ms:.0f} ms", ', '.join(heavy) or '—')
+
+        for name, _, cumulative, _ in rows:
+            if name != 'src' and not name.startswith('src.') and name not in STARTUP_MODULES:
+                slowest[name] = max(slowest.get(name, 0), cumulative)
+
+    console.print(summary)
+
+    # Packages that dominate cold start anywhere (only top-level packages)
+    table = Table(title=f"\nSlowest {top} third-party packages", show_header=True, header_style="bold cyan")
+    table.add_column("Package", style="cyan")
+    table.add_column("Cumulative", justify="right", style="magenta")
+    packages = {name: us for name, us in slowest.items() if '.' not in name}
+    for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        table.add_row(name, f"{us / 1000:.0f} ms")
+    console.print(table)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
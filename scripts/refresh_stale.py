@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Refresh Stale Contacts
+Re-enriches contacts whose Apollo data is older than a configurable age,
+highest priority first, within a daily Apollo credit budget.
+
+Meant to be run by a scheduler, e.g. daily via cron:
+    0 6 * * * cd /path/to/ping-crm && python scripts/refresh_stale.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.apollo_client import ApolloClient
+from src.notion_client import NotionClient
+from src.warehouse_sync import open_sync
+from src.notion_schema import NotionSchemaManager
+from src.credit_ledger import CreditLedger
+from src.fingerprints import FingerprintStore
+from src.enrichment import refresh_contact
+from src.telemetry import set_tags
+from src.ops_metrics import get_ops_metrics
+
+# Load environment variables
+load_dotenv()
+
+console = Console()
+
+JOB_NAME = 'refresh_stale'
+
+# Worst case per contact (lookup_contact falls through every path): LinkedIn
+# match + email match + company search + people search. search_person_by_name
+# repeats the company search, but the alias index answers it from the first.
+MAX_CREDITS_PER_CONTACT = 4
+
+
+def validate_config():
+    """Validate that all required environment variables are set"""
+    required = {
+        'APOLLO_API_KEY': os.getenv('APOLLO_API_KEY'),
+        'NOTION_TOKEN': os.getenv('NOTION_TOKEN'),
+        'NOTION_DB_ID': os.getenv('NOTION_DB_ID')
+    }
+
+    missing = [key for key, value in required.items() if not value]
+
+    if missing:
+        console.print("\n[bold red]Error: Missing required environment variables:[/bold red]")
+        for key in missing:
+            console.print(f"  - {key}")
+        sys.exit(1)
+
+    return required
+
+
+def option(args: list, name: str, default: int) -> int:
+    """Read an integer `--name value` option"""
+    if name in args:
+        return int(args[args.index(name) + 1])
+    return default
+
+
+def main():
+    """Refresh stale contacts under today's credit budget"""
+    args = sys.argv[1:]
+
+    if any(arg in args for arg in ['-h', '--help']):
+        console.print(Panel.fit(
+            "[bold blue]Refresh Stale Contacts - Usage[/bold blue]\n\n"
+            "python scripts/refresh_stale.py [--max-age-days 30] [--budget 200] [--dry-run]\n\n"
+            "[yellow]--max-age-days[/yellow]  Re-enrich contacts older than this (REFRESH_MAX_AGE_DAYS)\n"
+            "[yellow]--budget[/yellow]        Daily Apollo credit budget (REFRESH_DAILY_CREDITS)\n"
+            "[yellow]--dry-run[/yellow]       List what would be refreshed without calling Apollo",
+            border_style="blue"
+        ))
+        return 0
+
+    max_age_days = option(args, '--max-age-days', int(os.getenv('REFRESH_MAX_AGE_DAYS', 30)))
+    budget = option(args, '--budget', int(os.getenv('REFRESH_DAILY_CREDITS', 200)))
+    dry_run = '--dry-run' in args
+
+    config = validate_config()
+    set_tags(job=JOB_NAME)
+    ledger = CreditLedger()
+    remaining = ledger.remaining(budget, job=JOB_NAME)
+
+    console.print(Panel.fit(
+        "[bold blue]Refresh Stale Contacts[/bold blue]\n\n"
+        f"Older than: {max_age_days} days\n"
+        f"Credits left today: {remaining}/{budget}\n"
+        f"Mode: {'DRY RUN' if dry_run else 'LIVE'}",
+        border_style="blue"
+    ))
+
+    if remaining < MAX_CREDITS_PER_CONTACT:
+        console.print("\n[yellow]Daily credit budget exhausted - nothing to do[/yellow]\n")
+        return 0
+
+    # Make sure the enrichment-age fields exist before querying on them
+    schema = NotionSchemaManager(config['NOTION_TOKEN'], config['NOTION_DB_ID'])
+    ok, added = schema.ensure_properties(['Last Enriched', 'Priority'])
+    if not ok:
+        console.print("\n[bold red]Error: Could not add 'Last Enriched' / 'Priority' properties[/bold red]\n")
+        return 1
+    if added:
+        console.print(f"[green]Added properties: {', '.join(added)}[/green]")
+
+    apollo = ApolloClient(config['APOLLO_API_KEY'])
+    notion = NotionClient(config['NOTION_TOKEN'], config['NOTION_DB_ID'])
+    fingerprints = FingerprintStore(scope=config['NOTION_DB_ID'])
+
+    # Only fetch as many candidates as the budget could possibly cover
+    stale_pages = notion.find_stale_contacts(
+        max_age_days=max_age_days,
+        limit=max(remaining // MAX_CREDITS_PER_CONTACT, 1) * 2
+    )
+    console.print(f"\n[bold]Found {len(stale_pages)} stale contacts[/bold]\n")
+
+    if dry_run:
+        for page in stale_pages:
+            row = notion.page_to_row(page)
+            console.print(f"  • {row['person_name']} ({row['company_name']})")
+        return 0
+
+    # Updates go to the local warehouse; Notion syncs in the background
+    crm, sync = open_sync(notion, config['NOTION_DB_ID'])
+    results = {'success': 0, 'failed': 0, 'skipped': 0}
+
+    for page in stale_pages:
+        if ledger.remaining(budget, job=JOB_NAME) < MAX_CREDITS_PER_CONTACT:
+            console.print("[yellow]Daily credit budget reached - stopping[/yellow]")
+            break
+
+        credits_before = apollo.credits_used
+        row_started = time.perf_counter()
+        result = refresh_contact(page, apollo, crm, fingerprints)
+        ledger.record(JOB_NAME, apollo.credits_used - credits_before)
+        get_ops_metrics().record_rows(JOB_NAME, result['status'], time.perf_counter() - row_started)
+
+        results[result['status']] += 1
+        console.print(f"  • {result['person']}: {result['status']} - {result['message']}")
+
+        # Rate limiting - be nice to APIs
+        time.sleep(1.5)
+
+    with console.status(f"[cyan]Syncing {sync.warehouse.backlog()} pending changes to Notion..."):
+        synced = sync.finish()
+
+    table = Table(title="\nRefresh Summary", show_header=True, header_style="bold cyan")
+    table.add_column("Status", style="cyan", width=15)
+    table.add_column("Count", justify="right", style="magenta", width=10)
+    table.add_row("✅ Refreshed", str(results['success']))
+    table.add_row("⏭️  Unchanged / not found", str(results['skipped']))
+    table.add_row("❌ Failed", str(results['failed']))
+    table.add_row("💳 Credits used", str(apollo.credits_used))
+    table.add_row("🔄 Synced to Notion", str(sync.totals['synced']))
+    if synced['remaining']:
+        table.add_row("⏳ Waiting for Notion retry", str(synced['remaining']))
+    console.print(table)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Retry Failed Enrichment Rows
+Inspect and replay the dead-letter queue instead of re-running whole CSVs
+
+Schedule `python scripts/retry_failed.py run` (e.g. every 15 minutes via cron)
+to retry transient failures automatically with backoff.
+"""
+
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.retry_queue import RetryQueue
+
+# Load environment variables
+load_dotenv()
+
+console = Console()
+
+
+def show_usage():
+    """Show usage examples"""
+    console.print(Panel.fit(
+        "[bold blue]Retry Queue - Usage[/bold blue]\n\n"
+        "[yellow]List queued rows (optionally by status):[/yellow]\n"
+        "python scripts/retry_failed.py list [pending|dead|resolved]\n\n"
+        "[yellow]Retry rows whose backoff has elapsed:[/yellow]\n"
+        "python scripts/retry_failed.py run [--limit 50]\n\n"
+        "[yellow]Replay now (one row, or everything that gave up):[/yellow]\n"
+        "python scripts/retry_failed.py replay <id>\n"
+        "python scripts/retry_failed.py replay --dead\n\n"
+        "[yellow]Delete recovered rows:[/yellow]\n"
+        "python scripts/retry_failed.py purge",
+        border_style="blue"
+    ))
+
+
+def build_handlers():
+    """
+    Create pipeline handlers for each work item kind
+
+    Returns:
+        Tuple of (handlers, Notion sync workers to finish before exit)
+    """
+    required = ['APOLLO_API_KEY', 'NOTION_TOKEN', 'NOTION_DB_ID']
+    missing = [key for key in required if not os.getenv(key)]
+    if missing:
+        console.print(f"\n[bold red]Error: Missing environment variables: {', '.join(missing)}[/bold red]\n")
+        sys.exit(1)
+
+    from src.apollo_client import ApolloClient
+    from src.notion_client import NotionClient
+    from src.notion_sync_adapted import NotionClient as CompanyNotionClient
+    from src.processors import TierAssigner, PriorityScorer
+    from src.enrichment import enrich_contact_flexible, enrich_company, target_company
+    from src.telemetry import set_tags
+    from src.warehouse_sync import open_sync
+
+    set_tags(job='retry_failed')
+
+    apollo = ApolloClient(os.getenv('APOLLO_API_KEY'))
+    # Both write to the local warehouse; each worker pushes its own ops to Notion
+    contact_notion, contact_sync = open_sync(
+        NotionClient(os.getenv('NOTION_TOKEN'), os.getenv('NOTION_DB_ID')), os.getenv('NOTION_DB_ID')
+    )
+    company_notion, company_sync = open_sync(
+        CompanyNotionClient(os.getenv('NOTION_TOKEN'), os.getenv('NOTION_DB_ID')), os.getenv('NOTION_DB_ID')
+    )
+    tier_assigner = TierAssigner()
+    priority_scorer = PriorityScorer()
+
+    return {
+        'contact': lambda payload: enrich_contact_flexible(payload, apollo, contact_notion),
+        'company': lambda payload: enrich_company(
+            company_name=payload['company_name'],
+            apollo=apollo,
+            notion=company_notion,
+            tier_assigner=tier_assigner,
+            priority_scorer=priority_scorer,
+            skip_duplicates=True
+        ),
+        'targeting': lambda payload: target_company(apollo=apollo, notion=contact_notion, **payload),
+    }, [contact_sync, company_sync]
+
+
+def list_items(queue: RetryQueue, status: str = None):
+    """Print queued items"""
+    items = queue.list_items(status=status)
+    counts = queue.counts()
+
+    console.print(
+        f"\n[bold]Pending:[/bold] {counts['pending']}   "
+        f"[bold]Recovered:[/bold] {counts['resolved']}   "
+        f"[bold]Gave up:[/bold] {counts['dead']}\n"
+    )
+
+    if not items:
+        console.print("[green]Queue is empty[/green]\n")
+        return
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("ID", justify="right", width=5)
+    table.add_column("Kind", width=9)
+    table.add_column("Row", width=36)
+    table.add_column("Status", width=9)
+    table.add_column("Error", width=13)
+    table.add_column("Tries", justify="right", width=5)
+    table.add_column("Next Attempt (UTC)", width=19)
+
+    for item in items:
+        # Targeting items also carry the strategy and field choices; show the text fields
+        row = ', '.join(value for value in item['payload'].values() if value and isinstance(value, str))
+        table.add_row(
+            str(item['id']),
+            item['kind'],
+            row[:36],
+            item['status'],
+            item['error_class'] or '',
+            str(item['attempts']),
+            item['next_attempt_at'] if item['status'] == 'pending' else '—'
+        )
+
+    console.print(table)
+
+
+def run_due(queue: RetryQueue, limit: int = 50):
+    """Replay everything whose backoff has elapsed"""
+    due = queue.due(limit=limit)
+    if not due:
+        console.print("\n[green]Nothing due for retry[/green]\n")
+        return 0
+
+    console.print(f"\n[cyan]Retrying {len(due)} queued rows...[/cyan]")
+    handlers, workers = build_handlers()
+    summary = queue.process_due(handlers, limit=limit)
+    console.print(
+        f"[bold green]Recovered {summary['resolved']}[/bold green], "
+        f"[bold red]still failing {summary['failed']}[/bold red]"
+    )
+
+    with console.status("[cyan]Syncing recovered rows to Notion..."):
+        remaining = max(worker.finish()['remaining'] for worker in workers)
+    waiting = f", {remaining} waiting for retry (python scripts/sync_notion.py push)" if remaining else ''
+    console.print(f"[bold]Notion sync:[/bold] {sum(w.totals['synced'] for w in workers)} changes pushed{waiting}\n")
+    return 0
+
+
+def main():
+    """Main entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args else 'list'
+    queue = RetryQueue()
+
+    if command in ['-h', '--help', 'help']:
+        show_usage()
+        return 0
+
+    if command == 'list':
+        list_items(queue, status=args[1] if len(args) > 1 else None)
+        return 0
+
+    if command == 'run':
+        limit = int(args[args.index('--limit') + 1]) if '--limit' in args else 50
+        return run_due(queue, limit=limit)
+
+    if command == 'replay':
+        if len(args) < 2:
+            show_usage()
+            return 1
+        if args[1] == '--dead':
+            queue.requeue(status='dead')
+        else:
+            queue.requeue(item_id=int(args[1]))
+        return run_due(queue)
+
+    if command == 'purge':
+        queue.purge(status='resolved')
+        console.print("\n[green]Removed recovered rows[/green]\n")
+        return 0
+
+    show_usage()
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
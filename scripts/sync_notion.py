@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Warehouse -> Notion Sync
+Inspect and push the changes the enrichment pipelines queued for Notion
+
+The app and the enrichment scripts push in the background on their own;
+use this to check the backlog, push what a run left behind, or re-import
+the Notion database.
+"""
+
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.warehouse import Warehouse
+
+# Load environment variables
+load_dotenv()
+
+console = Console()
+
+
+def show_usage():
+    """Show usage examples"""
+    console.print(Panel.fit(
+        "[bold blue]Notion Sync - Usage[/bold blue]\n\n"
+        "[yellow]Show contacts per sync state and changes that gave up:[/yellow]\n"
+        "python scripts/sync_notion.py status\n\n"
+        "[yellow]Push every change that's due:[/yellow]\n"
+        "python scripts/sync_notion.py push\n\n"
+        "[yellow]Retry changes that gave up, then push:[/yellow]\n"
+        "python scripts/sync_notion.py retry\n\n"
+        "[yellow]Import existing Notion pages into the warehouse:[/yellow]\n"
+        "python scripts/sync_notion.py pull",
+        border_style="blue"
+    ))
+
+
+def build_workers(warehouse: Warehouse):
+    """Create one sync worker per Notion client kind (not started)"""
+    required = ['NOTION_TOKEN', 'NOTION_DB_ID']
+    missing = [key for key in required if not os.getenv(key)]
+    if missing:
+        console.print(f"\n[bold red]Error: Missing environment variables: {', '.join(missing)}[/bold red]\n")
+        sys.exit(1)
+
+    from src.notion_client import NotionClient
+    from src.notion_sync_adapted import NotionClient as CompanyNotionClient
+    from src.warehouse_sync import SyncWorker
+
+    token, db_id = os.getenv('NOTION_TOKEN'), os.getenv('NOTION_DB_ID')
+    return [
+        SyncWorker(warehouse, NotionClient(token, db_id)),
+        SyncWorker(warehouse, CompanyNotionClient(token, db_id)),
+    ]
+
+
+def show_status(warehouse: Warehouse):
+    """Print sync counts and the changes that gave up"""
+    counts = warehouse.counts()
+    console.print(
+        f"\n[bold]Contacts:[/bold] {counts['contacts']}   "
+        f"[bold]Synced:[/bold] {counts['synced']}   "
+        f"[bold]Waiting:[/bold] {counts['outbox_pending']}   "
+        f"[bold]Gave up:[/bold] {counts['outbox_dead']}   "
+        f"[bold]Imported from Notion:[/bold] {'yes' if warehouse.is_backfilled() else 'no'}\n"
+    )
+
+    failed = warehouse.failed_changes()
+    if not failed:
+        return
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("ID", justify="right", width=5)
+    table.add_column("Change", width=20)
+    table.add_column("Error", width=13)
+    table.add_column("Tries", justify="right", width=5)
+    table.add_column("Message", width=40)
+    table.add_column("Last Attempt (UTC)", width=19)
+
+    for item in failed:
+        table.add_row(
+            str(item['id']),
+            item['op'],
+            item['error_class'] or '',
+            str(item['attempts']),
+            (item['error_message'] or '')[:40],
+            item['updated_at']
+        )
+
+    console.print(table)
+
+
+def push(warehouse: Warehouse):
+    """Push everything that's due"""
+    backlog = warehouse.backlog()
+    if not backlog:
+        console.print("\n[green]Nothing waiting for Notion[/green]\n")
+        return 0
+
+    synced = failed = remaining = 0
+    with console.status(f"[cyan]Syncing {backlog} pending changes..."):
+        for worker in build_workers(warehouse):
+            summary = worker.drain()
+            synced += summary['synced']
+            failed += summary['failed']
+            remaining = summary['remaining']
+
+    console.print(
+        f"\n[bold green]Pushed {synced}[/bold green], "
+        f"[bold red]failed {failed}[/bold red], "
+        f"{remaining} still waiting (backing off after errors)\n"
+    )
+    return 0 if not failed else 1
+
+
+def main():
+    """Main entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args else 'status'
+
+    if command in ['-h', '--help', 'help']:
+        show_usage()
+        return 0
+
+    warehouse = Warehouse(scope=os.getenv('NOTION_DB_ID', ''))
+
+    if command == 'status':
+        show_status(warehouse)
+        return 0
+
+    if command == 'push':
+        return push(warehouse)
+
+    if command == 'retry':
+        count = warehouse.requeue_failed()
+        console.print(f"\n[cyan]Retrying {count} changes that gave up[/cyan]")
+        return push(warehouse)
+
+    if command == 'pull':
+        with console.status("[cyan]Importing Notion pages..."):
+            imported = build_workers(warehouse)[0].backfill()
+        console.print(f"\n[green]Imported {imported} new contacts from Notion[/green]\n")
+        return 0
+
+    show_usage()
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
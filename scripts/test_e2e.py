@@ -118,15 +118,17 @@ def test_single_person(person_name: str, company_name: str):
 
         # Step 5: Write to Notion
         console.print(f"\n[cyan]Step 4: Writing to Notion...[/cyan]")
-        success, action_taken = notion.upsert_contact(
+        result = notion.upsert_contact(
             contact_name=person_data['name'],
             company_name=company_data['name'],
             enriched_data=person_data,
-            company_data=company_data
+            company_data=company_data,
+            page_id=existing_page['id'] if existing_page else None,
+            checked=True
         )
 
-        if success:
-            console.print(f"   ✓ Successfully {action_taken} contact in Notion!")
+        if result.success:
+            console.print(f"   ✓ Successfully {result.action} contact in Notion!")
 
             # Success summary
             console.print("\n" + "=" * 70)
@@ -134,7 +136,7 @@ def test_single_person(person_name: str, company_name: str):
                 f"[bold green]✓ End-to-End Test PASSED![/bold green]\n\n"
                 f"Contact: {person_data['name']}\n"
                 f"Company: {company_data['name']}\n"
-                f"Action: {action_taken.upper()}\n\n"
+                f"Action: {result.action.upper()}\n\n"
                 f"[bold]What was written to Notion:[/bold]\n"
                 f"  • Contact Name: {person_data['name']}\n"
                 f"  • Company: {company_data['name']}\n"
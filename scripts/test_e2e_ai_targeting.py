@@ -174,14 +174,15 @@ def test_e2e_workflow():
                 # Get cached company data
                 company_data = company_cache.get(company_name)
 
-                success, action = notion.upsert_contact(
+                result = notion.upsert_contact(
                     contact_name=person['name'],
                     company_name=company_name,
                     enriched_data=person,
-                    company_data=company_data
+                    company_data=company_data,
+                    checked=True
                 )
 
-                if success:
+                if result.success:
                     console.print(f"  [green]✓ Added:[/green] {person['name']} - {person['title']}")
                     added_count += 1
                 else:
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Warehouse Writes
+Round-trips Contact/Company records through a throwaway warehouse database:
+save_company, save_contact (create and merge), enqueue_sync and claim_due.
+Needs no API keys.
+
+Usage:
+    python scripts/test_warehouse.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.records import Company, Contact
+from src.warehouse import Warehouse
+
+
+def check(label: str, ok: bool) -> bool:
+    print(f"  {'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def test_warehouse() -> bool:
+    """Write records the way the pipelines do and read them back"""
+    print("\n" + "=" * 60)
+    print("  Testing Warehouse Writes")
+    print("=" * 60 + "\n")
+
+    company = Company(apollo_id='org_1', name='Acme Health', domain='acmehealth.com',
+                      technologies=['Epic'])
+    contact = Contact(apollo_id='per_1', name='Jordan Chen', first_name='Jordan', last_name='Chen',
+                      title='CEO', email='jordan.chen@acmehealth.com',
+                      linkedin_url='http://www.linkedin.com/in/jordan-chen')
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = Warehouse(scope='test-db', db_path=f'{tmp}/warehouse.db')
+
+        warehouse.save_company(company, tier='Tier 1', priority=90)
+        rows = warehouse._fetch('SELECT data FROM companies WHERE scope = ?', (warehouse.scope,))
+        results.append(check("save_company stores a Company record",
+                             len(rows) == 1 and rows[0]['data'] == company.to_dict()))
+
+        contact_id, action = warehouse.save_contact('Jordan Chen', 'Acme Health', contact)
+        stored = warehouse.find_contact('Jordan Chen', 'Acme Health')
+        results.append(check("save_contact creates from a Contact record",
+                             action == 'created' and stored is not None and stored['data'] == contact.to_dict()))
+
+        _, action = warehouse.save_contact('Jordan Chen', 'Acme Health', {'phone': '555-0100'})
+        stored = warehouse.find_contact('Jordan Chen', 'Acme Health')
+        results.append(check("save_contact merges a partial update",
+                             action == 'updated' and stored['data']['phone'] == '555-0100'
+                             and stored['data']['email'] == contact.email))
+
+        warehouse.enqueue_sync('upsert_contact', {'person_data': contact, 'company_data': company},
+                               contact_id=contact_id)
+        items = warehouse.claim_due()
+        payload = items[0]['payload'] if items else {}
+        results.append(check("enqueue_sync serializes records and claim_due decodes them",
+                             len(items) == 1 and payload.get('person_data') == contact.to_dict()
+                             and payload.get('company_data') == company.to_dict()))
+
+    passed = all(results)
+    print(f"\n{'🎉 All warehouse checks passed' if passed else '❌ Warehouse checks failed'}\n")
+    return passed
+
+
+if __name__ == '__main__':
+    sys.exit(0 if test_warehouse() else 1)
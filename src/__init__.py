@@ -3,9 +3,16 @@ HLTH 2025 CRM - Source Package
 Core enrichment and sync functionality
 """
 
-from .apollo_client import ApolloClient
-from .notion_sync import NotionClient
-from .processors import TierAssigner, PriorityScorer
+import importlib
+
+# Public names -> defining module. Imported on first access (PEP 562) so that
+# `import src.x` doesn't pull in requests, the Notion SDK and pandas.
+_LAZY_EXPORTS = {
+    'ApolloClient': '.apollo_client',
+    'NotionClient': '.notion_sync',
+    'TierAssigner': '.processors',
+    'PriorityScorer': '.processors',
+}
 
 __all__ = [
     'ApolloClient',
@@ -15,3 +22,15 @@ __all__ = [
 ]
 
 __version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
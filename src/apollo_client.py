@@ -3,41 +3,162 @@ Apollo.io API Client
 Handles company and contact enrichment
 """
 
+import os
+import httpx
 import requests
 from typing import Optional, List, Dict
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
-
 
+from .company_index import CompanyIndex, alias_key, get_company_index
+from .fast_json import decode_apollo, dumps
+from .http_transport import http2_client, pooled_session
+from .keyword_classifier import KeywordClassifier
+from .people_cache import PeopleSearchCache, search_key, tenant_scope
+from .records import Company, Contact
+from .retry_policy import api_retry, get_breaker
+from .singleflight import SingleFlight, coalesced
+from .telemetry import traced, instrument_session
+from .profiling import step, profiled
+
+
+# Titles searched at every company
+BASE_TITLES = ['CEO', 'COO', 'CFO', 'President', 'Founder']
+
+# Industry segments checked in order: first match wins
+INDUSTRY_SEGMENTS = KeywordClassifier([
+    ('payer', ['insurance', 'payer', 'health plan']),
+    ('provider', ['hospital', 'provider', 'health system', 'clinic', 'medical']),
+    ('pharmacy', ['pharmacy', 'pbm', 'drug']),
+    ('pharma', ['pharma', 'biotech', 'pharmaceutical']),
+], default='other')
+
+# Industry-specific titles added to BASE_TITLES
+SEGMENT_TITLES = {
+    'payer': [
+        'CMO', 'Chief Medical Officer',
+        'VP Quality', 'VP Operations',
+        'VP Medicare', 'VP Medicare Advantage',
+        'Director Star Ratings', 'Director Quality',
+        'VP Member Services'
+    ],
+    'provider': [
+        'VP Operations', 'VP Care Management',
+        'VP Population Health', 'Chief Clinical Officer',
+        'Director Care Management', 'VP Quality',
+        'Chief Nursing Officer'
+    ],
+    'pharmacy': [
+        'VP Pharmacy Operations', 'VP Clinical Programs',
+        'Director Adherence', 'Chief Pharmacy Officer',
+        'VP Pharmacy Services'
+    ],
+    'pharma': [
+        'VP Commercial', 'VP Market Access',
+        'Director Patient Services', 'VP Marketing'
+    ],
+    # Default for other industries
+    'other': [
+        'CTO', 'VP Strategy', 'VP Innovation',
+        'VP Business Development', 'VP Sales'
+    ],
+}
+
+
+# search_company and search_people_by_company answer from local caches when
+# they can, so only search_organization / fetch_people_by_company (the Apollo
+# round trips) are traced
+@traced('apollo', exclude=('get_target_titles', 'search_company', 'search_people_by_company'))
 class ApolloClient:
     """Apollo.io API client for company and contact enrichment"""
 
     BASE_URL = "https://api.apollo.io/v1"
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: Optional[str] = None,
+                 company_index: Optional[CompanyIndex] = None,
+                 people_cache: Optional[PeopleSearchCache] = None,
+                 pool_size: Optional[int] = None):
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Names, domains and LinkedIn URLs already resolved (shared by all users)
+        self.company_index = company_index or get_company_index()
+        # Recent people searches (shared by everyone using this Apollo key)
+        self.people_cache = people_cache or PeopleSearchCache(scope=tenant_scope(api_key))
+        # Concurrent identical searches (e.g. contacts sharing a company) make one request
+        self.singleflight = SingleFlight('apollo_inflight')
+        # APOLLO_BASE_URL points the client at a stand-in server (see benchmarks/)
+        self.base_url = (base_url or os.getenv('APOLLO_BASE_URL') or self.BASE_URL).rstrip('/')
+        # Keep-alive pool sized for concurrent callers (APOLLO_POOL_SIZE / HTTP_POOL_SIZE)
+        self.session = instrument_session(pooled_session('apollo', pool_size))
+        # One multiplexed HTTP/2 connection instead, when APOLLO_HTTP2 is on and h2 installed
+        self.http2 = http2_client('apollo', pool_size)
+        # Shared by every Apollo client, so an outage fails fast everywhere
+        self.breaker = get_breaker('apollo')
+        headers = {
             "Content-Type": "application/json",
-            "Cache-Control": "no-cache",
             "X-Api-Key": api_key
-        })
+        }
+        self.session.headers.update(headers)
+        if self.http2 is not None:
+            self.http2.headers.update(headers)
+        # Every request counts as one Apollo credit (conservative budget estimate)
+        self.credits_used = 0
+
+    def _post(self, endpoint: str, payload: Dict) -> Dict:
+        """POST to Apollo and return the decoded JSON body (fails fast while Apollo is down)"""
+        trial = self.breaker.before_call()
+        try:
+            self.credits_used += 1
+            body = dumps(payload)
+            try:
+                with step('api_wait'):
+                    if self.http2 is not None:
+                        response = self.http2.post(endpoint, content=body)
+                    else:
+                        response = self.session.post(endpoint, data=body)
+            except (requests.RequestException, httpx.HTTPError) as e:
+                self.breaker.record(error=e)
+                raise
+            self.breaker.record(status=response.status_code)
+        finally:
+            # Any other exception must not leave the circuit stuck half-open
+            self.breaker.release(trial)
+        response.raise_for_status()
+        with step('json_decode'):
+            return decode_apollo(response.content)
 
-    @retry(
-        wait=wait_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(requests.exceptions.RequestException)
-    )
+    @coalesced(lambda company_name: alias_key(company_name) or company_name)
     def search_company(self, company_name: str) -> Optional[Dict]:
         """
         Search for company by name
 
+        Resolves from the local alias index when the name (or a close variant,
+        domain or LinkedIn URL) was seen before; otherwise asks Apollo and
+        remembers the answer under the searched name.
+
+        Args:
+            company_name: Name of the company to search
+
+        Returns:
+            Company data dict or None if not found
+        """
+        company_data = self.company_index.lookup(company_name)
+        if company_data:
+            return company_data
+
+        company_data = self.search_organization(company_name)
+        self.company_index.learn(company_data, query=company_name)
+        return company_data
+
+    @api_retry()
+    def search_organization(self, company_name: str) -> Optional[Dict]:
+        """
+        Search Apollo for a company by name (always one API call)
+
         Args:
             company_name: Name of the company to search
 
         Returns:
             Company data dict or None if not found
         """
-        endpoint = f"{self.BASE_URL}/organizations/search"
+        endpoint = f"{self.base_url}/organizations/search"
 
         payload = {
             "q_organization_name": company_name,
@@ -45,10 +166,7 @@ class ApolloClient:
             "per_page": 1
         }
 
-        response = self.session.post(endpoint, json=payload)
-        response.raise_for_status()
-
-        data = response.json()
+        data = self._post(endpoint, payload)
 
         if data.get('organizations') and len(data['organizations']) > 0:
             org = data['organizations'][0]
@@ -56,11 +174,7 @@ class ApolloClient:
 
         return None
 
-    @retry(
-        wait=wait_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(requests.exceptions.RequestException)
-    )
+    @api_retry()
     def search_people(
         self,
         company_id: str,
@@ -78,7 +192,7 @@ class ApolloClient:
         Returns:
             List of contact dicts
         """
-        endpoint = f"{self.BASE_URL}/people/search"
+        endpoint = f"{self.base_url}/people/search"
 
         payload = {
             "organization_ids": [company_id],
@@ -87,10 +201,7 @@ class ApolloClient:
             "per_page": max_results
         }
 
-        response = self.session.post(endpoint, json=payload)
-        response.raise_for_status()
-
-        data = response.json()
+        data = self._post(endpoint, payload)
 
         contacts = []
         for person in data.get('people', []):
@@ -98,11 +209,8 @@ class ApolloClient:
 
         return contacts
 
-    @retry(
-        wait=wait_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(requests.exceptions.RequestException)
-    )
+    @coalesced(lambda person_name, company_name: ((person_name or '').strip().lower(), alias_key(company_name)))
+    @api_retry()
     def search_person_by_name(
         self,
         person_name: str,
@@ -118,7 +226,7 @@ class ApolloClient:
         Returns:
             Contact dict or None if not found
         """
-        endpoint = f"{self.BASE_URL}/people/search"
+        endpoint = f"{self.base_url}/people/search"
 
         # First get company to narrow search
         company_data = self.search_company(company_name)
@@ -133,10 +241,7 @@ class ApolloClient:
             "per_page": 5  # Get top 5 matches
         }
 
-        response = self.session.post(endpoint, json=payload)
-        response.raise_for_status()
-
-        data = response.json()
+        data = self._post(endpoint, payload)
 
         # Find best match by name
         people = data.get('people', [])
@@ -153,11 +258,8 @@ class ApolloClient:
         # If no close match, return first result
         return self._normalize_contact(people[0])
 
-    @retry(
-        wait=wait_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(requests.exceptions.RequestException)
-    )
+    @coalesced(lambda linkedin_url: (linkedin_url or '').strip().rstrip('/').lower())
+    @api_retry()
     def search_by_linkedin_url(self, linkedin_url: str) -> Optional[Dict]:
         """
         Find person by LinkedIn URL using enrichment endpoint (exact match)
@@ -169,7 +271,7 @@ class ApolloClient:
             Tuple of (contact_dict, company_dict) or (None, None) if not found
         """
         # Use enrichment endpoint for exact LinkedIn matching
-        endpoint = f"{self.BASE_URL}/people/match"
+        endpoint = f"{self.base_url}/people/match"
 
         # Clean URL
         linkedin_url = linkedin_url.strip()
@@ -181,10 +283,7 @@ class ApolloClient:
             "linkedin_url": linkedin_url
         }
 
-        response = self.session.post(endpoint, json=payload)
-        response.raise_for_status()
-
-        data = response.json()
+        data = self._post(endpoint, payload)
 
         # Enrichment endpoint returns 'person' not 'people'
         person = data.get('person')
@@ -198,14 +297,12 @@ class ApolloClient:
         org = person.get('organization')
         if org:
             company_data = self._normalize_company(org)
+            self.company_index.learn(company_data)
 
         return person_data, company_data
 
-    @retry(
-        wait=wait_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(requests.exceptions.RequestException)
-    )
+    @coalesced(lambda email: (email or '').strip().lower())
+    @api_retry()
     def search_by_email(self, email: str) -> Optional[Dict]:
         """
         Find person by email address using enrichment endpoint (exact match)
@@ -217,17 +314,14 @@ class ApolloClient:
             Tuple of (contact_dict, company_dict) or (None, None) if not found
         """
         # Use enrichment endpoint for exact email matching
-        endpoint = f"{self.BASE_URL}/people/match"
+        endpoint = f"{self.base_url}/people/match"
 
         # Enrichment endpoint with email
         payload = {
             "email": email.strip()
         }
 
-        response = self.session.post(endpoint, json=payload)
-        response.raise_for_status()
-
-        data = response.json()
+        data = self._post(endpoint, payload)
 
         # Enrichment endpoint returns 'person' not 'people'
         person = data.get('person')
@@ -241,40 +335,43 @@ class ApolloClient:
         org = person.get('organization')
         if org:
             company_data = self._normalize_company(org)
+            self.company_index.learn(company_data)
 
         return person_data, company_data
 
-    def _normalize_company(self, raw_data: Dict) -> Dict:
+    @profiled('normalization')
+    def _normalize_company(self, raw_data: Dict) -> Company:
         """Convert Apollo response to internal format"""
-        return {
-            'apollo_id': raw_data.get('id'),
-            'name': raw_data.get('name', ''),
-            'domain': raw_data.get('website_url', '').replace('http://', '').replace('https://', '').rstrip('/'),
-            'linkedin_url': raw_data.get('linkedin_url', ''),
-            'industry': raw_data.get('industry', ''),
-            'employee_count': raw_data.get('estimated_num_employees', 0),
-            'revenue_range': self._format_revenue(raw_data.get('estimated_annual_revenue')),
-            'location': self._format_location(raw_data),
-            'technologies': raw_data.get('technologies', []),
-            'funding_stage': raw_data.get('funding_stage', 'Unknown'),
-        }
-
-    def _normalize_contact(self, raw_data: Dict) -> Dict:
+        return Company(
+            apollo_id=raw_data.get('id'),
+            name=raw_data.get('name', ''),
+            domain=raw_data.get('website_url', '').replace('http://', '').replace('https://', '').rstrip('/'),
+            linkedin_url=raw_data.get('linkedin_url', ''),
+            industry=raw_data.get('industry', ''),
+            employee_count=raw_data.get('estimated_num_employees', 0),
+            revenue_range=self._format_revenue(raw_data.get('estimated_annual_revenue')),
+            location=self._format_location(raw_data),
+            technologies=raw_data.get('technologies', []),
+            funding_stage=raw_data.get('funding_stage', 'Unknown'),
+        )
+
+    @profiled('normalization')
+    def _normalize_contact(self, raw_data: Dict) -> Contact:
         """Convert Apollo contact response to internal format"""
-        return {
-            'apollo_id': raw_data.get('id'),
-            'name': raw_data.get('name', ''),
-            'first_name': raw_data.get('first_name', ''),
-            'last_name': raw_data.get('last_name', ''),
-            'title': raw_data.get('title', ''),
-            'seniority': raw_data.get('seniority', ''),
-            'email': raw_data.get('email'),
-            'phone': raw_data.get('phone'),
-            'linkedin_url': raw_data.get('linkedin_url', ''),
-            'city': raw_data.get('city', ''),
-            'state': raw_data.get('state', ''),
-            'country': raw_data.get('country', ''),
-        }
+        return Contact(
+            apollo_id=raw_data.get('id'),
+            name=raw_data.get('name', ''),
+            first_name=raw_data.get('first_name', ''),
+            last_name=raw_data.get('last_name', ''),
+            title=raw_data.get('title', ''),
+            seniority=raw_data.get('seniority', ''),
+            email=raw_data.get('email'),
+            phone=raw_data.get('phone'),
+            linkedin_url=raw_data.get('linkedin_url', ''),
+            city=raw_data.get('city', ''),
+            state=raw_data.get('state', ''),
+            country=raw_data.get('country', ''),
+        )
 
     def _format_revenue(self, revenue: Optional[int]) -> str:
         """Format revenue into ranges"""
@@ -305,11 +402,9 @@ class ApolloClient:
 
         return ", ".join(parts) if parts else "Unknown"
 
-    @retry(
-        wait=wait_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(requests.exceptions.RequestException)
-    )
+    @coalesced(lambda company_id, titles, seniorities=None, locations=None, max_results=10: (
+        search_key(company_id, titles, seniorities, locations), min(max_results, 100)
+    ))
     def search_people_by_company(
         self,
         company_id: str,
@@ -321,6 +416,41 @@ class ApolloClient:
         """
         Search for people at a specific company with advanced filters
 
+        Answers from the people-search cache when the same company and
+        filters were searched recently (for at least as many people).
+
+        Args:
+            company_id: Apollo organization ID
+            titles: List of job titles to search for
+            seniorities: List of seniority levels (optional)
+            locations: List of locations (optional)
+            max_results: Maximum number of people to return
+
+        Returns:
+            List of normalized contact dicts
+        """
+        per_page = min(max_results, 100)  # Apollo max is 100 per request
+        key = search_key(company_id, titles, seniorities, locations)
+        people = self.people_cache.get(key, per_page)
+        if people is not None:
+            return people
+
+        people = self.fetch_people_by_company(company_id, titles, seniorities, locations, per_page)
+        self.people_cache.put(key, per_page, people)
+        return people
+
+    @api_retry()
+    def fetch_people_by_company(
+        self,
+        company_id: str,
+        titles: List[str],
+        seniorities: List[str] = None,
+        locations: List[str] = None,
+        max_results: int = 10
+    ) -> List[Dict]:
+        """
+        Search Apollo for people at a company (always one API call)
+
         Args:
             company_id: Apollo organization ID
             titles: List of job titles to search for
@@ -331,7 +461,7 @@ class ApolloClient:
         Returns:
             List of normalized contact dicts
         """
-        endpoint = f"{self.BASE_URL}/people/search"
+        endpoint = f"{self.base_url}/people/search"
 
         payload = {
             "organization_ids": [company_id],
@@ -347,10 +477,7 @@ class ApolloClient:
         if locations:
             payload["person_locations"] = locations
 
-        response = self.session.post(endpoint, json=payload)
-        response.raise_for_status()
-
-        data = response.json()
+        data = self._post(endpoint, payload)
 
         # Normalize all contacts
         people = []
@@ -369,45 +496,5 @@ class ApolloClient:
         Returns:
             List of job titles to search for
         """
-        industry_lower = industry.lower()
-
-        # Base titles for everyone
-        base_titles = ['CEO', 'COO', 'CFO', 'President', 'Founder']
-
-        # Industry-specific titles
-        if any(kw in industry_lower for kw in ['insurance', 'payer', 'health plan']):
-            return base_titles + [
-                'CMO', 'Chief Medical Officer',
-                'VP Quality', 'VP Operations',
-                'VP Medicare', 'VP Medicare Advantage',
-                'Director Star Ratings', 'Director Quality',
-                'VP Member Services'
-            ]
-
-        elif any(kw in industry_lower for kw in ['hospital', 'provider', 'health system', 'clinic', 'medical']):
-            return base_titles + [
-                'VP Operations', 'VP Care Management',
-                'VP Population Health', 'Chief Clinical Officer',
-                'Director Care Management', 'VP Quality',
-                'Chief Nursing Officer'
-            ]
-
-        elif any(kw in industry_lower for kw in ['pharmacy', 'pbm', 'drug']):
-            return base_titles + [
-                'VP Pharmacy Operations', 'VP Clinical Programs',
-                'Director Adherence', 'Chief Pharmacy Officer',
-                'VP Pharmacy Services'
-            ]
-
-        elif any(kw in industry_lower for kw in ['pharma', 'biotech', 'pharmaceutical']):
-            return base_titles + [
-                'VP Commercial', 'VP Market Access',
-                'Director Patient Services', 'VP Marketing'
-            ]
-
-        else:
-            # Default for other industries
-            return base_titles + [
-                'CTO', 'VP Strategy', 'VP Innovation',
-                'VP Business Development', 'VP Sales'
-            ]
+        segment = INDUSTRY_SEGMENTS.classify(industry)
+        return BASE_TITLES + SEGMENT_TITLES[segment]
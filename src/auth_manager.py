@@ -4,11 +4,17 @@ Authentication Manager for Ping CRM
 Handles password hashing and API key encryption
 """
 
-import bcrypt
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from cryptography.fernet import Fernet
 import os
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from .db_manager import DatabaseManager
+from .password_hasher import get_hasher, PasswordQueueFull
+
+
+# Seconds registration waits for the slowest API key check
+VALIDATION_TIMEOUT_SECONDS = 30
 
 
 class AuthManager:
@@ -23,6 +29,8 @@ class AuthManager:
                           If not provided, will look for ENCRYPTION_KEY env var or Streamlit secrets
         """
         self.db = DatabaseManager()
+        # Shared bcrypt pool (BCRYPT_ROUNDS / BCRYPT_WORKERS / BCRYPT_MAX_PENDING)
+        self.hasher = get_hasher()
 
         # Get or generate encryption key
         if encryption_key is None:
@@ -50,22 +58,29 @@ class AuthManager:
         """Generate a new Fernet encryption key"""
         return Fernet.generate_key().decode()
 
+    @staticmethod
+    def is_admin(email: str) -> bool:
+        """True if the email is listed in ADMIN_EMAILS (comma-separated)"""
+        admins = {e.strip().lower() for e in os.getenv('ADMIN_EMAILS', '').split(',') if e.strip()}
+        return bool(email) and email.strip().lower() in admins
+
     def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        salt = bcrypt.gensalt(rounds=12)  # 12 rounds = good security/speed balance
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        """Hash password using bcrypt (cost factor from BCRYPT_ROUNDS, default 12)"""
+        return self.hasher.hash(password)
 
     def verify_password(self, password: str, password_hash: str) -> bool:
         """Verify password against hash"""
         try:
-            return bcrypt.checkpw(
-                password.encode('utf-8'),
-                password_hash.encode('utf-8')
-            )
+            return self.hasher.verify(password, password_hash)
+        except PasswordQueueFull:
+            raise
         except Exception:
             return False
 
+    def login_metrics(self) -> Dict:
+        """bcrypt pool configuration, queue depth and login latency percentiles (ms)"""
+        return self.hasher.stats()
+
     def encrypt_key(self, api_key: str) -> str:
         """Encrypt an API key"""
         if not api_key:
@@ -109,7 +124,10 @@ class AuthManager:
             return False, "Email already registered"
 
         # Hash password
-        password_hash = self.hash_password(password)
+        try:
+            password_hash = self.hash_password(password)
+        except PasswordQueueFull as e:
+            return False, str(e)
 
         # Encrypt API keys
         encrypted_apollo = self.encrypt_key(apollo_key)
@@ -140,6 +158,16 @@ class AuthManager:
         Returns:
             (success, message, user_data_with_keys)
         """
+        started = time.perf_counter()
+        try:
+            return self._login_user(email, password)
+        except PasswordQueueFull as e:
+            return False, str(e), None
+        finally:
+            self.hasher.latency.record('login', time.perf_counter() - started)
+
+    def _login_user(self, email: str, password: str) -> Tuple[bool, str, Optional[dict]]:
+        """login_user without latency accounting"""
         # Get user from database
         user = self.db.get_user_by_email(email)
 
@@ -150,8 +178,13 @@ class AuthManager:
         if not self.verify_password(password, user['password_hash']):
             return False, "Invalid email or password", None
 
+        # Re-hash with the current cost factor after BCRYPT_ROUNDS changes
+        if self.hasher.needs_rehash(user['password_hash']):
+            self.db.update_password_hash(email, self.hash_password(password))
+
         # Decrypt API keys
         decrypted_data = {
+            'id': user['id'],
             'email': user['email'],
             'apollo_key': self.decrypt_key(user['encrypted_apollo_key']),
             'notion_token': self.decrypt_key(user['encrypted_notion_token']),
@@ -193,86 +226,142 @@ class AuthManager:
         """
         Validate API keys before registration and setup Notion database schema
 
+        Apollo, Notion access and the AI key are checked concurrently with
+        read-only calls, each with its own timeout, so registration waits for
+        the slowest check rather than the sum. Messages keep that fixed order.
+        The Notion schema is set up (missing properties added) only after
+        every check passed, so a rejected key never changes the database.
+
         Returns:
             (valid, message)
         """
+        checks = [
+            ('Apollo', self._check_apollo_key, (apollo_key,)),
+            ('Notion', self._check_notion_access, (notion_token, notion_db_id)),
+        ]
+        if ai_key:
+            checks.append(('AI', self._check_ai_key, (ai_key,)))
+
+        executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix='validate')
         try:
-            # Import clients for validation
-            from .apollo_client import ApolloClient
-            from notion_client import Client
-            from .notion_schema import NotionSchemaManager
+            futures = [(name, executor.submit(check, *args)) for name, check, args in checks]
+            deadline = time.monotonic() + VALIDATION_TIMEOUT_SECONDS
 
             messages = []
+            for name, future in futures:
+                try:
+                    valid, check_messages = future.result(timeout=max(deadline - time.monotonic(), 0))
+                except FutureTimeout:
+                    return False, f"❌ {name} check timed out after {VALIDATION_TIMEOUT_SECONDS}s"
+                except Exception as e:
+                    return False, f"❌ Validation error: {str(e)}"
+
+                if not valid:
+                    return False, check_messages[-1]
+                messages.extend(check_messages)
+        finally:
+            # Don't wait on a check that timed out
+            executor.shutdown(wait=False)
+
+        valid, setup_messages = self._setup_notion_schema(notion_token, notion_db_id)
+        if not valid:
+            return False, setup_messages[-1]
+        messages.extend(setup_messages)
+
+        return True, "\n".join(messages)
+
+    def _check_apollo_key(self, apollo_key: str) -> Tuple[bool, List[str]]:
+        """Apollo key works for a company search"""
+        from .apollo_client import ApolloClient
+
+        apollo = ApolloClient(apollo_key)
+        # search_organization, not search_company: the alias index would answer
+        # "Google" from another user's lookup without ever checking this key
+        test_company = apollo.search_organization("Google")
+        if not test_company:
+            return False, ["❌ Apollo API key invalid"]
+        return True, ["✅ Apollo API key validated"]
+
+    def _check_notion_access(self, notion_token: str, notion_db_id: str) -> Tuple[bool, List[str]]:
+        """Notion credentials reach the database (read-only; nothing is changed)"""
+        from notion_client import Client
+        from .notion_schema import NotionSchemaManager
+
+        messages = []
+
+        # Test Notion - basic access
+        client = Client(auth=notion_token, base_url=os.getenv('NOTION_BASE_URL', 'https://api.notion.com'))
+        try:
+            client.databases.query(database_id=notion_db_id, page_size=1)
+            messages.append("✅ Notion credentials validated")
+        except Exception as e:
+            return False, [f"❌ Notion credentials invalid: {str(e)}"]
 
-            # Test Apollo
-            apollo = ApolloClient(apollo_key)
-            test_company = apollo.search_company("Google")
-            if not test_company:
-                return False, "❌ Apollo API key invalid"
-            messages.append("✅ Apollo API key validated")
+        # Check if database exists
+        try:
+            exists, exist_msg = NotionSchemaManager(notion_token, notion_db_id).check_database_exists()
+        except Exception as e:
+            return False, [f"❌ Notion database check error: {str(e)}"]
+        if not exists:
+            return False, [f"❌ {exist_msg}"]
+        messages.append(f"✅ {exist_msg}")
 
-            # Test Notion - basic access
-            client = Client(auth=notion_token)
-            try:
-                client.databases.query(database_id=notion_db_id, page_size=1)
-                messages.append("✅ Notion credentials validated")
-            except Exception as e:
-                return False, f"❌ Notion credentials invalid: {str(e)}"
+        return True, messages
 
-            # Validate and setup Notion database schema
-            try:
-                schema_manager = NotionSchemaManager(notion_token, notion_db_id)
-
-                # Check if database exists
-                exists, exist_msg = schema_manager.check_database_exists()
-                if not exists:
-                    return False, f"❌ {exist_msg}"
-                messages.append(f"✅ {exist_msg}")
-
-                # Validate current schema
-                is_valid, validation_msg, missing = schema_manager.validate_schema()
-
-                if not is_valid:
-                    # Auto-setup schema by adding missing properties
-                    messages.append(f"⚙️ Setting up database schema...")
-                    success, setup_msg, added = schema_manager.setup_schema(include_optional=True)
-
-                    if success:
-                        if added:
-                            messages.append(f"✅ {setup_msg}")
-                            messages.append(f"   Added properties: {', '.join(added)}")
-                        else:
-                            messages.append(f"✅ {setup_msg}")
+    def _setup_notion_schema(self, notion_token: str, notion_db_id: str) -> Tuple[bool, List[str]]:
+        """Validate the database schema and add missing properties (only once every key checked out)"""
+        from .notion_schema import NotionSchemaManager
+
+        messages = []
+        try:
+            schema_manager = NotionSchemaManager(notion_token, notion_db_id)
+
+            # Validate current schema
+            is_valid, validation_msg, missing = schema_manager.validate_schema()
+
+            if not is_valid:
+                # Auto-setup schema by adding missing properties
+                messages.append(f"⚙️ Setting up database schema...")
+                success, setup_msg, added = schema_manager.setup_schema(include_optional=True)
+
+                if success:
+                    if added:
+                        messages.append(f"✅ {setup_msg}")
+                        messages.append(f"   Added properties: {', '.join(added)}")
                     else:
-                        return False, f"❌ Schema setup failed: {setup_msg}"
+                        messages.append(f"✅ {setup_msg}")
                 else:
-                    messages.append("✅ Database schema validated")
+                    return False, [f"❌ Schema setup failed: {setup_msg}"]
+            else:
+                messages.append("✅ Database schema validated")
 
-            except Exception as e:
-                return False, f"❌ Notion schema setup error: {str(e)}"
-
-            # Test AI key if provided
-            if ai_key:
-                if ai_key.startswith('sk-'):
-                    # OpenAI
-                    import openai
-                    openai.api_key = ai_key
-                    try:
-                        openai.models.list()
-                        messages.append("✅ OpenAI API key validated")
-                    except Exception as e:
-                        return False, f"❌ OpenAI API key invalid: {str(e)}"
-                else:
-                    # Gemini
-                    import google.generativeai as genai
-                    try:
-                        genai.configure(api_key=ai_key)
-                        genai.list_models()
-                        messages.append("✅ Gemini API key validated")
-                    except Exception as e:
-                        return False, f"❌ Gemini API key invalid: {str(e)}"
+        except Exception as e:
+            return False, [f"❌ Notion schema setup error: {str(e)}"]
 
-            return True, "\n".join(messages)
+        return True, messages
 
-        except Exception as e:
-            return False, f"❌ Validation error: {str(e)}"
+    def _check_ai_key(self, ai_key: str) -> Tuple[bool, List[str]]:
+        """OpenAI (sk-...) or Gemini key can list models"""
+        if ai_key.startswith('sk-'):
+            # OpenAI - own client, so concurrent registrations don't share a global key
+            import openai
+            try:
+                openai.OpenAI(api_key=ai_key).models.list()
+                return True, ["✅ OpenAI API key validated"]
+            except Exception as e:
+                return False, [f"❌ OpenAI API key invalid: {str(e)}"]
+        else:
+            # Gemini - own client too: genai.configure() sets one key for the
+            # whole process, so concurrent registrations would swap keys
+            import google.ai.generativelanguage as glm
+            import google.generativeai as genai
+            try:
+                client = glm.ModelServiceClient(client_options={'api_key': ai_key})
+                # list_models is lazy; fetch the first page so the key is actually sent
+                next(iter(genai.list_models(
+                    page_size=1, client=client,
+                    request_options={'retry': None, 'timeout': VALIDATION_TIMEOUT_SECONDS}
+                )), None)
+                return True, ["✅ Gemini API key validated"]
+            except Exception as e:
+                return False, [f"❌ Gemini API key invalid: {str(e)}"]
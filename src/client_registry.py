@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Per-User Client Registry for Ping CRM
+Keeps each logged-in user's decrypted credentials and ready API clients server-side
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from .fingerprints import FingerprintStore
+from .warehouse import Warehouse
+
+
+class UserClients:
+    """One user's credentials with lazily built, reusable API clients"""
+
+    def __init__(self, user_data: Dict):
+        """
+        Args:
+            user_data: Decrypted login data from AuthManager.login_user
+        """
+        self.user_id = user_data['id']
+        self.email = user_data['email']
+        self.apollo_key = user_data['apollo_key']
+        self.notion_token = user_data['notion_token']
+        self.notion_db_id = user_data['notion_db_id']
+        self.ai_provider = user_data.get('ai_provider') or 'openai'
+
+        ai_key = user_data.get('ai_key')
+        self.openai_key = ai_key if ai_key and self.ai_provider == 'openai' else None
+        self.gemini_key = ai_key if ai_key and self.ai_provider != 'openai' else None
+
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory):
+        """Build a client on first use, then reuse it"""
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = self._clients[name] = factory()
+        return client
+
+    # Client modules are imported on first use so the login screen doesn't
+    # load requests, tenacity or the Notion/LLM SDKs
+
+    @property
+    def apollo(self):
+        from .apollo_client import ApolloClient
+        return self._get('apollo', lambda: ApolloClient(self.apollo_key))
+
+    @property
+    def notion(self):
+        from .notion_client import NotionClient
+        return self._get('notion', lambda: NotionClient(
+            self.notion_token,
+            self.notion_db_id,
+            openai_key=self.openai_key,
+            gemini_key=self.gemini_key
+        ))
+
+    @property
+    def ai_targeting(self):
+        from .llm_helper import AITargeting
+        return self._get('ai_targeting', lambda: AITargeting(
+            openai_key=self.openai_key,
+            gemini_key=self.gemini_key
+        ))
+
+    @property
+    def fingerprints(self) -> FingerprintStore:
+        return self._get('fingerprints', lambda: FingerprintStore(scope=self.notion_db_id))
+
+    @property
+    def warehouse(self) -> Warehouse:
+        return self._get('warehouse', lambda: Warehouse(scope=self.notion_db_id))
+
+    @property
+    def sync_worker(self):
+        from .warehouse_sync import SyncWorker
+        return self._get('sync_worker', lambda: SyncWorker(self.warehouse, self.notion).start())
+
+    @property
+    def crm(self):
+        """Notion stand-in for the pipelines: writes land in the warehouse, the worker syncs them"""
+        from .warehouse_sync import WarehouseNotion
+        return self._get('crm', lambda: WarehouseNotion(self.warehouse, self.notion, self.sync_worker))
+
+    def close(self) -> None:
+        """Stop background work (queued changes stay in the warehouse outbox)"""
+        worker = self._clients.get('sync_worker')
+        if worker is not None:
+            worker.stop(timeout=0)
+
+
+class ClientRegistry:
+    """
+    UserClients keyed by user id with idle-time eviction
+
+    Entries expire after `ttl_seconds` without access, matching the app's
+    session timeout, so credentials never outlive the sessions using them.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, list] = {}  # user_id -> [UserClients, last_access]
+        self._lock = threading.Lock()
+
+    def register(self, user_data: Dict) -> UserClients:
+        """Store a freshly logged-in user's credentials, keeping warm clients if unchanged"""
+        with self._lock:
+            self._sweep()
+            entry = self._entries.get(user_data['id'])
+            if entry and self._same_credentials(entry[0], user_data):
+                entry[1] = time.monotonic()
+                return entry[0]
+
+            if entry:
+                entry[0].close()
+            clients = UserClients(user_data)
+            self._entries[clients.user_id] = [clients, time.monotonic()]
+            return clients
+
+    def get(self, user_id: int) -> Optional[UserClients]:
+        """Get a user's clients and refresh their idle timer (None if expired)"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+
+            now = time.monotonic()
+            if now - entry[1] > self.ttl_seconds:
+                del self._entries[user_id]
+                entry[0].close()
+                return None
+
+            entry[1] = now
+            return entry[0]
+
+    def evict(self, user_id: int) -> None:
+        """Drop a user's credentials and clients (logout)"""
+        with self._lock:
+            entry = self._entries.pop(user_id, None)
+        if entry:
+            entry[0].close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sweep()
+            return len(self._entries)
+
+    def _sweep(self) -> None:
+        """Remove expired entries (caller holds the lock)"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        for user_id in [uid for uid, (_, seen) in self._entries.items() if seen < cutoff]:
+            self._entries.pop(user_id)[0].close()
+
+    @staticmethod
+    def _same_credentials(clients: UserClients, user_data: Dict) -> bool:
+        """True if a re-login carries the same keys as the cached entry"""
+        fresh = UserClients(user_data)
+        return all(
+            getattr(clients, attr) == getattr(fresh, attr)
+            for attr in ('apollo_key', 'notion_token', 'notion_db_id', 'openai_key', 'gemini_key')
+        )
+
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ClientRegistry:
+    """Process-wide registry; entries idle out after SESSION_TIMEOUT_MINUTES"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                timeout_minutes = int(os.getenv('SESSION_TIMEOUT_MINUTES', 20))
+                _registry = ClientRegistry(ttl_seconds=timeout_minutes * 60)
+    return _registry
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Company Alias Index for Ping CRM
+Resolves company names, domains and LinkedIn URLs to Apollo organizations
+locally, learning a new alias from every successful Apollo search
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from .records import Company, json_default
+from .sqlite_pool import get_pool
+from .telemetry import record_cache
+
+
+# Legal-entity words dropped from the end of a name ("CVS Health Corp" == "CVS Health")
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'llc', 'ltd',
+    'limited', 'plc', 'lp', 'llp', 'sa', 'ag', 'gmbh', 'holdings'
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_DIGITS = re.compile(r'\d+')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Canonical form of a company name
+
+    Lowercase, '&' as 'and', punctuation and a leading 'the' removed, and
+    trailing legal suffixes dropped.
+    """
+    text = _PUNCTUATION.sub(' ', (name or '').lower().replace('&', ' and '))
+    tokens = text.split()
+    if tokens and tokens[0] == 'the' and len(tokens) > 1:
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def normalize_domain(url: str) -> str:
+    """Bare host of a website URL (scheme, 'www.' and path removed)"""
+    host = (url or '').strip().lower()
+    host = re.sub(r'^[a-z]+://', '', host).split('/')[0].split('?')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def alias_key(value: str) -> Optional[str]:
+    """
+    Index key for a name, domain or LinkedIn company URL
+
+    Returns:
+        'linkedin:<slug>', 'domain:<host>' or 'name:<normalized>' (None if empty)
+    """
+    value = (value or '').strip()
+    lowered = value.lower()
+
+    if 'linkedin.com/company/' in lowered:
+        slug = lowered.split('linkedin.com/company/', 1)[1].split('/')[0].split('?')[0]
+        return f"linkedin:{slug}" if slug else None
+
+    if ' ' not in value and '.' in value:
+        domain = normalize_domain(value)
+        if '.' in domain:
+            return f"domain:{domain}"
+
+    name = normalize_name(value)
+    return f"name:{name}" if name else None
+
+
+def trigrams(name: str) -> Set[str]:
+    """
+    Character trigrams of a normalized name
+
+    Spaces are ignored so "UnitedHealth" and "United Health" compare equal.
+    """
+    padded = f"  {name.replace(' ', '')} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyIndex:
+    """
+    Local alias -> Apollo organization index
+
+    Every resolved company is stored once (its normalized Apollo record) with
+    aliases for the searched name, its own name, domain and LinkedIn URL.
+    Lookups try the exact alias in memory, then in SQLite (aliases learned
+    by other processes), then the closest name by trigram similarity.
+    """
+
+    def __init__(self, db_path: str = None, threshold: float = None, max_age_days: int = None):
+        """
+        Initialize the index
+
+        Args:
+            db_path: SQLite file (default data/company_index.db)
+            threshold: Minimum trigram similarity for a fuzzy name match
+                (COMPANY_ALIAS_THRESHOLD, default 0.8)
+            max_age_days: Records older than this are re-fetched from Apollo
+                (COMPANY_INDEX_MAX_AGE_DAYS, default 30)
+        """
+        if db_path is None:
+            # Default to data directory
+            db_dir = Path(__file__).parent.parent / 'data'
+            db_dir.mkdir(exist_ok=True)
+            db_path = db_dir / 'company_index.db'
+
+        self.db_path = str(db_path)
+        self.threshold = threshold if threshold is not None else float(os.getenv('COMPANY_ALIAS_THRESHOLD', 0.8))
+        self.max_age_days = max_age_days or int(os.getenv('COMPANY_INDEX_MAX_AGE_DAYS', 30))
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('company_index', self.init_database)
+
+        self._records: Dict[str, str] = {}         # apollo_id -> record JSON
+        self._aliases: Dict[str, str] = {}         # alias key -> apollo_id
+        self._grams: Dict[str, Set[str]] = {}      # trigram -> name aliases
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def init_database(self):
+        """Create tables if they don't exist"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS companies (
+                    apollo_id TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS aliases (
+                    alias TEXT PRIMARY KEY,
+                    apollo_id TEXT NOT NULL
+                )
+            ''')
+
+    def _cutoff(self) -> str:
+        moment = datetime.now(timezone.utc) - timedelta(days=self.max_age_days)
+        return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+    def _load(self) -> None:
+        """Read fresh records and their aliases into memory (once)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with self.pool.connection() as conn:
+                records = conn.execute(
+                    'SELECT apollo_id, record FROM companies WHERE updated_at >= ?', (self._cutoff(),)
+                ).fetchall()
+                aliases = conn.execute('SELECT alias, apollo_id FROM aliases').fetchall()
+
+            self._records.update(records)
+            for alias, apollo_id in aliases:
+                if apollo_id in self._records:
+                    self._add_alias(alias, apollo_id)
+            self._loaded = True
+
+    def _add_alias(self, alias: str, apollo_id: str) -> None:
+        """Index an alias in memory (caller holds the lock)"""
+        self._aliases[alias] = apollo_id
+        if alias.startswith('name:'):
+            for gram in trigrams(alias[5:]):
+                self._grams.setdefault(gram, set()).add(alias)
+
+    # ============================================================
+    # LOOKUP
+    # ============================================================
+
+    def lookup(self, query: str) -> Optional[Dict]:
+        """
+        Resolve a company name, domain or LinkedIn URL without calling Apollo
+
+        Args:
+            query: What the user typed or the CSV contained
+
+        Returns:
+            Company record (a fresh copy) or None if not indexed
+        """
+        key = alias_key(query)
+        if not key:
+            return None
+
+        self._load()
+        record = self._exact(key)
+        if record is None and key.startswith('name:'):
+            record = self._fuzzy(key[5:])
+
+        record_cache('company_aliases', record is not None)
+        return Company.from_dict(json.loads(record)) if record is not None else None
+
+    def _exact(self, key: str) -> Optional[str]:
+        """Record JSON for an alias, checking SQLite if this process hasn't seen it"""
+        apollo_id = self._aliases.get(key)
+        if apollo_id is not None:
+            return self._records.get(apollo_id)
+
+        with self.pool.connection() as conn:
+            result = conn.execute('''
+                SELECT c.apollo_id, c.record FROM aliases a
+                JOIN companies c ON c.apollo_id = a.apollo_id
+                WHERE a.alias = ? AND c.updated_at >= ?
+            ''', (key, self._cutoff())).fetchone()
+
+        if result is None:
+            return None
+        with self._lock:
+            self._records[result[0]] = result[1]
+            self._add_alias(key, result[0])
+        return result[1]
+
+    def _fuzzy(self, name: str) -> Optional[str]:
+        """Closest indexed name by trigram Jaccard similarity, if above threshold"""
+        grams = trigrams(name)
+        digits = _DIGITS.findall(name)
+
+        shared: Dict[str, int] = {}
+        with self._lock:
+            for gram in grams:
+                for alias in self._grams.get(gram, ()):
+                    shared[alias] = shared.get(alias, 0) + 1
+
+        best, best_score = None, self.threshold
+        for alias, count in shared.items():
+            candidate = alias[5:]
+            score = count / (len(grams) + len(trigrams(candidate)) - count)
+            # "Clinic 12" and "Clinic 21" look alike but are different companies
+            if score >= best_score and _DIGITS.findall(candidate) == digits:
+                best, best_score = alias, score
+
+        if best is None:
+            return None
+        return self._records.get(self._aliases.get(best))
+
+    # ============================================================
+    # LEARNING
+    # ============================================================
+
+    def learn(self, company: Optional[Dict], query: str = None) -> None:
+        """
+        Remember a company Apollo resolved, under every alias it's known by
+
+        Args:
+            company: Normalized company dict (from ApolloClient); ignored without apollo_id
+            query: Name, domain or URL that was searched for, if any
+        """
+        if not company or not company.get('apollo_id'):
+            return
+
+        apollo_id = company['apollo_id']
+        record = json.dumps(company, sort_keys=True, default=json_default)
+        keys = {
+            alias_key(value)
+            for value in (query, company.get('name'), company.get('domain'), company.get('linkedin_url'))
+            if value
+        }
+        keys.discard(None)
+
+        self._load()
+        with self._lock:
+            new_keys = [key for key in keys if self._aliases.get(key) != apollo_id]
+            if self._records.get(apollo_id) == record and not new_keys:
+                return
+            self._records[apollo_id] = record
+            for key in new_keys:
+                self._add_alias(key, apollo_id)
+
+        with self.pool.connection() as conn:
+            conn.execute('''
+                INSERT INTO companies (apollo_id, record) VALUES (?, ?)
+                ON CONFLICT (apollo_id) DO UPDATE SET
+                    record = excluded.record,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (apollo_id, record))
+            conn.executemany('''
+                INSERT INTO aliases (alias, apollo_id) VALUES (?, ?)
+                ON CONFLICT (alias) DO UPDATE SET apollo_id = excluded.apollo_id
+            ''', [(key, apollo_id) for key in new_keys])
+
+    def forget(self, apollo_id: str) -> None:
+        """Drop a company and its aliases so the next search goes to Apollo"""
+        with self._lock:
+            self._records.pop(apollo_id, None)
+            for alias in [a for a, aid in self._aliases.items() if aid == apollo_id]:
+                del self._aliases[alias]
+                for gram in trigrams(alias[5:]) if alias.startswith('name:') else ():
+                    self._grams.get(gram, set()).discard(alias)
+
+        with self.pool.connection() as conn:
+            conn.execute('DELETE FROM aliases WHERE apollo_id = ?', (apollo_id,))
+            conn.execute('DELETE FROM companies WHERE apollo_id = ?', (apollo_id,))
+
+    def stats(self) -> Dict:
+        """Companies and aliases held in memory"""
+        self._load()
+        with self._lock:
+            return {'companies': len(self._records), 'aliases': len(self._aliases)}
+
+
+_company_index: Optional[CompanyIndex] = None
+_company_index_lock = threading.Lock()
+
+
+def get_company_index() -> CompanyIndex:
+    """Process-wide alias index (Apollo organizations aren't user-specific)"""
+    global _company_index
+    if _company_index is None:
+        with _company_index_lock:
+            if _company_index is None:
+                _company_index = CompanyIndex()
+    return _company_index
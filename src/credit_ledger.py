@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Apollo Credit Ledger for Ping CRM
+Tracks Apollo credits spent per day so scheduled jobs stay within budget
+"""
+
+from pathlib import Path
+from datetime import date
+from typing import Dict
+
+from .sqlite_pool import get_pool
+
+
+class CreditLedger:
+    """Per-day Apollo credit accounting"""
+
+    def __init__(self, db_path: str = None):
+        """Initialize ledger storage"""
+        if db_path is None:
+            # Default to data directory
+            db_dir = Path(__file__).parent.parent / 'data'
+            db_dir.mkdir(exist_ok=True)
+            db_path = db_dir / 'credits.db'
+
+        self.db_path = str(db_path)
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('credit_ledger', self.init_database)
+
+    def init_database(self):
+        """Create tables if they don't exist"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS credit_ledger (
+                    day TEXT NOT NULL,
+                    job TEXT NOT NULL,
+                    credits INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, job)
+                )
+            ''')
+
+    def record(self, job: str, credits: int, day: date = None) -> None:
+        """Add credits spent by a job"""
+        if credits <= 0:
+            return
+
+        day = (day or date.today()).isoformat()
+
+        with self.pool.connection() as conn:
+            conn.execute('''
+                INSERT INTO credit_ledger (day, job, credits)
+                VALUES (?, ?, ?)
+                ON CONFLICT (day, job) DO UPDATE SET credits = credits + excluded.credits
+            ''', (day, job, credits))
+
+    def spent(self, job: str = None, day: date = None) -> int:
+        """Credits spent on a day (all jobs unless one is given)"""
+        day = (day or date.today()).isoformat()
+
+        if job:
+            query = 'SELECT COALESCE(SUM(credits), 0) FROM credit_ledger WHERE day = ? AND job = ?'
+            params = (day, job)
+        else:
+            query = 'SELECT COALESCE(SUM(credits), 0) FROM credit_ledger WHERE day = ?'
+            params = (day,)
+
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def remaining(self, budget: int, job: str = None, day: date = None) -> int:
+        """Credits left in today's budget"""
+        return max(budget - self.spent(job, day), 0)
+
+    def history(self, days: int = 30) -> Dict[str, Dict[str, int]]:
+        """Credits per day per job for the last N days with activity"""
+        with self.pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT day, job, credits FROM credit_ledger
+                WHERE day IN (
+                    SELECT DISTINCT day FROM credit_ledger ORDER BY day DESC LIMIT ?
+                )
+                ORDER BY day
+            ''', (days,)).fetchall()
+
+        history = {}
+        for day, job, credits in rows:
+            history.setdefault(day, {})[job] = credits
+        return history
@@ -9,6 +9,8 @@ from pathlib import Path
 from datetime import datetime
 import os
 
+from .sqlite_pool import get_pool
+
 
 class DatabaseManager:
     """Manages SQLite database for user authentication and API keys"""
@@ -22,41 +24,38 @@ class DatabaseManager:
             db_path = db_dir / 'users.db'
 
         self.db_path = str(db_path)
-        self.init_database()
+        # Pooled WAL connections shared by every DatabaseManager on this file
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('users', self.init_database)
 
     def init_database(self):
         """Create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                encrypted_apollo_key TEXT NOT NULL,
-                encrypted_notion_token TEXT NOT NULL,
-                encrypted_notion_db_id TEXT NOT NULL,
-                encrypted_ai_key TEXT,
-                ai_provider TEXT DEFAULT 'openai',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
-            )
-        ''')
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            # Users table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    email TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    encrypted_apollo_key TEXT NOT NULL,
+                    encrypted_notion_token TEXT NOT NULL,
+                    encrypted_notion_db_id TEXT NOT NULL,
+                    encrypted_ai_key TEXT,
+                    ai_provider TEXT DEFAULT 'openai',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_login TIMESTAMP
+                )
+            ''')
 
     def user_exists(self, email: str) -> bool:
         """Check if user exists"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT id FROM users WHERE email = ?', (email.lower(),))
-        result = cursor.fetchone()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id FROM users WHERE email = ?', (email.lower(),))
+            result = cursor.fetchone()
 
-        conn.close()
         return result is not None
 
     def create_user(self, email: str, password_hash: str,
@@ -65,26 +64,24 @@ class DatabaseManager:
                    ai_provider: str = 'openai') -> bool:
         """Create new user"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                INSERT INTO users (
-                    email, password_hash,
-                    encrypted_apollo_key, encrypted_notion_token,
-                    encrypted_notion_db_id, encrypted_ai_key,
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    INSERT INTO users (
+                        email, password_hash,
+                        encrypted_apollo_key, encrypted_notion_token,
+                        encrypted_notion_db_id, encrypted_ai_key,
+                        ai_provider
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    email.lower(), password_hash,
+                    encrypted_apollo, encrypted_notion_token,
+                    encrypted_notion_db, encrypted_ai,
                     ai_provider
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                email.lower(), password_hash,
-                encrypted_apollo, encrypted_notion_token,
-                encrypted_notion_db, encrypted_ai,
-                ai_provider
-            ))
-
-            conn.commit()
-            conn.close()
+                ))
+
             return True
 
         except sqlite3.IntegrityError:
@@ -96,20 +93,19 @@ class DatabaseManager:
 
     def get_user_by_email(self, email: str) -> dict:
         """Get user data by email"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT id, email, password_hash,
-                   encrypted_apollo_key, encrypted_notion_token,
-                   encrypted_notion_db_id, encrypted_ai_key,
-                   ai_provider, created_at, last_login
-            FROM users
-            WHERE email = ?
-        ''', (email.lower(),))
+            cursor.execute('''
+                SELECT id, email, password_hash,
+                       encrypted_apollo_key, encrypted_notion_token,
+                       encrypted_notion_db_id, encrypted_ai_key,
+                       ai_provider, created_at, last_login
+                FROM users
+                WHERE email = ?
+            ''', (email.lower(),))
 
-        result = cursor.fetchone()
-        conn.close()
+            result = cursor.fetchone()
 
         if result:
             return {
@@ -128,17 +124,20 @@ class DatabaseManager:
 
     def update_last_login(self, email: str):
         """Update user's last login timestamp"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            UPDATE users
-            SET last_login = CURRENT_TIMESTAMP
-            WHERE email = ?
-        ''', (email.lower(),))
-
-        conn.commit()
-        conn.close()
+        with self.pool.connection() as conn:
+            conn.execute('''
+                UPDATE users
+                SET last_login = CURRENT_TIMESTAMP
+                WHERE email = ?
+            ''', (email.lower(),))
+
+    def update_password_hash(self, email: str, password_hash: str):
+        """Replace user's password hash"""
+        with self.pool.connection() as conn:
+            conn.execute(
+                'UPDATE users SET password_hash = ? WHERE email = ?',
+                (password_hash, email.lower())
+            )
 
     def update_user_keys(self, email: str,
                         encrypted_apollo: str = None,
@@ -147,9 +146,6 @@ class DatabaseManager:
                         encrypted_ai: str = None) -> bool:
         """Update user's encrypted API keys"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             updates = []
             params = []
 
@@ -172,9 +168,8 @@ class DatabaseManager:
             params.append(email.lower())
             query = f"UPDATE users SET {', '.join(updates)} WHERE email = ?"
 
-            cursor.execute(query, params)
-            conn.commit()
-            conn.close()
+            with self.pool.connection() as conn:
+                conn.execute(query, params)
             return True
 
         except Exception as e:
@@ -184,13 +179,8 @@ class DatabaseManager:
     def delete_user(self, email: str) -> bool:
         """Delete user account"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM users WHERE email = ?', (email.lower(),))
-
-            conn.commit()
-            conn.close()
+            with self.pool.connection() as conn:
+                conn.execute('DELETE FROM users WHERE email = ?', (email.lower(),))
             return True
 
         except Exception as e:
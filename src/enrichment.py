@@ -0,0 +1,518 @@
+"""
+Enrichment Pipelines
+Row-level enrichment shared by the Streamlit app, CLI scripts and retry queue
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from .retry_queue import classify_error
+from .fingerprints import record_fingerprint
+
+if TYPE_CHECKING:
+    # Annotations only; the callers already hold the instances
+    from .apollo_client import ApolloClient
+    from .processors import TierAssigner, PriorityScorer
+
+
+# Identifier columns accepted for a contact row (see enrich_contact_flexible)
+CONTACT_KEYS = ['linkedin_url', 'email', 'person_name', 'company_name']
+
+
+def contact_work_item(row) -> Dict:
+    """
+    Build a JSON-serializable work item from a CSV row
+
+    Args:
+        row: pandas Series or dict with any of CONTACT_KEYS
+
+    Returns:
+        Dict containing only the identifier columns present in the row
+    """
+    item = {}
+    for key in CONTACT_KEYS:
+        if key in row:
+            value = row.get(key)
+            # pandas uses NaN for empty cells
+            if value is None or value != value:
+                value = ''
+            item[key] = str(value)
+    return item
+
+
+def targeting_work_item(
+    company_name: str,
+    strategy: Dict,
+    field_selections: Optional[Dict] = None,
+    outreach_context: str = '',
+    max_results: int = 10
+) -> Dict:
+    """
+    Build a JSON-serializable work item for one AI targeting row
+
+    Returns:
+        Dict of target_company's keyword arguments (minus the clients)
+    """
+    return {
+        'company_name': str(company_name),
+        'strategy': strategy,
+        'field_selections': field_selections or {},
+        'outreach_context': outreach_context,
+        'max_results': max_results
+    }
+
+
+def unchanged_in_notion(fingerprints, notion, apollo_id: Optional[str], fingerprint: str) -> bool:
+    """
+    True if this exact record was already written and its Notion page is still there
+
+    A page the user deleted since drops the fingerprint, so the caller writes
+    the contact again. Without a known page id (or a client that can check
+    one) the caller falls back to its usual existence lookup.
+    """
+    if not fingerprints or not fingerprints.is_unchanged('contact', apollo_id, fingerprint):
+        return False
+
+    page_id = (fingerprints.get('contact', apollo_id) or {}).get('page_id')
+    if not page_id or not hasattr(notion, 'contact_page_exists'):
+        return False
+    if not notion.contact_page_exists(page_id):
+        fingerprints.forget('contact', apollo_id)
+        return False
+    return True
+
+
+def lookup_contact(row, apollo: 'ApolloClient') -> Tuple[Optional[Dict], Optional[Dict], str]:
+    """
+    Find a contact in Apollo with flexible search priority:
+    1. LinkedIn URL (unique key)
+    2. Email (unique key)
+    3. Name + Company (composite key)
+
+    Returns:
+        Tuple of (person_data, company_data, search_method)
+    """
+    # Extract available fields
+    linkedin_url = row.get('linkedin_url', '').strip() if 'linkedin_url' in row else ''
+    email = row.get('email', '').strip() if 'email' in row else ''
+    person_name = row.get('person_name', '').strip() if 'person_name' in row else ''
+    company_name = row.get('company_name', '').strip() if 'company_name' in row else ''
+
+    person_data = None
+    company_data = None
+    search_method = ''
+
+    # Priority 1: LinkedIn URL (highest priority)
+    if linkedin_url and 'linkedin.com' in linkedin_url.lower():
+        search_method = 'LinkedIn'
+        person_data, company_data = apollo.search_by_linkedin_url(linkedin_url)
+
+    # Priority 2: Email
+    if not person_data and email and '@' in email:
+        search_method = 'Email'
+        person_data, company_data = apollo.search_by_email(email)
+
+    # Priority 3: Name + Company
+    if not person_data and person_name and company_name:
+        search_method = 'Name+Company'
+        company_data = apollo.search_company(company_name)
+        if company_data:
+            person_data = apollo.search_person_by_name(person_name, company_name)
+
+    return person_data, company_data, search_method
+
+
+def enrich_contact_flexible(row, apollo: 'ApolloClient', notion, fingerprints=None) -> Dict:
+    """
+    Enrich contact with flexible search priority (see lookup_contact)
+    and add it to Notion unless it already exists
+
+    If a FingerprintStore is given, contacts whose Apollo record is identical
+    to the last one written skip the Notion lookup, notes and write (one page
+    read confirms the page still exists).
+    """
+    try:
+        # Extract available fields
+        linkedin_url = row.get('linkedin_url', '').strip() if 'linkedin_url' in row else ''
+        email = row.get('email', '').strip() if 'email' in row else ''
+        person_name = row.get('person_name', '').strip() if 'person_name' in row else ''
+        company_name = row.get('company_name', '').strip() if 'company_name' in row else ''
+
+        person_data, company_data, search_method = lookup_contact(row, apollo)
+
+        # If still no data found
+        if not person_data:
+            identifier = linkedin_url or email or person_name or 'Unknown'
+            return {
+                'status': 'failed',
+                'person': identifier,
+                'company': company_name or 'Unknown',
+                'message': f'Not found in Apollo (tried: {search_method or "none"})',
+                'error_class': 'not_found',
+                'data': {}
+            }
+
+        # Extract final names
+        final_person_name = person_data.get('name', person_name or email or linkedin_url)
+        final_company_name = company_data.get('name', company_name) if company_data else company_name
+
+        # Skip everything downstream if Apollo returned exactly what we wrote
+        # last time (and that page hasn't been deleted since)
+        fingerprint = record_fingerprint(person_data, company_data)
+        if unchanged_in_notion(fingerprints, notion, person_data.get('apollo_id'), fingerprint):
+            return {
+                'status': 'skipped',
+                'person': final_person_name,
+                'company': final_company_name,
+                'message': f'Unchanged since last enrichment (found via {search_method})',
+                'data': person_data
+            }
+
+        # Check if exists in Notion
+        existing = notion.find_contact(
+            final_person_name,
+            final_company_name,
+            email=person_data.get('email'),
+            linkedin_url=person_data.get('linkedin_url')
+        )
+        if existing:
+            return {
+                'status': 'skipped',
+                'person': final_person_name,
+                'company': final_company_name,
+                'message': f'Already exists (found via {search_method})',
+                'data': person_data
+            }
+
+        # Create in Notion (the lookup above already found nothing)
+        result = notion.upsert_contact(
+            contact_name=final_person_name,
+            company_name=final_company_name,
+            enriched_data=person_data,
+            company_data=company_data,
+            checked=True
+        )
+
+        if result.success:
+            if fingerprints:
+                fingerprints.record('contact', person_data.get('apollo_id'), fingerprint, page_id=result.page_id)
+            return {
+                'status': 'success',
+                'person': final_person_name,
+                'company': final_company_name,
+                'message': f'{result.action.capitalize()} via {search_method}',
+                'data': person_data
+            }
+        else:
+            notion_error = getattr(notion, 'last_error', None)
+            error_class = classify_error(notion_error)[0] if notion_error else 'unknown'
+            return {
+                'status': 'failed',
+                'person': final_person_name,
+                'company': final_company_name,
+                'message': 'Failed to write to Notion',
+                'error_class': error_class,
+                'data': {}
+            }
+
+    except Exception as e:
+        identifier = row.get('person_name') or row.get('email') or row.get('linkedin_url') or 'Unknown'
+        return {
+            'status': 'failed',
+            'person': str(identifier),
+            'company': row.get('company_name', 'Unknown'),
+            'message': str(e),
+            'error_class': classify_error(e)[0],
+            'data': {}
+        }
+
+
+def enrich_company(
+    company_name: str,
+    apollo: 'ApolloClient',
+    notion,
+    tier_assigner: 'TierAssigner',
+    priority_scorer: 'PriorityScorer',
+    skip_duplicates: bool = True
+) -> dict:
+    """
+    Enrich a single company
+
+    Args:
+        company_name: Name of company to enrich
+        apollo: Apollo API client
+        notion: Notion API client
+        tier_assigner: Tier assignment logic
+        priority_scorer: Priority scoring logic
+        skip_duplicates: Skip if already exists in Notion
+
+    Returns:
+        Result dict with status and details
+    """
+    result = {
+        'company': company_name,
+        'status': 'pending',
+        'message': '',
+        'priority': 0
+    }
+
+    try:
+        # Check if exists
+        if skip_duplicates and notion.page_exists(company_name):
+            result['status'] = 'skipped'
+            result['message'] = 'Already exists in Notion'
+            return result
+
+        # Search company in Apollo
+        company_data = apollo.search_company(company_name)
+
+        if not company_data:
+            result['status'] = 'failed'
+            result['message'] = 'Company not found in Apollo'
+            result['error_class'] = 'not_found'
+            return result
+
+        # Get decision makers
+        titles = apollo.get_target_titles(company_data.get('industry', ''))
+        contacts = apollo.search_people(
+            company_id=company_data['apollo_id'],
+            titles=titles,
+            max_results=10
+        )
+
+        # Assign tier and priority
+        tier = tier_assigner.assign_tier(company_data)
+        priority = priority_scorer.calculate_priority(company_data, contacts, tier)
+
+        # Sync contacts to Notion (creates one page per contact)
+        page_ids = notion.create_contact_pages(
+            company_data=company_data,
+            contacts=contacts,
+            tier=tier,
+            priority=priority
+        )
+
+        result['status'] = 'success'
+        result['message'] = f'Added {len(page_ids)} contacts (Priority: {priority})'
+        result['priority'] = priority
+        result['contacts_found'] = len([c for c in contacts if c.get('email')])
+        result['pages_created'] = len(page_ids)
+
+    except Exception as e:
+        result['status'] = 'failed'
+        result['message'] = str(e)
+        result['error_class'] = classify_error(e)[0]
+
+    return result
+
+
+def refresh_contact(page: Dict, apollo: 'ApolloClient', notion, fingerprints=None) -> Dict:
+    """
+    Re-enrich an existing Notion contact page in place
+
+    Args:
+        page: Notion page object (from NotionClient.find_stale_contacts)
+        apollo: Apollo API client
+        notion: Unified NotionClient
+        fingerprints: Optional FingerprintStore; unchanged Apollo records only
+            get their Last Enriched date refreshed
+
+    Returns:
+        Result dict with status and details
+    """
+    row = notion.page_to_row(page)
+    person = row['person_name'] or row['email'] or row['linkedin_url'] or 'Unknown'
+
+    try:
+        person_data, company_data, search_method = lookup_contact(row, apollo)
+
+        if not person_data:
+            # Stamp Last Enriched anyway so it isn't re-selected every run
+            notion.update_contact(page['id'], {})
+            return {
+                'status': 'skipped',
+                'person': person,
+                'company': row['company_name'],
+                'message': f'Not found in Apollo (tried: {search_method or "none"})'
+            }
+
+        fingerprint = record_fingerprint(person_data, company_data)
+        if fingerprints and fingerprints.is_unchanged('contact', person_data.get('apollo_id'), fingerprint):
+            notion.update_contact(page['id'], {})
+            return {
+                'status': 'skipped',
+                'person': person_data.get('name', person),
+                'company': row['company_name'],
+                'message': f'Unchanged in Apollo (checked via {search_method})'
+            }
+
+        if notion.update_contact(page['id'], person_data, company_data):
+            if fingerprints:
+                fingerprints.record('contact', person_data.get('apollo_id'), fingerprint, page_id=page['id'])
+            return {
+                'status': 'success',
+                'person': person_data.get('name', person),
+                'company': company_data.get('name', row['company_name']) if company_data else row['company_name'],
+                'message': f'Refreshed via {search_method}'
+            }
+
+        notion_error = getattr(notion, 'last_error', None)
+        return {
+            'status': 'failed',
+            'person': person,
+            'company': row['company_name'],
+            'message': 'Failed to write to Notion',
+            'error_class': classify_error(notion_error)[0] if notion_error else 'unknown'
+        }
+
+    except Exception as e:
+        return {
+            'status': 'failed',
+            'person': person,
+            'company': row['company_name'],
+            'message': str(e),
+            'error_class': classify_error(e)[0]
+        }
+
+
+# Contact fields a user can choose to populate (AI targeting "Select Fields")
+TARGETING_FIELDS = ['email', 'phone', 'linkedin_url', 'title', 'city', 'state', 'country', 'seniority']
+
+
+def filter_person_fields(person: Dict, field_selections: Dict) -> Dict:
+    """Keep only the contact fields the user selected (name is always included)"""
+    filtered_person = {'name': person['name']}
+    for field in TARGETING_FIELDS:
+        if field_selections.get(field, True):
+            filtered_person[field] = person.get(field)
+    return filtered_person
+
+
+def target_company(
+    company_name: str,
+    strategy: Dict,
+    apollo: 'ApolloClient',
+    notion,
+    fingerprints=None,
+    field_selections: Optional[Dict] = None,
+    outreach_context: str = '',
+    max_results: int = 10
+) -> Dict:
+    """
+    Find people matching an AI targeting strategy at one company and add them to Notion
+
+    Args:
+        company_name: Company to search
+        strategy: AITargeting.analyze_targeting_request result (titles, seniorities, locations)
+        apollo: Apollo API client
+        notion: Unified NotionClient
+        fingerprints: Optional FingerprintStore; people whose Apollo record, field
+            choices and goal are identical to the last write are skipped
+        field_selections: Which contact fields to populate (default: all)
+        outreach_context: User's goal, passed to Notion for personalized notes
+        max_results: People to fetch per company
+
+    Returns:
+        Result dict with status ('success', 'not_found' or 'error'), found/added/skipped counts and people
+        (plus 'message' and 'error_class' when it didn't succeed)
+    """
+    field_selections = field_selections or {}
+
+    try:
+        # Search company
+        company_data = apollo.search_company(company_name)
+
+        if not company_data:
+            return {
+                'company': company_name,
+                'status': 'not_found',
+                'found': 0,
+                'added': 0,
+                'message': 'Company not found in Apollo',
+                'error_class': 'not_found',
+                'people': []
+            }
+
+        # Search people with AI strategy
+        people = apollo.search_people_by_company(
+            company_id=company_data['apollo_id'],
+            titles=strategy['titles'],
+            seniorities=strategy['seniorities'],
+            locations=strategy.get('locations'),
+            max_results=max_results
+        )
+
+        # Add to Notion (one existence query for the whole company)
+        added_count = 0
+        skipped_count = 0
+        existing_contacts = notion.prefetch_company(company_data['name'])
+
+        for person in people:
+            # Skip people whose Apollo record, field choices and goal
+            # are identical to what we last wrote (no Notion/LLM calls).
+            # With the company prefetched, the existence check below is
+            # already local and also notices pages deleted since.
+            fingerprint = record_fingerprint(
+                person,
+                company_data,
+                {'fields': field_selections, 'context': outreach_context}
+            )
+            if existing_contacts is None and unchanged_in_notion(
+                fingerprints, notion, person.get('apollo_id'), fingerprint
+            ):
+                skipped_count += 1
+                continue
+
+            # Check if exists
+            if existing_contacts is not None:
+                exists = existing_contacts.contains(person['name'], person.get('email'), person.get('linkedin_url'))
+            else:
+                exists = notion.find_contact(
+                    person['name'],
+                    company_data['name'],
+                    email=person.get('email'),
+                    linkedin_url=person.get('linkedin_url')
+                ) is not None
+            if exists:
+                skipped_count += 1
+                continue
+
+            # Filter company data if not selected
+            filtered_company = company_data if field_selections.get('company_info', True) else None
+
+            # Add to Notion with personalized outreach context and filtered data
+            result = notion.upsert_contact(
+                contact_name=person['name'],
+                company_name=company_data['name'],
+                enriched_data=filter_person_fields(person, field_selections),
+                company_data=filtered_company,
+                outreach_context=outreach_context,
+                checked=True
+            )
+
+            if result.success:
+                added_count += 1
+                if existing_contacts is not None:
+                    existing_contacts.add(person['name'], person.get('email'), person.get('linkedin_url'))
+                if fingerprints:
+                    fingerprints.record('contact', person.get('apollo_id'), fingerprint, page_id=result.page_id)
+
+        return {
+            'company': company_name,
+            'status': 'success',
+            'found': len(people),
+            'added': added_count,
+            'skipped': skipped_count,
+            'people': people
+        }
+
+    except Exception as e:
+        return {
+            'company': company_name,
+            'status': 'error',
+            'found': 0,
+            'added': 0,
+            'error': str(e),
+            'message': str(e),
+            'error_class': classify_error(e)[0],
+            'people': []
+        }
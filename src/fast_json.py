@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Fast JSON for Ping CRM API Clients
+Decodes API responses and encodes request bodies with msgspec or orjson when
+installed, and with the standard library otherwise
+"""
+
+import json
+from typing import Any, Dict, List, Optional, TypedDict
+
+import httpx
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .records import Record
+
+
+# Which library decodes plain JSON ('msgspec' is only used for Apollo responses)
+BACKEND = 'orjson' if orjson else 'json'
+
+
+# ============================================================
+# APOLLO RESPONSE SHAPE
+# ============================================================
+# Only the fields ApolloClient reads (its normalizers and name matching).
+# Apollo's person and organization objects carry dozens more; a typed
+# decoder skips those instead of building dicts for them. Values are Any so
+# an unexpected type from Apollo is passed through, not rejected.
+
+class ApolloOrganization(TypedDict, total=False):
+    id: Any
+    name: Any
+    website_url: Any
+    linkedin_url: Any
+    industry: Any
+    estimated_num_employees: Any
+    estimated_annual_revenue: Any
+    city: Any
+    state: Any
+    country: Any
+    technologies: Any
+    funding_stage: Any
+
+
+class ApolloPerson(TypedDict, total=False):
+    id: Any
+    name: Any
+    first_name: Any
+    last_name: Any
+    title: Any
+    seniority: Any
+    email: Any
+    phone: Any
+    linkedin_url: Any
+    city: Any
+    state: Any
+    country: Any
+    organization: Optional[ApolloOrganization]
+
+
+class ApolloResponse(TypedDict, total=False):
+    people: Optional[List[ApolloPerson]]
+    person: Optional[ApolloPerson]
+    organizations: Optional[List[ApolloOrganization]]
+
+
+_apollo_decoder = msgspec.json.Decoder(ApolloResponse) if msgspec else None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def loads(data) -> Any:
+    """Decode JSON (bytes or str)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a request body as compact UTF-8 JSON (records included)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def decode_apollo(data) -> Dict:
+    """
+    Decode an Apollo people/organization response
+
+    With msgspec installed only the fields ApolloClient reads are decoded;
+    otherwise the whole body is (same dicts, just more keys).
+    """
+    if _apollo_decoder is not None:
+        return _apollo_decoder.decode(data)
+    return loads(data)
+
+
+def use_fast_json(client):
+    """Encode a notion_client.Client's request bodies and decode its responses with dumps/loads"""
+    parse_response = client._parse_response
+
+    def _build_request(method, path, query=None, body=None, auth=None):
+        headers = httpx.Headers()
+        if auth:
+            headers['Authorization'] = f"Bearer {auth}"
+        content = None
+        if body is not None:
+            content = dumps(body)
+            headers['Content-Type'] = 'application/json'
+        client.logger.info(f"{method} {client.client.base_url}{path}")
+        return client.client.build_request(method, path, params=query, content=content, headers=headers)
+
+    def _parse_response(response):
+        # Errors keep the SDK's handling (APIResponseError with code/status)
+        if not response.is_success:
+            return parse_response(response)
+        return loads(response.content)
+
+    client._build_request = _build_request
+    client._parse_response = _parse_response
+    return client
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Content Fingerprints for Ping CRM
+Detects unchanged Apollo records so re-enrichment can skip notes and Notion writes
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from .records import json_default
+from .sqlite_pool import get_pool
+from .telemetry import record_cache
+
+
+def record_fingerprint(*records: Optional[Dict]) -> str:
+    """
+    Stable fingerprint of one or more normalized records
+
+    Key order and dict identity don't matter; any changed value does.
+
+    Args:
+        records: Contact/Company records or dicts (None is treated as empty)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(
+        [record or {} for record in records],
+        sort_keys=True,
+        separators=(',', ':'),
+        default=json_default
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    """Last-written fingerprint and Notion page id per Apollo record"""
+
+    def __init__(self, scope: str = '', db_path: str = None):
+        """
+        Initialize fingerprint storage
+
+        Args:
+            scope: Namespace for the records, normally the Notion database id,
+                so users with different databases never share fingerprints
+            db_path: SQLite file (defaults to data/fingerprints.db)
+        """
+        if db_path is None:
+            # Default to data directory
+            db_dir = Path(__file__).parent.parent / 'data'
+            db_dir.mkdir(exist_ok=True)
+            db_path = db_dir / 'fingerprints.db'
+
+        self.scope = scope
+        self.db_path = str(db_path)
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('fingerprints', self.init_database)
+
+    def init_database(self):
+        """Create tables if they don't exist"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    scope TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    apollo_id TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    page_id TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (scope, kind, apollo_id)
+                )
+            ''')
+
+    def get(self, kind: str, apollo_id: str) -> Optional[Dict]:
+        """Get the stored fingerprint and page id for a record"""
+        with self.pool.connection() as conn:
+            result = conn.execute('''
+                SELECT fingerprint, page_id, updated_at
+                FROM fingerprints
+                WHERE scope = ? AND kind = ? AND apollo_id = ?
+            ''', (self.scope, kind, apollo_id)).fetchone()
+
+        if result:
+            return {
+                'fingerprint': result[0],
+                'page_id': result[1],
+                'updated_at': result[2]
+            }
+        return None
+
+    def is_unchanged(self, kind: str, apollo_id: Optional[str], fingerprint: str) -> bool:
+        """True if this exact content was already written for the record"""
+        if not apollo_id:
+            return False
+        stored = self.get(kind, apollo_id)
+        unchanged = stored is not None and stored['fingerprint'] == fingerprint
+        record_cache('fingerprints', unchanged)
+        return unchanged
+
+    def record(self, kind: str, apollo_id: Optional[str], fingerprint: str,
+               page_id: str = None) -> None:
+        """Store the fingerprint of content just written to Notion"""
+        if not apollo_id:
+            return
+
+        with self.pool.connection() as conn:
+            conn.execute('''
+                INSERT INTO fingerprints (scope, kind, apollo_id, fingerprint, page_id)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (scope, kind, apollo_id) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    page_id = COALESCE(excluded.page_id, fingerprints.page_id),
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (self.scope, kind, apollo_id, fingerprint, page_id))
+
+    def forget(self, kind: str, apollo_id: str) -> None:
+        """Drop a record so the next enrichment writes it again"""
+        with self.pool.connection() as conn:
+            conn.execute(
+                'DELETE FROM fingerprints WHERE scope = ? AND kind = ? AND apollo_id = ?',
+                (self.scope, kind, apollo_id)
+            )
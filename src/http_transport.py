@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport for Ping CRM API Clients
+Keep-alive connection pools sized for the app's concurrency, with connection
+reuse counted in telemetry, and an optional HTTP/2 client
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .telemetry import instrument_httpx, record_cache
+
+
+# Connections kept open per host (requests' default of 10 makes the 11th
+# concurrent call open - and then throw away - a connection of its own)
+DEFAULT_POOL_SIZE = 32
+
+# Set by the pools below when a request had to open a new connection
+_opened = threading.local()
+
+
+def pool_size_from_env(name: str) -> int:
+    """Pool size from `<NAME>_POOL_SIZE`, else HTTP_POOL_SIZE, else DEFAULT_POOL_SIZE"""
+    return int(os.getenv(f'{name.upper()}_POOL_SIZE') or os.getenv('HTTP_POOL_SIZE') or DEFAULT_POOL_SIZE)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _opened.value = True
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _opened.value = True
+        return super()._new_conn()
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with a sized pool that counts connection reuse
+
+    Every request is recorded as a lookup in the `<name>_keepalive` telemetry
+    cache: a hit when it went over an open connection, a miss when it paid
+    for a new socket (and TLS handshake).
+    """
+
+    def __init__(self, name: str, pool_size: int = None):
+        """
+        Args:
+            name: Service label for telemetry ('apollo')
+            pool_size: Connections kept open per host (default: pool_size_from_env(name))
+        """
+        self.name = name
+        self.pool_size = pool_size or pool_size_from_env(name)
+        self.requests = 0
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+        super().__init__(pool_connections=4, pool_maxsize=self.pool_size)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        _opened.value = False
+        try:
+            return super().send(request, *args, **kwargs)
+        finally:
+            opened = _opened.value
+            with self._lock:
+                self.requests += 1
+                self.connections_opened += opened
+            record_cache(f'{self.name}_keepalive', not opened)
+
+    def stats(self) -> Dict:
+        """Requests sent, connections opened and the share of requests that reused one"""
+        with self._lock:
+            requests_sent, opened = self.requests, self.connections_opened
+        return {
+            'pool_size': self.pool_size,
+            'requests': requests_sent,
+            'connections_opened': opened,
+            'reuse_ratio': round(1 - opened / requests_sent, 4) if requests_sent else 0.0
+        }
+
+
+def pooled_session(name: str, pool_size: int = None) -> requests.Session:
+    """requests.Session whose http(s) traffic goes through a PooledAdapter"""
+    session = requests.Session()
+    adapter = PooledAdapter(name, pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def http2_client(name: str, pool_size: int = None) -> Optional[httpx.Client]:
+    """
+    HTTP/2 httpx.Client, if `<NAME>_HTTP2` is on and the h2 package is installed
+
+    Over HTTP/2 concurrent requests share one multiplexed connection.
+
+    Returns:
+        The client, or None to stay on HTTP/1.1
+    """
+    if os.getenv(f'{name.upper()}_HTTP2', '').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    size = pool_size or pool_size_from_env(name)
+    try:
+        client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size)
+        )
+    except ImportError:
+        print(f"{name.upper()}_HTTP2 is set but h2 isn't installed (pip install 'httpx[http2]'); using HTTP/1.1")
+        return None
+    return instrument_httpx(client)
@@ -0,0 +1,144 @@
+"""
+Keyword Classifier
+Compiles ordered keyword rules into one regex so text is classified in a single pass
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+
+Rules = Sequence[Tuple[str, Iterable[str]]]
+
+
+def _is_word_char(char: str) -> bool:
+    """Same notion of a word character as regex \\b"""
+    return char.isalnum() or char == '_'
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex alternation factored by common prefix
+
+    At each node the branches start with distinct characters, so the regex
+    engine follows at most one branch per position instead of trying every
+    keyword, and backtracking yields the longest keyword that matches.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if ends_here:
+            # Keyword may end here; try the longer continuation first
+            return body + '?' if len(branches) == 1 and len(body) == 1 else '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class KeywordClassifier:
+    """
+    Ordered keyword rules compiled into a single-pass matcher
+
+    Rules are (label, keywords) pairs checked in order: the first rule with
+    any keyword occurring in the text wins, exactly like a chain of
+    `any(kw in text for kw in KEYWORDS)` checks, but the text is scanned once.
+
+    Example:
+        classifier = KeywordClassifier(
+            [("Insurance", ["insurance", "payer"]), ("Pharma", ["pharma"])],
+            default="Other"
+        )
+        classifier.classify("Health Insurance")  # -> "Insurance"
+    """
+
+    def __init__(self, rules: Rules, default: Optional[str] = None, word_boundary: bool = False):
+        """
+        Compile rules
+
+        Args:
+            rules: Ordered (label, keywords) pairs; keywords are case-insensitive
+            default: Label returned when no keyword matches
+            word_boundary: Match whole words only instead of substrings
+        """
+        self.rules = [(label, tuple(kw.lower() for kw in keywords if kw)) for label, keywords in rules]
+        self.default = default
+        self.word_boundary = word_boundary
+        self._priority = {}
+        for index, (label, _) in enumerate(self.rules):
+            self._priority.setdefault(label, index)
+
+        labels_by_keyword = {}
+        for label, keywords in self.rules:
+            for keyword in keywords:
+                labels_by_keyword.setdefault(keyword, set()).add(label)
+
+        keywords = list(labels_by_keyword)
+
+        # Every keyword that is a prefix of the longest match also matches at
+        # that position; precompute the labels it implies
+        self._implied = {
+            keyword: frozenset(
+                label
+                for prefix in keywords
+                if keyword.startswith(prefix) and self._prefix_matches(keyword, len(prefix))
+                for label in labels_by_keyword[prefix]
+            )
+            for keyword in keywords
+        }
+
+        # The trie reports the longest keyword at each position
+        alternation = _trie_pattern(keywords)
+        if word_boundary:
+            pattern = rf'(?=\b({alternation})\b)'
+        else:
+            pattern = rf'(?=({alternation}))'
+        # Lookahead lets matches overlap, so no keyword is hidden by another
+        self._pattern = re.compile(pattern) if keywords else None
+
+    def _prefix_matches(self, keyword: str, length: int) -> bool:
+        """Whether a prefix of a matched keyword also satisfies the boundary rule"""
+        if not self.word_boundary or length == len(keyword):
+            return True
+        return _is_word_char(keyword[length - 1]) != _is_word_char(keyword[length])
+
+    def labels(self, text: str) -> Set[str]:
+        """All labels with at least one keyword in text"""
+        if not text or self._pattern is None:
+            return set()
+
+        found: Set[str] = set()
+        implied = self._implied
+        for match in self._pattern.finditer(text.lower()):
+            found |= implied[match.group(1)]
+        return found
+
+    def classify(self, text: str) -> Optional[str]:
+        """Label of the first matching rule, or the default"""
+        if not text or self._pattern is None:
+            return self.default
+
+        best = None
+        implied = self._implied
+        priority = self._priority
+        for match in self._pattern.finditer(text.lower()):
+            for label in implied[match.group(1)]:
+                if best is None or priority[label] < priority[best]:
+                    best = label
+            if priority[best] == 0:
+                # Nothing can beat the first rule
+                break
+        return best if best is not None else self.default
+
+    def matches(self, text: str, label: str) -> bool:
+        """Whether any keyword of the given label occurs in text"""
+        return label in self.labels(text)
+
@@ -7,7 +7,11 @@ import os
 import json
 from typing import Dict, Optional
 
+from .telemetry import traced, instrument_httpx
+from .profiling import step
 
+
+@traced('llm', http_retries=True)
 class SmartLLM:
     """Auto-detect and use OpenAI or Gemini based on available API key"""
 
@@ -35,8 +39,11 @@ class SmartLLM:
     def _init_openai(self):
         """Initialize OpenAI client"""
         try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=self.openai_key)
+            from openai import OpenAI, DefaultHttpxClient
+            self.client = OpenAI(
+                api_key=self.openai_key,
+                http_client=instrument_httpx(DefaultHttpxClient())
+            )
             self.model = "gpt-4o-mini"  # Cheapest, fastest OpenAI model
             print(f"✓ Using OpenAI ({self.model})")
         except ImportError:
@@ -78,12 +85,13 @@ class SmartLLM:
 
         messages.append({"role": "user", "content": prompt})
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.3,
-            max_tokens=800
-        )
+        with step('api_wait'):
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=800
+            )
 
         return response.choices[0].message.content
 
@@ -94,13 +102,14 @@ class SmartLLM:
         if system_prompt:
             full_prompt = f"{system_prompt}\n\n{prompt}"
 
-        response = self.client.generate_content(
-            full_prompt,
-            generation_config={
-                'temperature': 0.3,
-                'max_output_tokens': 800,
-            }
-        )
+        with step('api_wait'):
+            response = self.client.generate_content(
+                full_prompt,
+                generation_config={
+                    'temperature': 0.3,
+                    'max_output_tokens': 800,
+                }
+            )
 
         return response.text
 
@@ -108,9 +117,9 @@ class SmartLLM:
 class AITargeting:
     """AI-powered targeting strategy generator"""
 
-    def __init__(self):
-        """Initialize with auto-detected LLM"""
-        self.llm = SmartLLM()
+    def __init__(self, openai_key: Optional[str] = None, gemini_key: Optional[str] = None):
+        """Initialize with the given keys, or auto-detected from env"""
+        self.llm = SmartLLM(openai_key, gemini_key)
 
     def analyze_targeting_request(
         self,
@@ -10,57 +10,269 @@ Features:
 """
 
 from notion_client import Client
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+from datetime import datetime, timedelta
 import os
-
-
+import time
+
+from .keyword_classifier import KeywordClassifier
+from .singleflight import SingleFlight, coalesced
+from .telemetry import traced, instrument_httpx
+from .profiling import profiled, instrument_notion_sdk
+from .fast_json import use_fast_json
+from .retry_policy import guard_httpx
+
+
+# Apollo industry -> existing Industry options in the user's database (first match wins)
+INDUSTRY_CLASSIFIER = KeywordClassifier([
+    ("Insurance", ['insurance', 'payer', 'health plan']),
+    ("Hospital & Health Systems", ['hospital', 'health system', 'provider', 'clinic', 'medical center']),
+    ("Healthcare Tech", ['pharmacy', 'pbm', 'drug']),  # Closest match
+    ("Pharma", ['pharma', 'pharmaceutical']),
+    ("Biotech", ['biotech', 'biotechnology']),
+    ("Medical Devices", ['medical device', 'device']),
+    ("Digital Health", ['digital health', 'health tech']),
+    ("Telehealth", ['telehealth', 'telemedicine']),
+    ("Health Services", ['health service', 'healthcare service']),
+], default="Healthcare Tech")
+
+# Dedupe lookups only need to know whether one page matches
+LOOKUP_PAGE_SIZE = 1
+
+
+def page_to_row(page: Dict) -> Dict:
+    """Extract lookup identifiers from a contact page (same keys as CSV rows)"""
+    props = page.get('properties', {})
+
+    def _text(prop: Dict, kind: str) -> str:
+        parts = prop.get(kind) or []
+        return ''.join(part.get('plain_text', '') for part in parts)
+
+    return {
+        'linkedin_url': props.get('LinkedIn', {}).get('url') or '',
+        'email': props.get('Email', {}).get('email') or '',
+        'person_name': _text(props.get('Contact Name', {}), 'title'),
+        'company_name': _text(props.get('Company', {}), 'rich_text'),
+    }
+
+
+class UpsertResult(NamedTuple):
+    """Outcome of upsert_contact"""
+    success: bool
+    action: str                     # 'updated' or 'created'
+    page_id: Optional[str] = None   # Page written (None if the write failed or is still queued)
+
+
+class CompanyContacts:
+    """
+    Contacts already stored for one company, for dedupe without a query per person
+
+    A person matches on email, LinkedIn URL or name (case-insensitive).
+    """
+
+    def __init__(self):
+        self.names = set()
+        self.emails = set()
+        self.linkedin_urls = set()
+
+    def add(self, name: str, email: Optional[str] = None, linkedin_url: Optional[str] = None) -> None:
+        if name:
+            self.names.add(name.strip().casefold())
+        if email:
+            self.emails.add(email.strip().lower())
+        if linkedin_url:
+            self.linkedin_urls.add(linkedin_url.strip().rstrip('/').lower())
+
+    def contains(self, name: str, email: Optional[str] = None, linkedin_url: Optional[str] = None) -> bool:
+        return bool(
+            (email and email.strip().lower() in self.emails)
+            or (linkedin_url and linkedin_url.strip().rstrip('/').lower() in self.linkedin_urls)
+            or (name and name.strip().casefold() in self.names)
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def query_company_contacts(client: Client, database_id: str, company_name: str) -> CompanyContacts:
+    """Every page whose Company contains company_name, in one paginated query"""
+    contacts = CompanyContacts()
+    # An empty "contains" filter matches every page in the database
+    if not company_name or not company_name.strip():
+        return contacts
+    start_cursor = None
+
+    while True:
+        query = {
+            "database_id": database_id,
+            "filter": {"property": "Company", "rich_text": {"contains": company_name}},
+            "page_size": 100
+        }
+        if start_cursor:
+            query["start_cursor"] = start_cursor
+
+        response = client.databases.query(**query)
+        for page in response['results']:
+            row = page_to_row(page)
+            contacts.add(row['person_name'], row['email'], row['linkedin_url'])
+
+        if not response.get('has_more'):
+            return contacts
+        start_cursor = response['next_cursor']
+
+
+@traced('notion', exclude=('page_to_row',))
 class NotionClient:
     """Unified Notion client for contact enrichment"""
 
-    def __init__(self, token: str, database_id: str):
-        self.client = Client(auth=token)
+    # How long a failed database schema lookup is cached (see has_property)
+    PROPERTIES_RETRY_SECONDS = 60
+
+    def __init__(self, token: str, database_id: str,
+                 openai_key: Optional[str] = None, gemini_key: Optional[str] = None):
+        self.client = Client(auth=token, base_url=os.getenv('NOTION_BASE_URL', 'https://api.notion.com'))
+        instrument_httpx(self.client.client)
+        use_fast_json(self.client)
+        instrument_notion_sdk(self.client)
+        guard_httpx(self.client.client, 'notion')
         self.database_id = database_id
+        # AI keys for personalized notes (fall back to env for CLI scripts)
+        self.openai_key = openai_key or os.getenv('OPENAI_API_KEY')
+        self.gemini_key = gemini_key or os.getenv('GEMINI_API_KEY')
+        self.last_error = None  # Most recent swallowed API error (for retry classification)
+        self._database_properties = None
+        self._properties_retry_at = None  # Set while a failed schema lookup is cached
+        # Concurrent identical lookups share one query
+        self.singleflight = SingleFlight('notion_inflight')
 
     # ============================================================
     # READ OPERATIONS
     # ============================================================
 
-    def find_contact(self, contact_name: str, company_name: str) -> Optional[Dict]:
+    @coalesced(lambda contact_name, company_name, email=None, linkedin_url=None: (
+        contact_name, company_name, email, linkedin_url
+    ))
+    def find_contact(
+        self,
+        contact_name: str,
+        company_name: str,
+        email: Optional[str] = None,
+        linkedin_url: Optional[str] = None
+    ) -> Optional[Dict]:
         """
         Find existing contact in Notion database
 
+        Looks up by the strongest key available: Email, then LinkedIn URL,
+        then exact Contact Name together with Company. Each lookup is a
+        server-side filter, so Notion returns at most one small page.
+
         Args:
             contact_name: Full name of person
             company_name: Company name
+            email: Email address, if known
+            linkedin_url: LinkedIn profile URL, if known
 
         Returns:
             Page object if found, None otherwise
         """
         try:
-            # Search by contact name (title field)
-            response = self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Contact Name",
-                    "title": {
-                        "contains": contact_name
-                    }
-                }
-            )
-
-            # Check for company match in results
-            for page in response['results']:
-                page_company = self._get_company_from_page(page)
-                if company_name.lower() in page_company.lower():
+            for lookup_filter in self._contact_lookups(contact_name, company_name, email, linkedin_url):
+                page = self._first_match(lookup_filter)
+                if page:
                     return page
 
             return None
 
         except Exception as e:
+            self.last_error = e
             print(f"Error finding contact: {e}")
             return None
 
+    def _contact_lookups(
+        self,
+        contact_name: str,
+        company_name: str,
+        email: Optional[str],
+        linkedin_url: Optional[str]
+    ) -> List[Dict]:
+        """Filters to try, strongest key first"""
+        lookups = []
+        if email:
+            lookups.append({"property": "Email", "email": {"equals": email}})
+        # Only real LinkedIn URLs are ever written (see _create_page)
+        if linkedin_url and linkedin_url.startswith('http') and 'linkedin.com' in linkedin_url.lower():
+            lookups.append({"property": "LinkedIn", "url": {"equals": linkedin_url}})
+        if contact_name:
+            name_filter = {"property": "Contact Name", "title": {"equals": contact_name}}
+            if company_name:
+                lookups.append({"and": [
+                    name_filter,
+                    {"property": "Company", "rich_text": {"contains": company_name}}
+                ]})
+            else:
+                lookups.append(name_filter)
+        return lookups
+
+    def _first_match(self, lookup_filter: Dict) -> Optional[Dict]:
+        """First page matching a filter, following cursors until one is returned"""
+        start_cursor = None
+        while True:
+            query = {
+                "database_id": self.database_id,
+                "filter": lookup_filter,
+                "page_size": LOOKUP_PAGE_SIZE
+            }
+            if start_cursor:
+                query["start_cursor"] = start_cursor
+
+            response = self.client.databases.query(**query)
+            if response['results']:
+                return response['results'][0]
+
+            # Notion can return an empty page with has_more while it scans
+            if not response.get('has_more'):
+                return None
+            start_cursor = response['next_cursor']
+
+    @coalesced(lambda company_name: company_name)
+    def prefetch_company(self, company_name: str) -> Optional[CompanyContacts]:
+        """
+        Fetch a company's existing contacts once, to dedupe all its people locally
+
+        Args:
+            company_name: Company name
+
+        Returns:
+            CompanyContacts, or None if the query failed (fall back to find_contact)
+        """
+        try:
+            return query_company_contacts(self.client, self.database_id, company_name)
+        except Exception as e:
+            self.last_error = e
+            print(f"Error prefetching contacts: {e}")
+            return None
+
+    def contact_page_exists(self, page_id: str) -> bool:
+        """
+        Check that a page written earlier is still in the database (not deleted or archived)
+
+        Args:
+            page_id: Notion page id
+
+        Returns:
+            False only if Notion says the page is gone; True if it can't tell
+        """
+        try:
+            page = self.client.pages.retrieve(page_id=page_id)
+        except Exception as e:
+            if getattr(e, 'status', None) == 404:
+                return False
+            self.last_error = e
+            print(f"Error checking contact page: {e}")
+            return True
+        return not (page.get('archived') or page.get('in_trash'))
+
+    @coalesced(lambda company_name: company_name)
     def page_exists(self, company_name: str) -> bool:
         """
         Check if any contacts from company exist
@@ -87,6 +299,75 @@ class NotionClient:
         except Exception:
             return False
 
+    def find_stale_contacts(self, max_age_days: int, limit: int = 100) -> List[Dict]:
+        """
+        Find contacts whose enrichment is older than max_age_days
+
+        Never-enriched contacts are included. Results are ordered by
+        Priority (highest first), then oldest enrichment first.
+
+        Args:
+            max_age_days: Minimum age in days before a contact is stale
+            limit: Maximum number of pages to return
+
+        Returns:
+            List of page objects
+        """
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).date().isoformat()
+        sorts = [{"property": "Last Enriched", "direction": "ascending"}]
+        if self.has_property("Priority"):
+            sorts.insert(0, {"property": "Priority", "direction": "descending"})
+
+        pages = []
+        start_cursor = None
+
+        while len(pages) < limit:
+            query = {
+                "database_id": self.database_id,
+                "filter": {
+                    "or": [
+                        {"property": "Last Enriched", "date": {"before": cutoff}},
+                        {"property": "Last Enriched", "date": {"is_empty": True}}
+                    ]
+                },
+                "sorts": sorts,
+                "page_size": min(limit - len(pages), 100)
+            }
+            if start_cursor:
+                query["start_cursor"] = start_cursor
+
+            response = self.client.databases.query(**query)
+            pages.extend(response['results'])
+
+            if not response.get('has_more'):
+                break
+            start_cursor = response['next_cursor']
+
+        return pages[:limit]
+
+    def has_property(self, prop_name: str) -> bool:
+        """
+        Check (once per client) whether the database has a property
+
+        A failed lookup answers False for PROPERTIES_RETRY_SECONDS before
+        retrieving the database again, instead of once per row.
+        """
+        stale = self._properties_retry_at is not None and time.monotonic() >= self._properties_retry_at
+        if self._database_properties is None or stale:
+            try:
+                db = self.client.databases.retrieve(database_id=self.database_id)
+                self._database_properties = set(db.get('properties', {}).keys())
+                self._properties_retry_at = None
+            except Exception as e:
+                self.last_error = e
+                self._database_properties = set()
+                self._properties_retry_at = time.monotonic() + self.PROPERTIES_RETRY_SECONDS
+        return prop_name in self._database_properties
+
+    def page_to_row(self, page: Dict) -> Dict:
+        """Extract lookup identifiers from a contact page (same keys as CSV rows)"""
+        return page_to_row(page)
+
     # ============================================================
     # WRITE OPERATIONS - Single Contact
     # ============================================================
@@ -97,33 +378,47 @@ class NotionClient:
         company_name: str,
         enriched_data: Dict,
         company_data: Optional[Dict] = None,
-        outreach_context: Optional[str] = None
-    ) -> Tuple[bool, str]:
+        outreach_context: Optional[str] = None,
+        page_id: Optional[str] = None,
+        checked: bool = False
+    ) -> UpsertResult:
         """
         Update if exists, create if not (upsert operation)
 
+        Callers that already looked the contact up pass what they found, so
+        the lookup isn't repeated: page_id to update that page, or
+        checked=True to create without looking again.
+
         Args:
             contact_name: Full name of person
             company_name: Company name
             enriched_data: Contact data from Apollo
             company_data: Optional company data for notes
             outreach_context: Optional personalized outreach context from AI
+            page_id: Existing page to update (skips the lookup)
+            checked: Caller found no existing page (skips the lookup)
 
         Returns:
-            Tuple of (success: bool, action: str) where action is 'updated' or 'created'
+            UpsertResult(success, action, page_id) where action is 'updated' or 'created'
         """
-        # Try to find existing contact
-        existing_page = self.find_contact(contact_name, company_name)
+        if page_id is None and not checked:
+            existing_page = self.find_contact(
+                contact_name,
+                company_name,
+                email=enriched_data.get('email'),
+                linkedin_url=enriched_data.get('linkedin_url')
+            )
+            page_id = existing_page['id'] if existing_page else None
 
-        if existing_page:
+        if page_id:
             # Update existing
             success = self._update_page(
-                page_id=existing_page['id'],
+                page_id=page_id,
                 enriched_data=enriched_data,
                 company_data=company_data,
                 outreach_context=outreach_context
             )
-            return (success, 'updated')
+            return UpsertResult(success, 'updated', page_id if success else None)
         else:
             # Create new
             page_id = self._create_page(
@@ -133,7 +428,25 @@ class NotionClient:
                 company_data=company_data,
                 outreach_context=outreach_context
             )
-            return (page_id is not None, 'created')
+            return UpsertResult(page_id is not None, 'created', page_id)
+
+    def update_contact(
+        self,
+        page_id: str,
+        enriched_data: Dict,
+        company_data: Optional[Dict] = None
+    ) -> bool:
+        """
+        Update a known contact page (used by scheduled re-enrichment)
+
+        An empty enriched_data only refreshes Last Enriched, so contacts
+        Apollo can't find aren't re-selected on every run.
+        """
+        return self._update_page(
+            page_id=page_id,
+            enriched_data=enriched_data,
+            company_data=company_data
+        )
 
     # ============================================================
     # WRITE OPERATIONS - Bulk (for company enrichment)
@@ -159,10 +472,21 @@ class NotionClient:
             List of created page IDs
         """
         page_ids = []
+        existing = self.prefetch_company(company_data.get('name', ''))
 
         for contact in contacts:
             # Check if contact already exists
-            if not self.contact_exists(contact.get('name', ''), company_data.get('name', '')):
+            if existing is not None:
+                exists = existing.contains(contact.get('name', ''), contact.get('email'), contact.get('linkedin_url'))
+            else:
+                exists = self.contact_exists(
+                    contact.get('name', ''),
+                    company_data.get('name', ''),
+                    email=contact.get('email'),
+                    linkedin_url=contact.get('linkedin_url')
+                )
+
+            if not exists:
                 page_id = self._create_page(
                     contact_name=contact.get('name', 'Unknown'),
                     company_name=company_data.get('name', ''),
@@ -173,17 +497,26 @@ class NotionClient:
                 )
                 if page_id:
                     page_ids.append(page_id)
+                    if existing is not None:
+                        existing.add(contact.get('name', ''), contact.get('email'), contact.get('linkedin_url'))
 
         return page_ids
 
-    def contact_exists(self, contact_name: str, company_name: str) -> bool:
+    def contact_exists(
+        self,
+        contact_name: str,
+        company_name: str,
+        email: Optional[str] = None,
+        linkedin_url: Optional[str] = None
+    ) -> bool:
         """Check if specific contact exists"""
-        return self.find_contact(contact_name, company_name) is not None
+        return self.find_contact(contact_name, company_name, email, linkedin_url) is not None
 
     # ============================================================
     # INTERNAL METHODS
     # ============================================================
 
+    @profiled('notion_payload')
     def _update_page(
         self,
         page_id: str,
@@ -250,6 +583,12 @@ class NotionClient:
                     "rich_text": [{"text": {"content": notes_content}}]
                 }
 
+            # Stamp enrichment age (queryable, unlike the Notes text)
+            if self.has_property("Last Enriched"):
+                properties["Last Enriched"] = {
+                    "date": {"start": datetime.now().isoformat()}
+                }
+
             # Update the page
             self.client.pages.update(
                 page_id=page_id,
@@ -259,9 +598,11 @@ class NotionClient:
             return True
 
         except Exception as e:
+            self.last_error = e
             print(f"Error updating page: {e}")
             return False
 
+    @profiled('notion_payload')
     def _create_page(
         self,
         contact_name: str,
@@ -368,6 +709,16 @@ class NotionClient:
                     "rich_text": [{"text": {"content": notes_content}}]
                 }
 
+            # Stamp enrichment age and priority for scheduled refreshes
+            if self.has_property("Last Enriched"):
+                properties["Last Enriched"] = {
+                    "date": {"start": datetime.now().isoformat()}
+                }
+            if priority and self.has_property("Priority"):
+                properties["Priority"] = {
+                    "number": priority
+                }
+
             # Create the page
             response = self.client.pages.create(
                 parent={"database_id": self.database_id},
@@ -377,19 +728,10 @@ class NotionClient:
             return response['id']
 
         except Exception as e:
+            self.last_error = e
             print(f"Error creating page: {e}")
             return None
 
-    def _get_company_from_page(self, page: Dict) -> str:
-        """Extract company name from page object"""
-        try:
-            company_prop = page['properties'].get('Company', {})
-            if company_prop.get('rich_text'):
-                return company_prop['rich_text'][0]['text']['content']
-        except Exception:
-            pass
-        return ""
-
     def _generate_ai_personalized_note(
         self,
         contact_data: Dict,
@@ -399,7 +741,7 @@ class NotionClient:
         """Generate AI-powered personalized note for outreach"""
         try:
             # Check if AI is available
-            if not os.getenv('OPENAI_API_KEY') and not os.getenv('GEMINI_API_KEY'):
+            if not self.openai_key and not self.gemini_key:
                 return None
 
             from llm_helper import AITargeting
@@ -429,9 +771,9 @@ Write 2-3 sentences explaining:
 Keep it professional, concise, and actionable. No fluff."""
 
             # Get AI response
-            if os.getenv('OPENAI_API_KEY'):
+            if self.openai_key:
                 import openai
-                client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+                client = openai.OpenAI(api_key=self.openai_key)
 
                 response = client.chat.completions.create(
                     model="gpt-4o-mini",
@@ -442,9 +784,9 @@ Keep it professional, concise, and actionable. No fluff."""
 
                 return response.choices[0].message.content.strip()
 
-            elif os.getenv('GEMINI_API_KEY'):
+            elif self.gemini_key:
                 import google.generativeai as genai
-                genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+                genai.configure(api_key=self.gemini_key)
                 model = genai.GenerativeModel('gemini-1.5-flash')
 
                 response = model.generate_content(prompt)
@@ -454,6 +796,7 @@ Keep it professional, concise, and actionable. No fluff."""
             print(f"AI note generation failed: {e}")
             return None
 
+    @profiled('notes_building')
     def _build_enrichment_notes(
         self,
         contact_data: Dict,
@@ -550,26 +893,4 @@ Keep it professional, concise, and actionable. No fluff."""
 
     def _map_industry(self, industry: str) -> str:
         """Map Apollo industry to existing Notion options"""
-        industry_lower = industry.lower()
-
-        # Match to existing options in user's database
-        if any(kw in industry_lower for kw in ['insurance', 'payer', 'health plan']):
-            return "Insurance"
-        elif any(kw in industry_lower for kw in ['hospital', 'health system', 'provider', 'clinic', 'medical center']):
-            return "Hospital & Health Systems"
-        elif any(kw in industry_lower for kw in ['pharmacy', 'pbm', 'drug']):
-            return "Healthcare Tech"
-        elif any(kw in industry_lower for kw in ['pharma', 'pharmaceutical']):
-            return "Pharma"
-        elif any(kw in industry_lower for kw in ['biotech', 'biotechnology']):
-            return "Biotech"
-        elif any(kw in industry_lower for kw in ['medical device', 'device']):
-            return "Medical Devices"
-        elif any(kw in industry_lower for kw in ['digital health', 'health tech']):
-            return "Digital Health"
-        elif any(kw in industry_lower for kw in ['telehealth', 'telemedicine']):
-            return "Telehealth"
-        elif any(kw in industry_lower for kw in ['health service', 'healthcare service']):
-            return "Health Services"
-        else:
-            return "Healthcare Tech"  # Default
+        return INDUSTRY_CLASSIFIER.classify(industry)
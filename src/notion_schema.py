@@ -4,9 +4,14 @@ Notion Database Schema Management
 Automatically validates and sets up Notion database schema
 """
 
+import os
 from notion_client import Client
 from typing import Tuple, List, Dict
 
+from .telemetry import traced, instrument_httpx
+from .profiling import instrument_notion_sdk
+from .fast_json import use_fast_json
+
 
 # Required schema for Ping CRM
 REQUIRED_SCHEMA = {
@@ -92,15 +97,27 @@ OPTIONAL_SCHEMA = {
         'type': 'rich_text',
         'description': 'Additional notes',
     },
+    'Last Enriched': {
+        'type': 'date',
+        'description': 'When Apollo data was last refreshed',
+    },
+    'Priority': {
+        'type': 'number',
+        'description': 'Priority score (1-10)',
+    },
 }
 
 
+@traced('notion_schema')
 class NotionSchemaManager:
     """Manages Notion database schema validation and setup"""
 
     def __init__(self, notion_token: str, database_id: str):
         """Initialize schema manager"""
-        self.client = Client(auth=notion_token)
+        self.client = Client(auth=notion_token, base_url=os.getenv('NOTION_BASE_URL', 'https://api.notion.com'))
+        instrument_httpx(self.client.client)
+        use_fast_json(self.client)
+        instrument_notion_sdk(self.client)
         self.database_id = database_id
 
     def check_database_exists(self) -> Tuple[bool, str]:
@@ -207,6 +224,32 @@ class NotionSchemaManager:
         except Exception as e:
             return False, f"Failed to add {prop_name}: {str(e)}"
 
+    def ensure_properties(self, prop_names: List[str]) -> Tuple[bool, List[str]]:
+        """
+        Add specific optional properties if they are missing
+
+        Args:
+            prop_names: Property names from REQUIRED_SCHEMA or OPTIONAL_SCHEMA
+
+        Returns:
+            (success, added_properties)
+        """
+        current_props = self.get_current_schema()
+        if not current_props:
+            return False, []
+
+        added = []
+        for prop_name in prop_names:
+            if prop_name in current_props:
+                continue
+            prop_config = REQUIRED_SCHEMA.get(prop_name) or OPTIONAL_SCHEMA[prop_name]
+            success, _ = self.add_property(prop_name, prop_config)
+            if not success:
+                return False, added
+            added.append(prop_name)
+
+        return True, added
+
     def setup_schema(self, include_optional: bool = True) -> Tuple[bool, str, List[str]]:
         """
         Setup database schema by adding missing properties
@@ -3,16 +3,35 @@ Notion API Client
 Handles syncing enriched data to Notion database
 """
 
+import os
 from notion_client import Client
 from typing import Dict, List
 from datetime import datetime
 
+from .keyword_classifier import KeywordClassifier
+from .telemetry import traced, instrument_httpx
+from .profiling import profiled, instrument_notion_sdk
+from .fast_json import use_fast_json
 
+
+# Apollo industry -> Industry options (first match wins)
+INDUSTRY_CLASSIFIER = KeywordClassifier([
+    ("Insurance / Payer", ['insurance', 'payer', 'health plan']),
+    ("Healthcare Provider / Health System", ['hospital', 'health system', 'provider', 'clinic', 'medical']),
+    ("Pharmacy / PBM", ['pharmacy', 'pbm']),
+    ("Pharma / Biotech", ['pharma', 'biotech', 'pharmaceutical']),
+], default="Other")
+
+
+@traced('notion')
 class NotionClient:
     """Notion API wrapper for CRM operations"""
 
     def __init__(self, token: str, database_id: str):
-        self.client = Client(auth=token)
+        self.client = Client(auth=token, base_url=os.getenv('NOTION_BASE_URL', 'https://api.notion.com'))
+        instrument_httpx(self.client.client)
+        use_fast_json(self.client)
+        instrument_notion_sdk(self.client)
         self.database_id = database_id
 
     def create_company_page(
@@ -68,6 +87,7 @@ class NotionClient:
         except Exception:
             return False
 
+    @profiled('notion_payload')
     def _build_properties(
         self,
         company_data: Dict,
@@ -209,18 +229,7 @@ class NotionClient:
 
     def _map_industry(self, industry: str) -> str:
         """Map Apollo industry to Notion options"""
-        industry_lower = industry.lower()
-
-        if any(kw in industry_lower for kw in ['insurance', 'payer', 'health plan']):
-            return "Insurance / Payer"
-        elif any(kw in industry_lower for kw in ['hospital', 'health system', 'provider', 'clinic', 'medical']):
-            return "Healthcare Provider / Health System"
-        elif any(kw in industry_lower for kw in ['pharmacy', 'pbm']):
-            return "Pharmacy / PBM"
-        elif any(kw in industry_lower for kw in ['pharma', 'biotech', 'pharmaceutical']):
-            return "Pharma / Biotech"
-        else:
-            return "Other"
+        return INDUSTRY_CLASSIFIER.classify(industry)
 
     def _map_size(self, employee_count: int) -> str:
         """Map employee count to size range"""
@@ -3,17 +3,32 @@ Notion API Client - Adapted for Existing Schema
 Works with contact-centric database (one row per contact)
 """
 
+import os
 from notion_client import Client
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 
+from .notion_client import INDUSTRY_CLASSIFIER, CompanyContacts, query_company_contacts
+from .singleflight import SingleFlight, coalesced
+from .telemetry import traced, instrument_httpx
+from .profiling import profiled, instrument_notion_sdk
+from .fast_json import use_fast_json
+from .retry_policy import guard_httpx
 
+
+@traced('notion')
 class NotionClient:
     """Notion API wrapper adapted for existing contact-centric database"""
 
     def __init__(self, token: str, database_id: str):
-        self.client = Client(auth=token)
+        self.client = Client(auth=token, base_url=os.getenv('NOTION_BASE_URL', 'https://api.notion.com'))
+        instrument_httpx(self.client.client)
+        use_fast_json(self.client)
+        instrument_notion_sdk(self.client)
+        guard_httpx(self.client.client, 'notion')
         self.database_id = database_id
+        # Concurrent identical lookups share one query
+        self.singleflight = SingleFlight('notion_inflight')
 
     def create_contact_pages(
         self,
@@ -35,15 +50,40 @@ class NotionClient:
             List of created page IDs
         """
         page_ids = []
+        existing = self.prefetch_company(company_data.get('name', ''))
 
         for contact in contacts:
             # Check if contact already exists
-            if not self.contact_exists(contact.get('name', ''), company_data.get('name', '')):
+            if existing is not None:
+                exists = existing.contains(contact.get('name', ''), contact.get('email'), contact.get('linkedin_url'))
+            else:
+                exists = self.contact_exists(contact.get('name', ''), company_data.get('name', ''))
+
+            if not exists:
                 page_id = self._create_single_contact(company_data, contact, tier, priority)
                 page_ids.append(page_id)
+                if existing is not None:
+                    existing.add(contact.get('name', ''), contact.get('email'), contact.get('linkedin_url'))
 
         return page_ids
 
+    @coalesced(lambda company_name: company_name)
+    def prefetch_company(self, company_name: str) -> Optional[CompanyContacts]:
+        """
+        Fetch a company's existing contacts in one paginated query
+
+        Args:
+            company_name: Company name
+
+        Returns:
+            CompanyContacts, or None if the query failed
+        """
+        try:
+            return query_company_contacts(self.client, self.database_id, company_name)
+        except Exception:
+            return None
+
+    @coalesced(lambda contact_name, company_name: (contact_name, company_name))
     def contact_exists(self, contact_name: str, company_name: str) -> bool:
         """
         Check if contact already exists in Notion
@@ -80,6 +120,7 @@ class NotionClient:
         except Exception:
             return False
 
+    @coalesced(lambda company_name: company_name)
     def page_exists(self, company_name: str) -> bool:
         """
         Check if any contacts from company exist
@@ -105,6 +146,7 @@ class NotionClient:
         except Exception:
             return False
 
+    @profiled('notion_payload')
     def _create_single_contact(
         self,
         company_data: Dict,
@@ -177,6 +219,7 @@ class NotionClient:
 
         return response['id']
 
+    @profiled('notes_building')
     def _build_notes(self, company_data: Dict, tier: str, priority: int) -> str:
         """
         Build notes field with enrichment data
@@ -224,29 +267,7 @@ class NotionClient:
 
     def _map_industry(self, industry: str) -> str:
         """Map Apollo industry to existing Notion options"""
-        industry_lower = industry.lower()
-
-        # Match to existing options in user's database
-        if any(kw in industry_lower for kw in ['insurance', 'payer', 'health plan']):
-            return "Insurance"
-        elif any(kw in industry_lower for kw in ['hospital', 'health system', 'provider', 'clinic', 'medical center']):
-            return "Hospital & Health Systems"
-        elif any(kw in industry_lower for kw in ['pharmacy', 'pbm', 'drug']):
-            return "Healthcare Tech"  # Closest match
-        elif any(kw in industry_lower for kw in ['pharma', 'pharmaceutical']):
-            return "Pharma"
-        elif any(kw in industry_lower for kw in ['biotech', 'biotechnology']):
-            return "Biotech"
-        elif any(kw in industry_lower for kw in ['medical device', 'device']):
-            return "Medical Devices"
-        elif any(kw in industry_lower for kw in ['digital health', 'health tech']):
-            return "Digital Health"
-        elif any(kw in industry_lower for kw in ['telehealth', 'telemedicine']):
-            return "Telehealth"
-        elif any(kw in industry_lower for kw in ['health service', 'healthcare service']):
-            return "Health Services"
-        else:
-            return "Healthcare Tech"  # Default
+        return INDUSTRY_CLASSIFIER.classify(industry)
 
     def _map_size(self, employee_count: int) -> str:
         """Map employee count to size range"""
@@ -3,16 +3,25 @@ Notion API Client - Update Mode
 Enriches existing contacts in your Notion database
 """
 
+import os
 from notion_client import Client
 from typing import Dict, Optional
 from datetime import datetime
 
+from .telemetry import traced, instrument_httpx
+from .profiling import profiled, instrument_notion_sdk
+from .fast_json import use_fast_json
 
+
+@traced('notion')
 class NotionUpdater:
     """Updates existing Notion contacts with enriched data"""
 
     def __init__(self, token: str, database_id: str):
-        self.client = Client(auth=token)
+        self.client = Client(auth=token, base_url=os.getenv('NOTION_BASE_URL', 'https://api.notion.com'))
+        instrument_httpx(self.client.client)
+        use_fast_json(self.client)
+        instrument_notion_sdk(self.client)
         self.database_id = database_id
 
     def find_contact(self, contact_name: str, company_name: str) -> Optional[Dict]:
@@ -50,6 +59,7 @@ class NotionUpdater:
             print(f"Error finding contact: {e}")
             return None
 
+    @profiled('notion_payload')
     def enrich_contact(
         self,
         page_id: str,
@@ -113,6 +123,7 @@ class NotionUpdater:
             print(f"Error updating contact: {e}")
             return False
 
+    @profiled('notion_payload')
     def create_contact(
         self,
         contact_name: str,
@@ -238,6 +249,7 @@ class NotionUpdater:
             pass
         return ""
 
+    @profiled('notes_building')
     def _build_enrichment_notes(self, contact_data: Dict, company_data: Dict) -> str:
         """
         Build enrichment notes with all data
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Operations Metrics for Ping CRM
+Per-minute rollups of job throughput, API calls and cache lookups, shared by
+the web app and CLI jobs, for the admin operations dashboard
+"""
+
+import atexit
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .sqlite_pool import get_pool
+from .telemetry import get_telemetry
+
+
+# Buffered rollups are written at most this often (and at exit)
+FLUSH_SECONDS = 15
+
+
+def _minute(moment: datetime = None) -> str:
+    """UTC minute bucket, e.g. 2025-10-18T14:05"""
+    return (moment or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M')
+
+
+class OpsMetrics:
+    """
+    Minute-level operational metrics in SQLite
+
+    Rows processed are recorded by job loops; API calls and cache lookups
+    arrive from src.telemetry as a listener. Everything is buffered in
+    memory and upserted (additively, so several processes can share the
+    database) every FLUSH_SECONDS.
+    """
+
+    def __init__(self, db_path: str = None, retention_days: int = None):
+        """
+        Initialize metrics storage
+
+        Args:
+            db_path: SQLite file (default data/ops_metrics.db)
+            retention_days: Rollups older than this are pruned (OPS_METRICS_RETENTION_DAYS, default 14)
+        """
+        if db_path is None:
+            # Default to data directory
+            db_dir = Path(__file__).parent.parent / 'data'
+            db_dir.mkdir(exist_ok=True)
+            db_path = db_dir / 'ops_metrics.db'
+
+        self.db_path = str(db_path)
+        self.retention_days = retention_days or int(os.getenv('OPS_METRICS_RETENTION_DAYS', 14))
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('ops_metrics', self.init_database)
+
+        self._rows: Dict[tuple, list] = {}    # (minute, job, status) -> [rows, seconds]
+        self._api: Dict[tuple, list] = {}     # (minute, service) -> [calls, errors, rate_limited, retries, seconds]
+        self._cache: Dict[tuple, list] = {}   # (minute, cache) -> [hits, misses]
+        self._queues: Dict[str, Callable[[], int]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def init_database(self):
+        """Create tables if they don't exist and prune old rollups"""
+        cutoff = _minute(datetime.now(timezone.utc) - timedelta(days=self.retention_days))
+        with self.pool.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS job_rows (
+                    minute TEXT NOT NULL,
+                    job TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    rows INTEGER NOT NULL DEFAULT 0,
+                    seconds REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (minute, job, status)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS api_calls (
+                    minute TEXT NOT NULL,
+                    service TEXT NOT NULL,
+                    calls INTEGER NOT NULL DEFAULT 0,
+                    errors INTEGER NOT NULL DEFAULT 0,
+                    rate_limited INTEGER NOT NULL DEFAULT 0,
+                    retries INTEGER NOT NULL DEFAULT 0,
+                    seconds REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (minute, service)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_lookups (
+                    minute TEXT NOT NULL,
+                    cache TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    misses INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (minute, cache)
+                )
+            ''')
+            for table in ('job_rows', 'api_calls', 'cache_lookups'):
+                conn.execute(f'DELETE FROM {table} WHERE minute < ?', (cutoff,))
+
+    # ============================================================
+    # RECORDING
+    # ============================================================
+
+    def record_rows(self, job: str, status: str, seconds: float = 0.0, count: int = 1) -> None:
+        """
+        Count rows finished by a job
+
+        Args:
+            job: Job name ('csv_enrichment', 'enrich_companies', ...)
+            status: Row outcome ('success', 'failed', 'skipped', ...)
+            seconds: Time spent processing the rows
+            count: Number of rows
+        """
+        with self._lock:
+            totals = self._rows.setdefault((_minute(), job, status), [0, 0.0])
+            totals[0] += count
+            totals[1] += seconds
+        self._flush_if_due()
+
+    def span_finished(self, span) -> None:
+        """Telemetry listener: fold a finished API call into the minute rollup"""
+        rate_limited = span.status_codes.get(429, 0)
+        with self._lock:
+            totals = self._api.setdefault((_minute(), span.service), [0, 0, 0, 0, 0.0])
+            # 429s and retries land on the innermost span; calls and time on the outermost
+            totals[2] += rate_limited
+            totals[3] += span.retries
+            if span.outermost:
+                totals[0] += 1
+                totals[1] += 1 if span.error else 0
+                totals[4] += span.duration_ns / 1e9
+        self._flush_if_due()
+
+    def cache_lookup(self, name: str, hit: bool) -> None:
+        """Telemetry listener: count a cache hit or miss"""
+        with self._lock:
+            totals = self._cache.setdefault((_minute(), name), [0, 0])
+            totals[0 if hit else 1] += 1
+        self._flush_if_due()
+
+    def register_queue(self, name: str, depth: Callable[[], int]) -> None:
+        """Report a pipeline queue's current depth on the dashboard"""
+        with self._lock:
+            self._queues[name] = depth
+
+    def _flush_if_due(self) -> None:
+        if time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rollups to SQLite"""
+        with self._lock:
+            rows, self._rows = self._rows, {}
+            api, self._api = self._api, {}
+            cache, self._cache = self._cache, {}
+            self._last_flush = time.monotonic()
+
+        if not (rows or api or cache):
+            return
+
+        with self.pool.connection() as conn:
+            conn.executemany('''
+                INSERT INTO job_rows (minute, job, status, rows, seconds)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (minute, job, status) DO UPDATE SET
+                    rows = rows + excluded.rows,
+                    seconds = seconds + excluded.seconds
+            ''', [(*key, *totals) for key, totals in rows.items()])
+            conn.executemany('''
+                INSERT INTO api_calls (minute, service, calls, errors, rate_limited, retries, seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (minute, service) DO UPDATE SET
+                    calls = calls + excluded.calls,
+                    errors = errors + excluded.errors,
+                    rate_limited = rate_limited + excluded.rate_limited,
+                    retries = retries + excluded.retries,
+                    seconds = seconds + excluded.seconds
+            ''', [(*key, *totals) for key, totals in api.items()])
+            conn.executemany('''
+                INSERT INTO cache_lookups (minute, cache, hits, misses)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (minute, cache) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    misses = misses + excluded.misses
+            ''', [(*key, *totals) for key, totals in cache.items()])
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+
+    def job_throughput(self, minutes: int = 15) -> Dict[str, Dict]:
+        """
+        Per-job totals over the last N minutes
+
+        Returns:
+            {job: {'rows', 'failed', 'rows_per_sec', 'rows_per_min'}}; rows_per_sec
+            is measured over processing time, rows_per_min over the window
+        """
+        self.flush()
+        since = _minute(datetime.now(timezone.utc) - timedelta(minutes=minutes))
+        with self.pool.connection() as conn:
+            result = conn.execute('''
+                SELECT job, SUM(rows), SUM(CASE WHEN status = 'failed' THEN rows ELSE 0 END), SUM(seconds)
+                FROM job_rows WHERE minute >= ? GROUP BY job ORDER BY job
+            ''', (since,)).fetchall()
+
+        return {
+            job: {
+                'rows': rows,
+                'failed': failed,
+                'rows_per_sec': round(rows / seconds, 2) if seconds else 0.0,
+                'rows_per_min': round(rows / minutes, 1)
+            }
+            for job, rows, failed, seconds in result
+        }
+
+    def provider_totals(self, minutes: int = 15) -> Dict[str, Dict]:
+        """Per-service calls, errors, 429s, retries and mean latency over the last N minutes"""
+        self.flush()
+        since = _minute(datetime.now(timezone.utc) - timedelta(minutes=minutes))
+        with self.pool.connection() as conn:
+            result = conn.execute('''
+                SELECT service, SUM(calls), SUM(errors), SUM(rate_limited), SUM(retries), SUM(seconds)
+                FROM api_calls WHERE minute >= ? GROUP BY service ORDER BY service
+            ''', (since,)).fetchall()
+
+        return {
+            service: {
+                'calls': calls,
+                'errors': errors,
+                'rate_limited': rate_limited,
+                'retries': retries,
+                'mean_ms': round(seconds / calls * 1000, 1) if calls else 0.0
+            }
+            for service, calls, errors, rate_limited, retries, seconds in result
+        }
+
+    def cache_ratios(self, hours: int = 24) -> Dict[str, Dict]:
+        """Hit ratio per cache over the last N hours"""
+        self.flush()
+        since = _minute(datetime.now(timezone.utc) - timedelta(hours=hours))
+        with self.pool.connection() as conn:
+            result = conn.execute('''
+                SELECT cache, SUM(hits), SUM(misses) FROM cache_lookups
+                WHERE minute >= ? GROUP BY cache ORDER BY cache
+            ''', (since,)).fetchall()
+
+        return {
+            cache: {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / (hits + misses), 3) if hits + misses else 0.0}
+            for cache, hits, misses in result
+        }
+
+    def queue_depths(self) -> Dict[str, Optional[int]]:
+        """Current depth of every registered queue (None if it couldn't be read)"""
+        with self._lock:
+            queues = dict(self._queues)
+
+        depths = {}
+        for name, depth in queues.items():
+            try:
+                depths[name] = depth()
+            except Exception:
+                depths[name] = None
+        return depths
+
+    def history(self, hours: int = 24) -> Dict[str, List[Dict]]:
+        """
+        Minute rollups for charts
+
+        Returns:
+            {'rows': [{minute, job, rows}], 'api': [{minute, service, calls, mean_ms, rate_limited}],
+             'cache': [{minute, cache, hits, misses}]}
+        """
+        self.flush()
+        since = _minute(datetime.now(timezone.utc) - timedelta(hours=hours))
+        with self.pool.connection() as conn:
+            rows = conn.execute('''
+                SELECT minute, job, SUM(rows) FROM job_rows
+                WHERE minute >= ? GROUP BY minute, job ORDER BY minute
+            ''', (since,)).fetchall()
+            api = conn.execute('''
+                SELECT minute, service, calls, seconds, rate_limited FROM api_calls
+                WHERE minute >= ? ORDER BY minute
+            ''', (since,)).fetchall()
+            cache = conn.execute('''
+                SELECT minute, cache, hits, misses FROM cache_lookups
+                WHERE minute >= ? ORDER BY minute
+            ''', (since,)).fetchall()
+
+        return {
+            'rows': [{'minute': m, 'job': job, 'rows': n} for m, job, n in rows],
+            'api': [
+                {'minute': m, 'service': service, 'calls': calls,
+                 'mean_ms': round(seconds / calls * 1000, 1) if calls else 0.0, 'rate_limited': limited}
+                for m, service, calls, seconds, limited in api
+            ],
+            'cache': [{'minute': m, 'cache': name, 'hits': hits, 'misses': misses} for m, name, hits, misses in cache]
+        }
+
+
+_ops_metrics: Optional[OpsMetrics] = None
+_ops_metrics_lock = threading.Lock()
+
+
+def get_ops_metrics() -> OpsMetrics:
+    """
+    Process-wide metrics store
+
+    The first call subscribes it to src.telemetry and flushes at exit, so
+    only processes that report job rows (the app, CLI jobs) persist metrics.
+    """
+    global _ops_metrics
+    if _ops_metrics is None:
+        with _ops_metrics_lock:
+            if _ops_metrics is None:
+                metrics = OpsMetrics()
+                get_telemetry().add_listener(metrics)
+                atexit.register(metrics.flush)
+                _ops_metrics = metrics
+    return _ops_metrics
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Password Hashing Pool for Ping CRM
+Runs bcrypt off the Streamlit script thread with bounded queueing and latency stats
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import bcrypt
+
+
+# bcrypt cost factor; each +1 doubles hashing time
+DEFAULT_ROUNDS = 12
+
+
+class PasswordQueueFull(Exception):
+    """Raised when too many password operations are already waiting"""
+
+
+class LatencyTracker:
+    """Rolling window of latencies with percentile summaries"""
+
+    def __init__(self, window: int = 1000):
+        self._samples = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one latency sample"""
+        with self._lock:
+            samples = self._samples.setdefault(name, deque(maxlen=self._window))
+            samples.append(seconds)
+
+    def percentiles(self, name: str) -> Dict[str, float]:
+        """p50/p90/p99/max in milliseconds for a metric"""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+
+        if not samples:
+            return {'count': 0, 'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+
+        def pick(q: float) -> float:
+            # Nearest-rank percentile
+            index = min(int(q * len(samples)), len(samples) - 1)
+            return round(samples[index] * 1000, 1)
+
+        return {
+            'count': len(samples),
+            'p50': pick(0.50),
+            'p90': pick(0.90),
+            'p99': pick(0.99),
+            'max': round(samples[-1] * 1000, 1)
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles for every metric"""
+        with self._lock:
+            names = list(self._samples)
+        return {name: self.percentiles(name) for name in names}
+
+
+class PasswordHasher:
+    """
+    bcrypt on a bounded worker pool
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real
+    parallelism without process start-up cost. At most `max_pending`
+    operations may be queued or running; beyond that callers get
+    PasswordQueueFull immediately instead of waiting behind a long queue.
+    """
+
+    def __init__(self, rounds: int = None, workers: int = None, max_pending: int = None):
+        """
+        Initialize hasher
+
+        Args:
+            rounds: bcrypt cost factor (BCRYPT_ROUNDS, default 12)
+            workers: Concurrent hashes (BCRYPT_WORKERS, default CPU count)
+            max_pending: Queued + running limit (BCRYPT_MAX_PENDING, default 4x workers)
+        """
+        self.rounds = rounds or int(os.getenv('BCRYPT_ROUNDS', DEFAULT_ROUNDS))
+        self.workers = workers or int(os.getenv('BCRYPT_WORKERS', os.cpu_count() or 2))
+        self.max_pending = max_pending or int(os.getenv('BCRYPT_MAX_PENDING', self.workers * 4))
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self.latency = LatencyTracker()
+
+    @property
+    def pending(self) -> int:
+        """Operations currently queued or running"""
+        return self._pending
+
+    def _submit(self, name: str, fn, *args):
+        """Run fn on the pool, recording queue wait and run time"""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordQueueFull("Too many sign-ins in progress, please try again in a moment")
+
+        with self._pending_lock:
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            self.latency.record(f'{name}_queue', started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                self.latency.record(f'{name}_work', time.perf_counter() - started)
+
+        try:
+            return self._executor.submit(run).result()
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor"""
+        def work(secret: bytes) -> bytes:
+            return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=self.rounds))
+
+        return self._submit('hash', work, password.encode('utf-8')).decode('utf-8')
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a bcrypt hash"""
+        def work(secret: bytes, hashed: bytes) -> bool:
+            try:
+                return bcrypt.checkpw(secret, hashed)
+            except ValueError:
+                # Malformed hash
+                return False
+
+        return self._submit('verify', work, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if a stored hash uses a different cost factor than configured"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def stats(self) -> Dict:
+        """Configuration, current queue depth and latency percentiles"""
+        return {
+            'rounds': self.rounds,
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'pending': self.pending,
+            'latency_ms': self.latency.summary()
+        }
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_hasher() -> PasswordHasher:
+    """Process-wide hasher shared by every session"""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher()
+    return _hasher
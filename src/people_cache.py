@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+People Search Cache for Ping CRM
+Reuses recent Apollo people searches for the same company and targeting
+filters, so re-running a targeting search doesn't spend credits again
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .records import Contact, json_default
+from .sqlite_pool import get_pool
+from .telemetry import record_cache
+
+
+def tenant_scope(api_key: str) -> str:
+    """Cache namespace for an Apollo account (a hash, so the key isn't stored)"""
+    return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+
+
+def search_key(company_id: str, titles: List[str], seniorities: List[str] = None,
+               locations: List[str] = None) -> str:
+    """Stable key for a people search (filter order doesn't matter)"""
+    return json.dumps([
+        company_id,
+        sorted(titles or []),
+        sorted(seniorities or []),
+        sorted(locations or [])
+    ], separators=(',', ':'))
+
+
+class PeopleSearchCache:
+    """
+    Apollo people-search results per tenant, company and filters, with a TTL
+
+    Entries remember how many people were asked for, so a later search for
+    the same or fewer people is answered from the cache; asking for more
+    goes to Apollo and replaces the entry.
+    """
+
+    def __init__(self, scope: str = '', db_path: str = None, ttl_hours: float = None):
+        """
+        Initialize the cache
+
+        Args:
+            scope: Tenant namespace, normally tenant_scope(apollo_key), so
+                accounts with different Apollo data never share results
+            db_path: SQLite file (default data/people_cache.db)
+            ttl_hours: Hours a search stays fresh (PEOPLE_CACHE_TTL_HOURS, default 6)
+        """
+        if db_path is None:
+            # Default to data directory
+            db_dir = Path(__file__).parent.parent / 'data'
+            db_dir.mkdir(exist_ok=True)
+            db_path = db_dir / 'people_cache.db'
+
+        self.scope = scope
+        self.db_path = str(db_path)
+        self.ttl_hours = ttl_hours if ttl_hours is not None else float(os.getenv('PEOPLE_CACHE_TTL_HOURS', 6))
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('people_cache', self.init_database)
+
+    def init_database(self):
+        """Create tables if they don't exist"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS people_searches (
+                    scope TEXT NOT NULL,
+                    search_key TEXT NOT NULL,
+                    per_page INTEGER NOT NULL,
+                    people TEXT NOT NULL,
+                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (scope, search_key)
+                )
+            ''')
+
+    def _cutoff(self) -> str:
+        moment = datetime.now(timezone.utc) - timedelta(hours=self.ttl_hours)
+        return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+    def get(self, key: str, per_page: int) -> Optional[List[Dict]]:
+        """
+        Cached people for a search, if fresh and large enough
+
+        Args:
+            key: search_key(...) of the filters
+            per_page: Number of people wanted
+
+        Returns:
+            Up to per_page Contact records, or None on a miss
+        """
+        with self.pool.connection() as conn:
+            result = conn.execute('''
+                SELECT per_page, people FROM people_searches
+                WHERE scope = ? AND search_key = ? AND fetched_at >= ?
+            ''', (self.scope, key, self._cutoff())).fetchone()
+
+        people = None
+        if result is not None:
+            cached_per_page, payload = result
+            cached = json.loads(payload)
+            # A short result means Apollo had no more people to give
+            if cached_per_page >= per_page or len(cached) < cached_per_page:
+                people = [Contact.from_dict(person) for person in cached[:per_page]]
+
+        record_cache('people_search', people is not None)
+        return people
+
+    def put(self, key: str, per_page: int, people: List[Dict]) -> None:
+        """Store the people one Apollo search returned (and drop the tenant's stale searches)"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                INSERT INTO people_searches (scope, search_key, per_page, people) VALUES (?, ?, ?, ?)
+                ON CONFLICT (scope, search_key) DO UPDATE SET
+                    per_page = excluded.per_page,
+                    people = excluded.people,
+                    fetched_at = CURRENT_TIMESTAMP
+            ''', (self.scope, key, per_page, json.dumps(people, default=json_default)))
+            conn.execute(
+                'DELETE FROM people_searches WHERE scope = ? AND fetched_at < ?', (self.scope, self._cutoff())
+            )
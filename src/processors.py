@@ -3,7 +3,23 @@ Tier Assignment and Priority Scoring
 Simple rule-based logic for MVP
 """
 
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
+
+from .keyword_classifier import KeywordClassifier
+
+if TYPE_CHECKING:
+    # numpy/pandas are imported by the vectorized methods only; the scalar
+    # assign_tier/calculate_priority callers shouldn't pay for them
+    import pandas as pd
+
+
+def _text_column(df: 'pd.DataFrame', column: str) -> 'pd.Series':
+    """Lowercased text column with missing values as empty strings"""
+    import pandas as pd
+
+    if column not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[column].fillna('').astype(str).str.lower()
 
 
 class TierAssigner:
@@ -14,6 +30,16 @@ class TierAssigner:
     TIER_3_KEYWORDS = ['aco', 'mso', 'provider', 'medical group', 'health system', 'hospital', 'clinic']
     TIER_4_KEYWORDS = ['pharma', 'pharmaceutical', 'biotech', 'drug']
 
+    DEFAULT_TIER = "Tier 3 - Proven Vertical"
+
+    # Checked in order: first matching tier wins
+    TIER_CLASSIFIER = KeywordClassifier([
+        ("Tier 1 - AEP Urgent", TIER_1_KEYWORDS),        # IMOs, Agents, Brokers
+        ("Tier 2 - Strategic", TIER_2_KEYWORDS),         # Health Plans
+        ("Tier 3 - Proven Vertical", TIER_3_KEYWORDS),   # Providers
+        ("Tier 4 - Exploratory", TIER_4_KEYWORDS),       # Pharma
+    ], default=DEFAULT_TIER)
+
     def assign_tier(self, company_data: Dict) -> str:
         """
         Assign tier based on industry and keywords
@@ -29,24 +55,28 @@ class TierAssigner:
 
         search_text = f"{industry} {name}"
 
-        # Check Tier 1 (AEP Urgent - IMOs, Agents, Brokers)
-        if any(kw in search_text for kw in self.TIER_1_KEYWORDS):
-            return "Tier 1 - AEP Urgent"
+        return self.TIER_CLASSIFIER.classify(search_text)
+
+    def assign_tiers(self, companies: 'pd.DataFrame') -> 'pd.Series':
+        """
+        Vectorized assign_tier over many companies
+
+        Args:
+            companies: DataFrame with 'industry' and 'name' columns
 
-        # Check Tier 2 (Strategic - Health Plans)
-        if any(kw in search_text for kw in self.TIER_2_KEYWORDS):
-            return "Tier 2 - Strategic"
+        Returns:
+            Series of tier strings aligned with companies.index
+        """
+        import numpy as np
+        import pandas as pd
 
-        # Check Tier 3 (Providers)
-        if any(kw in search_text for kw in self.TIER_3_KEYWORDS):
-            return "Tier 3 - Proven Vertical"
+        search_text = _text_column(companies, 'industry') + ' ' + _text_column(companies, 'name')
 
-        # Check Tier 4 (Pharma)
-        if any(kw in search_text for kw in self.TIER_4_KEYWORDS):
-            return "Tier 4 - Exploratory"
+        # Company lists repeat industries heavily; classify each distinct string once
+        codes, uniques = pd.factorize(search_text)
+        tiers = np.array([self.TIER_CLASSIFIER.classify(text) for text in uniques], dtype=object)
 
-        # Default to Tier 3
-        return "Tier 3 - Proven Vertical"
+        return pd.Series(tiers[codes], index=companies.index, dtype=object)
 
 
 class PriorityScorer:
@@ -115,3 +145,99 @@ class PriorityScorer:
 
         # Clamp to 1-10
         return max(1, min(10, int(round(score))))
+
+    def calculate_priorities(
+        self,
+        companies: 'pd.DataFrame',
+        emails_found: 'pd.Series',
+        tiers: 'pd.Series'
+    ) -> 'pd.Series':
+        """
+        Vectorized calculate_priority over many companies
+
+        Returns exactly the same scores as calling calculate_priority per company.
+
+        Args:
+            companies: DataFrame with 'employee_count' and 'revenue_range' columns
+            emails_found: Contacts with an email per company (see count_emails),
+                indexed like companies; missing companies count as 0
+            tiers: Assigned tier per company (see TierAssigner.assign_tiers)
+
+        Returns:
+            Series of priority scores (1-10) aligned with companies.index
+        """
+        import numpy as np
+        import pandas as pd
+
+        index = companies.index
+
+        if 'employee_count' in companies.columns:
+            size = companies['employee_count'].fillna(0).to_numpy(dtype=float)
+        else:
+            size = np.zeros(len(index))
+
+        revenue = companies['revenue_range'].fillna('').astype(str) \
+            if 'revenue_range' in companies.columns else pd.Series('', index=index)
+
+        emails = emails_found.reindex(index, fill_value=0).fillna(0).to_numpy(dtype=float)
+        tiers = tiers.reindex(index).fillna('').astype(str)
+
+        # Factor 1: Company size (+0 to +2)
+        size_score = np.select(
+            [size > 5000, size > 1000, size > 200, size > 50, size < 10],
+            [2, 1.5, 1, 0.5, -0.5],
+            default=0
+        )
+
+        # Factor 2: Revenue (+0 to +2)
+        revenue_score = np.select(
+            [
+                revenue.str.contains('$200M+', regex=False).to_numpy(),
+                revenue.str.contains('$50-200M', regex=False).to_numpy(),
+                revenue.str.contains('$10-50M', regex=False).to_numpy(),
+                revenue.str.contains('$1-10M', regex=False).to_numpy(),
+            ],
+            [2, 1.5, 1, 0.5],
+            default=0
+        )
+
+        # Factor 3: Contact quality (+0 to +2)
+        email_score = np.select(
+            [emails >= 3, emails >= 2, emails >= 1],
+            [2, 1.5, 1],
+            default=-0.5
+        )
+
+        # Factor 4: Tier boost
+        tier_score = np.select(
+            [
+                tiers.str.contains('Tier 1', regex=False).to_numpy(),
+                tiers.str.contains('Tier 2', regex=False).to_numpy(),
+            ],
+            [2, 1],
+            default=0
+        )
+
+        # Same addition order as calculate_priority so floats round identically
+        score = 5.0 + size_score + revenue_score + email_score + tier_score
+
+        # np.round and round() both round half to even; clamp to 1-10
+        return pd.Series(
+            np.clip(np.round(score), 1, 10).astype(int),
+            index=index
+        )
+
+    @staticmethod
+    def count_emails(contacts: 'pd.DataFrame', by: str = 'company_id') -> 'pd.Series':
+        """
+        Per-company contact aggregate used by calculate_priorities
+
+        Args:
+            contacts: One row per contact with an 'email' column and a company key
+            by: Column identifying the company
+
+        Returns:
+            Series of contacts-with-email counts indexed by company key
+        """
+        has_email = contacts['email'].notna() & (contacts['email'].astype(str) != '')
+        return has_email.groupby(contacts[by]).sum()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Run Profiling for Ping CRM CLI Scripts
+cProfile or stack-sampling profiles plus a wall-clock breakdown per pipeline
+step (API wait, JSON decode, normalization, notes and Notion payload building)
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Pipeline steps shown in the breakdown, in pipeline order
+STEPS = ['api_wait', 'json_decode', 'normalization', 'notes_building', 'notion_payload', 'rate_limit_sleep']
+
+# Default stack-sampling interval (seconds)
+SAMPLE_INTERVAL = 0.005
+
+# The running profile (one per process); steps are free when it's None
+_active: Optional['RunProfile'] = None
+_NULL_STEP = nullcontext()
+
+
+class _Step:
+    """Times one step, excluding time spent in nested steps"""
+
+    __slots__ = ('profile', 'name', 'started', 'children')
+
+    def __init__(self, profile: 'RunProfile', name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.children = 0.0
+        self.profile._stack().append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        stack = self.profile._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        self.profile._add(self.name, elapsed - self.children)
+        return False
+
+
+class StackSampler:
+    """Samples the main thread's call stack on a background thread"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self._thread_id = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Collapsed stacks (flamegraph.pl / speedscope format)"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def top_frames(self, limit: int = 30) -> List[tuple]:
+        """Leaf frames by sample count"""
+        leaves = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+class RunProfile:
+    """
+    Profile one script run
+
+    mode 'cprofile' records every call (exact counts, some overhead);
+    mode 'sample' snapshots the main thread's stack every few milliseconds
+    (near-zero overhead, statistical). Step timings are collected in both.
+    """
+
+    def __init__(self, name: str, mode: str = 'cprofile', output_dir: str = None):
+        """
+        Args:
+            name: Script name, used for the report directory
+            mode: 'cprofile' or 'sample'
+            output_dir: Parent directory for reports (default data/profiles)
+        """
+        if mode not in ('cprofile', 'sample'):
+            raise ValueError(f"Unknown profile mode: {mode} (use cprofile or sample)")
+
+        self.name = name
+        self.mode = mode
+        base = Path(output_dir) if output_dir else Path(__file__).parent.parent / 'data' / 'profiles'
+        self.output_dir = base / f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+        self.steps: Dict[str, List[float]] = {}  # name -> [seconds, calls]
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiler = None
+        self._sampler = None
+        self._started = 0.0
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            totals = self.steps.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def step(self, name: str) -> _Step:
+        return _Step(self, name)
+
+    def __enter__(self):
+        global _active
+        _active = self
+        if self.mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampler = StackSampler()
+            self._sampler.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        self.wall_seconds = time.perf_counter() - self._started
+        if self._profiler:
+            self._profiler.disable()
+        if self._sampler:
+            self._sampler.stop()
+        _active = None
+        self.write_reports()
+        return False
+
+    def breakdown(self) -> Dict:
+        """Wall-clock seconds, calls and share per step; 'other' is everything untracked"""
+        with self._lock:
+            steps = {name: list(totals) for name, totals in self.steps.items()}
+
+        ordered = [name for name in STEPS if name in steps] + sorted(set(steps) - set(STEPS))
+        tracked = sum(seconds for seconds, _ in steps.values())
+        wall = self.wall_seconds or tracked
+
+        result = {
+            name: {
+                'seconds': round(steps[name][0], 4),
+                'calls': steps[name][1],
+                'share': round(steps[name][0] / wall, 4) if wall else 0.0
+            }
+            for name in ordered
+        }
+        other = max(wall - tracked, 0.0)
+        result['other'] = {'seconds': round(other, 4), 'calls': 0, 'share': round(other / wall, 4) if wall else 0.0}
+        return result
+
+    def summary(self) -> str:
+        """Plain-text step breakdown for the console"""
+        lines = [f"Step breakdown ({self.wall_seconds:.2f}s wall, {self.mode}) - reports in {self.output_dir}"]
+        for name, stats in self.breakdown().items():
+            calls = f"{stats['calls']} calls" if stats['calls'] else ''
+            lines.append(f"  {name:<18}{stats['seconds']:>9.3f}s {stats['share']:>7.1%}  {calls}")
+        return '\n'.join(lines)
+
+    def write_reports(self) -> Path:
+        """Write the profile and step breakdown into output_dir"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        (self.output_dir / 'steps.json').write_text(json.dumps({
+            'script': self.name,
+            'mode': self.mode,
+            'wall_seconds': round(self.wall_seconds, 4),
+            'steps': self.breakdown()
+        }, indent=2))
+
+        if self._profiler:
+            self._profiler.dump_stats(str(self.output_dir / 'profile.prof'))
+            text = io.StringIO()
+            pstats.Stats(self._profiler, stream=text).sort_stats('cumulative').print_stats(40)
+            (self.output_dir / 'profile.txt').write_text(text.getvalue())
+
+        if self._sampler:
+            (self.output_dir / 'stacks.folded').write_text(self._sampler.folded())
+            total = sum(self._sampler.samples.values()) or 1
+            lines = [f"{count:>7} {count / total:6.1%}  {frame}" for frame, count in self._sampler.top_frames()]
+            (self.output_dir / 'profile.txt').write_text(
+                f"{total} samples every {self._sampler.interval * 1000:.0f} ms (leaf frames)\n\n" + '\n'.join(lines) + '\n'
+            )
+
+        return self.output_dir
+
+
+def step(name: str):
+    """Context manager timing a pipeline step (no-op unless a profile is running)"""
+    profile = _active
+    if profile is None:
+        return _NULL_STEP
+    return profile.step(name)
+
+
+def profiled(name: str):
+    """Decorator timing every call of a function as a pipeline step"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = _active
+            if profile is None:
+                return fn(*args, **kwargs)
+            with profile.step(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instrument_notion_sdk(client):
+    """Time a notion_client.Client's HTTP round trips and JSON parsing as steps"""
+    http = client.client
+    http.send = profiled('api_wait')(http.send)
+    client._parse_response = profiled('json_decode')(client._parse_response)
+    return client
+
+
+def profile_from_argv(name: str, argv: List[str] = None):
+    """
+    Build a profile from `--profile[=cprofile|sample]` and `--profile-dir DIR`
+
+    The options are removed from argv (sys.argv by default) so scripts
+    can keep parsing positional arguments as before.
+
+    Returns:
+        RunProfile, or a no-op context manager if --profile wasn't given
+    """
+    argv = sys.argv if argv is None else argv
+    mode = None
+    output_dir = None
+
+    for arg in list(argv[1:]):
+        if arg == '--profile' or arg.startswith('--profile='):
+            mode = arg.partition('=')[2] or 'cprofile'
+            argv.remove(arg)
+
+    if '--profile-dir' in argv:
+        index = argv.index('--profile-dir')
+        output_dir = argv[index + 1]
+        del argv[index:index + 2]
+
+    if mode is None:
+        return nullcontext()
+    return RunProfile(name, mode=mode, output_dir=output_dir)
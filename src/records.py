@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Apollo Record Types for Ping CRM
+Slotted Contact and Company records that read like the dicts they replace
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional
+
+
+class Record(Mapping):
+    """
+    Base for slotted records
+
+    Fields live in __slots__, so a record has no per-instance dict. Reads
+    work as on a dict (record['name'], record.get('email'), dict(record),
+    {**record}); records are read-only. Use to_dict() or json_default to
+    serialize.
+    """
+
+    __slots__ = ()
+    _fields = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._fields else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'Record':
+        """Rebuild a record from its dict form (unknown keys are dropped)"""
+        return cls(**{key: value for key, value in data.items() if key in cls._fields})
+
+
+class Contact(Record):
+    """A person as normalized from Apollo"""
+
+    __slots__ = (
+        'apollo_id', 'name', 'first_name', 'last_name', 'title', 'seniority',
+        'email', 'phone', 'linkedin_url', 'city', 'state', 'country'
+    )
+    _fields = frozenset(__slots__)
+
+    def __init__(self, apollo_id: Optional[str] = None, name: str = '', first_name: str = '',
+                 last_name: str = '', title: str = '', seniority: str = '', email: Optional[str] = None,
+                 phone: Optional[str] = None, linkedin_url: str = '', city: str = '', state: str = '',
+                 country: str = ''):
+        self.apollo_id = apollo_id
+        self.name = name
+        self.first_name = first_name
+        self.last_name = last_name
+        self.title = title
+        self.seniority = seniority
+        self.email = email
+        self.phone = phone
+        self.linkedin_url = linkedin_url
+        self.city = city
+        self.state = state
+        self.country = country
+
+
+class Company(Record):
+    """An organization as normalized from Apollo"""
+
+    __slots__ = (
+        'apollo_id', 'name', 'domain', 'linkedin_url', 'industry', 'employee_count',
+        'revenue_range', 'location', 'technologies', 'funding_stage'
+    )
+    _fields = frozenset(__slots__)
+
+    def __init__(self, apollo_id: Optional[str] = None, name: str = '', domain: str = '',
+                 linkedin_url: str = '', industry: str = '', employee_count: int = 0,
+                 revenue_range: str = 'Unknown', location: str = 'Unknown',
+                 technologies: Optional[List[str]] = None, funding_stage: str = 'Unknown'):
+        self.apollo_id = apollo_id
+        self.name = name
+        self.domain = domain
+        self.linkedin_url = linkedin_url
+        self.industry = industry
+        self.employee_count = employee_count
+        self.revenue_range = revenue_range
+        self.location = location
+        self.technologies = technologies
+        self.funding_stage = funding_stage
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default: records as their dicts, anything else as str"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
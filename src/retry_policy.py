@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Retry Policy for Ping CRM API Clients
+Retries only transient failures of idempotent calls, honors Retry-After and
+fails fast through a per-service circuit breaker while a provider is down
+"""
+
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import httpx
+import requests
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from .retry_queue import classify_error
+
+
+# Error classes worth retrying in-process (see retry_queue.classify_error)
+RETRYABLE_ERROR_CLASSES = {'rate_limited', 'conflict', 'server_error', 'timeout', 'connection'}
+
+# Longest Retry-After we'll sleep through; longer waits go to the retry queue
+MAX_RETRY_AFTER_SECONDS = 60
+
+# Attempts per call, including the first
+MAX_ATTEMPTS = 3
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open"""
+
+    def __init__(self, service: str, retry_in: float):
+        super().__init__(f"{service} is unavailable (circuit open, retrying in {retry_in:.0f}s)")
+        self.service = service
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider
+
+    After `failure_threshold` outage failures in a row (5xx, timeouts,
+    connection errors) the circuit opens and every call fails fast for
+    `reset_seconds`. Then one trial call is let through: success closes the
+    circuit, failure opens it again. Rate limits and 4xx don't count - the
+    provider is up.
+    """
+
+    def __init__(self, service: str, failure_threshold: int = None, reset_seconds: float = None):
+        """
+        Args:
+            service: Provider name ('apollo', 'notion')
+            failure_threshold: Failures that open the circuit (CIRCUIT_FAILURE_THRESHOLD, default 5)
+            reset_seconds: Seconds before a trial call (CIRCUIT_RESET_SECONDS, default 30)
+        """
+        self.service = service
+        self.failure_threshold = failure_threshold or int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+        self.reset_seconds = reset_seconds or float(os.getenv('CIRCUIT_RESET_SECONDS', 30))
+        self.failures = 0
+        self.opened_at = None
+        # Token of the half-open trial call in flight (None when there isn't one)
+        self._trial_running = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'"""
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return 'open'
+            return 'half_open'
+
+    def before_call(self) -> Optional[object]:
+        """
+        Raise CircuitOpenError unless a call may go through now
+
+        Returns:
+            A trial token if this call is the half-open trial (pass it to
+            release() once the call is over), else None
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return None
+            waited = time.monotonic() - self.opened_at
+            if waited >= self.reset_seconds and not self._trial_running:
+                self._trial_running = object()
+                return self._trial_running
+            raise CircuitOpenError(self.service, max(self.reset_seconds - waited, 0))
+
+    def release(self, trial: Optional[object]) -> None:
+        """End a trial call that never recorded an outcome, so the next call can try"""
+        with self._lock:
+            if trial is not None and self._trial_running is trial:
+                self._trial_running = None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    print(f"{self.service} circuit open after {self.failures} failures")
+                self.opened_at = time.monotonic()
+                self._trial_running = None
+
+    def record(self, error: Optional[BaseException] = None, status: Optional[int] = None) -> None:
+        """Count a call's outcome (an exception, or the HTTP status it returned)"""
+        if error is not None:
+            outage = classify_error(error)[0] in ('server_error', 'timeout', 'connection')
+        else:
+            outage = status is not None and status >= 500
+        if outage:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(service: str) -> CircuitBreaker:
+    """Process-wide breaker for a provider (shared by every client and worker)"""
+    breaker = _breakers.get(service)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(service)
+            if breaker is None:
+                breaker = _breakers[service] = CircuitBreaker(service)
+    return breaker
+
+
+# ============================================================
+# CLASSIFICATION
+# ============================================================
+
+def retry_after_seconds(error_or_response) -> Optional[float]:
+    """Seconds from a Retry-After header (on a response, or an error carrying one)"""
+    headers = getattr(error_or_response, 'headers', None)
+    if headers is None:
+        headers = getattr(getattr(error_or_response, 'response', None), 'headers', None)
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for transient failures worth retrying now (never 4xx or an open circuit)"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if not isinstance(error, (requests.RequestException, httpx.HTTPError)):
+        return False
+    if classify_error(error)[0] not in RETRYABLE_ERROR_CLASSES:
+        return False
+    delay = retry_after_seconds(error)
+    return delay is None or delay <= MAX_RETRY_AFTER_SECONDS
+
+
+class wait_retry_after:
+    """tenacity wait: the server's Retry-After when given, else exponential backoff"""
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback or wait_exponential(min=1, max=10)
+
+    def __call__(self, retry_state) -> float:
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after_seconds(error) if error is not None else None
+        return delay if delay is not None else self.fallback(retry_state)
+
+
+def api_retry(attempts: int = MAX_ATTEMPTS):
+    """
+    tenacity decorator for idempotent API calls
+
+    Retries only transient errors (rate limits, 5xx, timeouts, connection
+    failures), waits as long as Retry-After asks, and re-raises the last
+    error instead of a RetryError.
+    """
+    return retry(
+        wait=wait_retry_after(),
+        stop=stop_after_attempt(attempts),
+        retry=retry_if_exception(is_retryable),
+        reraise=True
+    )
+
+
+# ============================================================
+# HTTPX (Notion SDK)
+# ============================================================
+
+def backoff_seconds(attempt: int) -> float:
+    """Exponential wait after a failed attempt (1s, 2s, 4s ... capped at 10s)"""
+    return min(2 ** (attempt - 1), 10)
+
+
+def _idempotent(request: httpx.Request) -> bool:
+    """Reads and property updates can be repeated; page creation can't"""
+    return request.method in ('GET', 'PATCH', 'DELETE') or request.url.path.endswith('/query')
+
+
+def guard_httpx(client: httpx.Client, service: str, attempts: int = MAX_ATTEMPTS) -> httpx.Client:
+    """
+    Put an httpx.Client's requests behind the service's circuit breaker
+
+    Idempotent requests that hit a rate limit or an outage are retried
+    (honoring Retry-After); everything else is returned as-is for the SDK
+    to raise.
+    """
+    breaker = get_breaker(service)
+    send = client.send
+
+    def guarded_send(request, *args, **kwargs):
+        retryable = _idempotent(request)
+        attempt = 1
+        while True:
+            trial = breaker.before_call()
+            try:
+                response = send(request, *args, **kwargs)
+            except httpx.TransportError as e:
+                breaker.record(error=e)
+                if not retryable or attempt >= attempts:
+                    raise
+                delay = None
+            else:
+                breaker.record(status=response.status_code)
+                if not (retryable and attempt < attempts and response.status_code in (429, 500, 502, 503, 504)):
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is not None and delay > MAX_RETRY_AFTER_SECONDS:
+                    return response
+                response.close()
+            finally:
+                # Any other exception must not leave the circuit stuck half-open
+                breaker.release(trial)
+
+            time.sleep(delay if delay is not None else backoff_seconds(attempt))
+            attempt += 1
+
+    client.send = guarded_send
+    return client
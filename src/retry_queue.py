@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Retry Queue for Ping CRM
+Persists failed enrichment work items and retries them later with backoff
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .sqlite_pool import get_pool
+
+
+# HTTP statuses worth retrying later (timeouts, conflicts, rate limits, outages)
+TRANSIENT_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Error classes that will never succeed on retry
+PERMANENT_ERROR_CLASSES = {'client_error', 'not_found'}
+
+# Connections that broke mid-response (a body cut short or garbled, a
+# protocol error) - the next attempt usually gets through. Matched by
+# (package, class name) along the exception's MRO so this module doesn't
+# import the HTTP libraries (it loads before the login screen).
+TRANSIENT_TRANSPORT_ERRORS = {
+    ('requests', 'ChunkedEncodingError'),
+    ('requests', 'ContentDecodingError'),
+    ('urllib3', 'ProtocolError'),
+    ('httpx', 'NetworkError'),
+    ('httpx', 'RemoteProtocolError'),
+    ('httpx', 'ProxyError'),
+    ('httpx', 'DecodingError'),
+}
+
+
+def classify_error(error: Exception) -> Tuple[str, bool]:
+    """
+    Classify an exception raised by Apollo, Notion or the LLM SDKs
+
+    Args:
+        error: Exception caught in the enrichment pipeline
+
+    Returns:
+        Tuple of (error_class, retryable)
+    """
+    # tenacity wraps the last failure in a RetryError once attempts run out
+    last_attempt = getattr(error, 'last_attempt', None)
+    if last_attempt is not None and last_attempt.exception() is not None:
+        error = last_attempt.exception()
+
+    status = _status_code(error)
+    if status == 429:
+        return 'rate_limited', True
+    if status == 409:
+        return 'conflict', True
+    if status is not None and status >= 500:
+        return 'server_error', True
+    if status in TRANSIENT_STATUSES:
+        return 'timeout', True
+    if status is not None and 400 <= status < 500:
+        return 'client_error', False
+
+    error_name = type(error).__name__
+    if isinstance(error, TimeoutError) or 'Timeout' in error_name:
+        return 'timeout', True
+    if isinstance(error, ConnectionError) or 'Connection' in error_name:
+        return 'connection', True
+    if _is_transport_error(error):
+        return 'connection', True
+    if 'CircuitOpen' in error_name:
+        # The provider is down (see retry_policy.CircuitBreaker)
+        return 'circuit_open', True
+
+    return 'unknown', True
+
+
+def _is_transport_error(error: Exception) -> bool:
+    """Whether the error is (a subclass of) one of TRANSIENT_TRANSPORT_ERRORS"""
+    return any(
+        (cls.__module__.partition('.')[0], cls.__name__) in TRANSIENT_TRANSPORT_ERRORS
+        for cls in type(error).__mro__
+    )
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Extract HTTP status from requests, httpx, Notion or OpenAI errors"""
+    response = getattr(error, 'response', None)
+    for candidate in (
+        getattr(response, 'status_code', None),
+        getattr(error, 'status', None),
+        getattr(error, 'status_code', None),
+    ):
+        if isinstance(candidate, int):
+            return candidate
+    return None
+
+
+def _timestamp(moment: datetime) -> str:
+    """Format a datetime the same way as SQLite CURRENT_TIMESTAMP (UTC)"""
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class RetryQueue:
+    """Dead-letter queue for failed contact and company enrichment rows"""
+
+    BASE_DELAY_SECONDS = 60
+    MAX_DELAY_SECONDS = 6 * 60 * 60
+    MAX_ATTEMPTS = 6
+
+    def __init__(self, db_path: str = None):
+        """Initialize queue storage"""
+        if db_path is None:
+            # Default to data directory
+            db_dir = Path(__file__).parent.parent / 'data'
+            db_dir.mkdir(exist_ok=True)
+            db_path = db_dir / 'retry_queue.db'
+
+        self.db_path = str(db_path)
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('retry_queue', self.init_database)
+
+    def init_database(self):
+        """Create tables if they don't exist"""
+        self._execute('''
+            CREATE TABLE IF NOT EXISTS retry_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                owner TEXT NOT NULL DEFAULT '',
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                error_class TEXT,
+                error_message TEXT,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                status TEXT NOT NULL DEFAULT 'pending',
+                next_attempt_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (owner, kind, payload)
+            )
+        ''', ())
+
+    def backoff_delay(self, attempts: int) -> timedelta:
+        """Exponential backoff: 1 min, 2 min, 4 min ... capped at 6 hours"""
+        seconds = self.BASE_DELAY_SECONDS * (2 ** max(attempts - 1, 0))
+        return timedelta(seconds=min(seconds, self.MAX_DELAY_SECONDS))
+
+    def enqueue(self, kind: str, payload: Dict, error_class: str,
+                error_message: str, owner: str = '') -> None:
+        """
+        Record a failed work item
+
+        A work item that is still pending keeps its attempt count and backoff
+        and only has its error details refreshed. One that had been resolved
+        or given up on (dead) failed anew, so it starts over like a new item
+        (first attempt, first backoff delay).
+        """
+        now = datetime.now(timezone.utc)
+        payload_json = json.dumps(payload, sort_keys=True)
+        status = 'dead' if error_class in PERMANENT_ERROR_CLASSES else 'pending'
+
+        self._execute('''
+            INSERT INTO retry_queue (
+                owner, kind, payload, error_class, error_message,
+                status, next_attempt_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (owner, kind, payload) DO UPDATE SET
+                attempts = CASE WHEN retry_queue.status = 'pending'
+                    THEN retry_queue.attempts ELSE excluded.attempts END,
+                next_attempt_at = CASE WHEN retry_queue.status = 'pending'
+                    THEN retry_queue.next_attempt_at ELSE excluded.next_attempt_at END,
+                error_class = excluded.error_class,
+                error_message = excluded.error_message,
+                status = excluded.status,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (
+            owner, kind, payload_json, error_class, error_message,
+            status, _timestamp(now + self.backoff_delay(1))
+        ))
+
+    def due(self, owner: str = None, limit: int = 50) -> List[Dict]:
+        """Get pending items whose backoff has elapsed"""
+        query = '''
+            SELECT * FROM retry_queue
+            WHERE status = 'pending' AND next_attempt_at <= ?
+        '''
+        params = [_timestamp(datetime.now(timezone.utc))]
+
+        if owner is not None:
+            query += ' AND owner = ?'
+            params.append(owner)
+
+        query += ' ORDER BY next_attempt_at LIMIT ?'
+        params.append(limit)
+
+        return self._fetch(query, params)
+
+    def list_items(self, status: str = None, owner: str = None) -> List[Dict]:
+        """List queued items, newest first"""
+        query = 'SELECT * FROM retry_queue WHERE 1 = 1'
+        params = []
+
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+        if owner is not None:
+            query += ' AND owner = ?'
+            params.append(owner)
+
+        query += ' ORDER BY updated_at DESC'
+        return self._fetch(query, params)
+
+    def counts(self, owner: str = None) -> Dict[str, int]:
+        """Count items per status"""
+        query = 'SELECT status, COUNT(*) FROM retry_queue'
+        params = []
+
+        if owner is not None:
+            query += ' WHERE owner = ?'
+            params.append(owner)
+
+        query += ' GROUP BY status'
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        counts = {'pending': 0, 'resolved': 0, 'dead': 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def mark_resolved(self, item_id: int) -> None:
+        """Mark an item as successfully replayed"""
+        self._execute('''
+            UPDATE retry_queue
+            SET status = 'resolved', updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (item_id,))
+
+    def mark_failed(self, item: Dict, error_class: str, error_message: str) -> None:
+        """Record another failed attempt and schedule the next one"""
+        attempts = item['attempts'] + 1
+
+        if error_class in PERMANENT_ERROR_CLASSES or attempts >= self.MAX_ATTEMPTS:
+            status = 'dead'
+        else:
+            status = 'pending'
+
+        next_attempt = datetime.now(timezone.utc) + self.backoff_delay(attempts)
+
+        self._execute('''
+            UPDATE retry_queue
+            SET attempts = ?, status = ?, error_class = ?, error_message = ?,
+                next_attempt_at = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (attempts, status, error_class, error_message,
+              _timestamp(next_attempt), item['id']))
+
+    def requeue(self, item_id: int = None, status: str = 'dead', owner: str = None) -> None:
+        """
+        Make items due immediately (manual replay)
+
+        Args:
+            item_id: Single item to requeue; if omitted, all items with `status`
+            status: Status to requeue when no item_id is given
+            owner: Restrict bulk requeue to one owner
+        """
+        now = _timestamp(datetime.now(timezone.utc))
+
+        if item_id is not None:
+            self._execute('''
+                UPDATE retry_queue
+                SET status = 'pending', next_attempt_at = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (now, item_id))
+            return
+
+        query = '''
+            UPDATE retry_queue
+            SET status = 'pending', next_attempt_at = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE status = ?
+        '''
+        params = [now, status]
+        if owner is not None:
+            query += ' AND owner = ?'
+            params.append(owner)
+
+        self._execute(query, params)
+
+    def purge(self, status: str = 'resolved', owner: str = None) -> None:
+        """Delete items with the given status"""
+        query = 'DELETE FROM retry_queue WHERE status = ?'
+        params = [status]
+        if owner is not None:
+            query += ' AND owner = ?'
+            params.append(owner)
+
+        self._execute(query, params)
+
+    def process_due(
+        self,
+        handlers: Dict[str, Callable[[Dict], Dict]],
+        owner: str = None,
+        limit: int = 50
+    ) -> Dict[str, int]:
+        """
+        Replay due items through their handlers
+
+        Args:
+            handlers: Map of item kind to a callable taking the payload and
+                returning a pipeline result dict ('status', 'message', 'error_class')
+            owner: Only process this owner's items
+            limit: Maximum number of items to replay
+
+        Returns:
+            Summary counts of resolved and failed replays
+        """
+        summary = {'resolved': 0, 'failed': 0}
+
+        for item in self.due(owner=owner, limit=limit):
+            handler = handlers.get(item['kind'])
+            if handler is None:
+                continue
+
+            try:
+                result = handler(item['payload'])
+            except Exception as e:
+                error_class, _ = classify_error(e)
+                result = {'status': 'failed', 'message': str(e), 'error_class': error_class}
+
+            if result['status'] in ('success', 'skipped'):
+                self.mark_resolved(item['id'])
+                summary['resolved'] += 1
+            else:
+                self.mark_failed(
+                    item,
+                    result.get('error_class', 'unknown'),
+                    result.get('message', '')
+                )
+                summary['failed'] += 1
+
+        return summary
+
+    def _fetch(self, query: str, params) -> List[Dict]:
+        """Run a SELECT and decode rows into dicts"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.execute(query, params).fetchall()
+
+        items = []
+        for row in rows:
+            item = dict(row)
+            item['payload'] = json.loads(item['payload'])
+            items.append(item)
+        return items
+
+    def _execute(self, query: str, params) -> None:
+        """Run a write statement"""
+        with self.pool.connection() as conn:
+            conn.execute(query, params)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Request Coalescing for Ping CRM
+Concurrent identical lookups share one in-flight API call instead of each
+making their own
+"""
+
+import copy
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from .telemetry import record_cache
+
+
+class _Call:
+    """One in-flight call and the waiters sharing it"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Merges concurrent calls with the same key into one
+
+    The first caller runs the function; callers arriving while it runs wait
+    and get a copy of its result (or its exception). Nothing is remembered
+    once the call finishes - this removes duplicate traffic, caching is the
+    job of the stores behind it.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Label for the shared-call ratio in telemetry (e.g. 'apollo_inflight')
+        """
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the identical call already running
+
+        Args:
+            key: Identity of the call (same key = same request)
+            fn: Function making the request
+
+        Returns:
+            fn's result (waiters get a deep copy, so callers can't mutate each other's)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        record_cache(self.name, not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def coalesced(key: Callable[..., Hashable]):
+    """
+    Method decorator: concurrent calls with the same key share one request
+
+    The instance needs a `singleflight` attribute (a SingleFlight).
+
+    Args:
+        key: Builds the call's key from the method's arguments (without self)
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            call_key = (fn.__name__, key(*args, **kwargs))
+            return self.singleflight.do(call_key, lambda: fn(self, *args, **kwargs))
+        return wrapper
+    return decorate
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Pool for Ping CRM
+Shared, thread-safe WAL connections for the local SQLite stores
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+
+# Prepared statements kept per connection (sqlite3's statement cache)
+STATEMENT_CACHE_SIZE = 128
+
+# Seconds a writer waits on a locked database before raising
+BUSY_TIMEOUT = 30.0
+
+
+class ConnectionPool:
+    """
+    Pool of reusable connections to one SQLite file
+
+    Connections are opened once with WAL journaling, so readers never block
+    the single writer and vice versa, and reused across threads (each
+    connection is only ever checked out by one thread at a time). Streamlit
+    runs every rerun on a new thread, so a pool beats thread-local caching.
+    """
+
+    def __init__(self, db_path: str, max_idle: int = 8):
+        """
+        Initialize pool (connections are opened lazily)
+
+        Args:
+            db_path: SQLite file path
+            max_idle: Connections kept open between uses; extras are closed
+        """
+        self.db_path = str(db_path)
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+        self._lock = threading.Lock()
+        self._schemas = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent use"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        # WAL makes NORMAL durable across application crashes
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for one transaction
+
+        Commits when the block exits normally, rolls back on exception.
+
+        Example:
+            with pool.connection() as conn:
+                conn.execute('UPDATE users SET ...', params)
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            with conn:
+                yield conn
+        except Exception:
+            self._release(conn)
+            raise
+        self._release(conn)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, closing it if the pool is full"""
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def ensure_schema(self, name: str, init: Callable[[], None]) -> None:
+        """Run a schema initializer once per process"""
+        if name in self._schemas:
+            return
+        with self._lock:
+            if name not in self._schemas:
+                init()
+                self._schemas.add(name)
+
+    def close(self) -> None:
+        """Close all idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path) -> ConnectionPool:
+    """
+    Shared pool for a database file
+
+    Every store pointing at the same file gets the same pool, so creating a
+    DatabaseManager per request costs nothing after the first.
+    """
+    key = str(Path(db_path).resolve())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, ConnectionPool(key))
+    return pool
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+API Call Telemetry for Ping CRM
+Per-call spans and latency histograms for Apollo, Notion and LLM clients,
+tagged by job and user, with Prometheus text, JSON and OTLP span export
+"""
+
+import contextvars
+import functools
+import os
+import random
+import threading
+import time
+import types
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+# Latency histogram bucket upper bounds (seconds), Prometheus style
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# OTLP SpanKind / StatusCode values
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Job/user tags for the current thread or task
+_tags: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar('telemetry_tags', default={})
+# Innermost traced call, so HTTP hooks and nested calls find their parent
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('telemetry_span', default=None)
+
+
+# Read once; tracing stays on unless TELEMETRY_ENABLED=false
+ENABLED = os.getenv('TELEMETRY_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+
+
+class Span:
+    """One traced client method call"""
+
+    __slots__ = (
+        'service', 'method', 'job', 'user', 'trace_id', 'span_id', 'parent',
+        'start_ns', 'duration_ns', 'http_requests', 'status_code', 'status_codes',
+        'bytes', 'retries', 'error'
+    )
+
+    def __init__(self, service: str, method: str, parent: Optional['Span']):
+        tags = _tags.get()
+        self.service = service
+        self.method = method
+        self.job = tags.get('job', '')
+        self.user = tags.get('user', '')
+        self.parent = parent
+        # Ids stay ints until export
+        self.trace_id = parent.trace_id if parent else random.getrandbits(128)
+        self.span_id = random.getrandbits(64)
+        self.start_ns = time.time_ns()
+        self.duration_ns = 0
+        self.http_requests = 0
+        self.status_code = None
+        self.status_codes = {}
+        self.bytes = 0
+        self.retries = 0
+        self.error = None
+
+    def to_otlp(self) -> Dict:
+        """OTLP/JSON span representation"""
+        attributes = {
+            'rpc.service': self.service,
+            'rpc.method': self.method,
+            'ping.job': self.job,
+            'enduser.id': self.user,
+            'http.request_count': self.http_requests,
+            'http.response.body.size': self.bytes,
+            'ping.retries': self.retries,
+        }
+        if self.status_code is not None:
+            attributes['http.response.status_code'] = self.status_code
+        if self.error:
+            attributes['error.type'] = self.error
+
+        span = {
+            'traceId': f'{self.trace_id:032x}',
+            'spanId': f'{self.span_id:016x}',
+            'name': f'{self.service}.{self.method}',
+            'kind': SPAN_KIND_CLIENT,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.start_ns + self.duration_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in attributes.items()],
+            'status': {'code': STATUS_ERROR, 'message': self.error} if self.error else {'code': STATUS_OK},
+        }
+        if self.parent:
+            span['parentSpanId'] = f'{self.parent.span_id:016x}'
+        return span
+
+    @property
+    def outermost(self) -> bool:
+        """False for calls nested in the same service (e.g. search_person_by_name -> search_company)"""
+        return self.parent is None or self.parent.service != self.service
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class _Series:
+    """Aggregates for one (service, method, job, user) combination"""
+
+    __slots__ = ('calls', 'errors', 'retries', 'bytes', 'seconds', 'buckets', 'status_codes')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last is +Inf
+        self.status_codes = {}
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile (seconds) by interpolating within histogram buckets"""
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            if seen + count >= rank and count:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return BUCKETS[-1]
+
+
+class Telemetry:
+    """Process-wide metric series plus a ring buffer of recent spans"""
+
+    def __init__(self, span_buffer: int = 2048):
+        self._series: Dict[tuple, _Series] = {}
+        self._service_seconds: Dict[str, float] = {}
+        self._caches: Dict[str, list] = {}  # name -> [hits, misses]
+        self._spans = deque(maxlen=span_buffer)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener) -> None:
+        """
+        Forward events to a listener (e.g. a persistent metrics store)
+
+        Args:
+            listener: Object with span_finished(span) and cache_lookup(name, hit)
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def record(self, span: Span) -> None:
+        """Fold a finished span into the metrics"""
+        seconds = span.duration_ns / 1e9
+        key = (span.service, span.method, span.job, span.user)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.calls += 1
+            series.seconds += seconds
+            series.buckets[bisect_left(BUCKETS, seconds)] += 1
+            series.retries += span.retries
+            series.bytes += span.bytes
+            if span.error:
+                series.errors += 1
+            for code, count in span.status_codes.items():
+                series.status_codes[code] = series.status_codes.get(code, 0) + count
+            # Time spent in a service, counted once for nested calls
+            if span.outermost:
+                self._service_seconds[span.service] = self._service_seconds.get(span.service, 0.0) + seconds
+            self._spans.append(span)
+            listeners = self._listeners
+
+        for listener in listeners:
+            listener.span_finished(span)
+
+    def record_cache(self, name: str, hit: bool) -> None:
+        """Count a lookup in a named cache"""
+        with self._lock:
+            counts = self._caches.get(name)
+            if counts is None:
+                counts = self._caches[name] = [0, 0]
+            counts[0 if hit else 1] += 1
+            listeners = self._listeners
+
+        for listener in listeners:
+            listener.cache_lookup(name, hit)
+
+    def reset(self) -> None:
+        """Drop all metrics and spans"""
+        with self._lock:
+            self._series.clear()
+            self._service_seconds.clear()
+            self._caches.clear()
+            self._spans.clear()
+
+    def snapshot(self) -> Dict:
+        """
+        JSON-serializable metrics
+
+        Returns:
+            Dict with per-service totals, cache hit ratios and one entry
+            per (service, method, job, user)
+        """
+        with self._lock:
+            items = list(self._series.items())
+            service_seconds = dict(self._service_seconds)
+            caches = {name: tuple(counts) for name, counts in self._caches.items()}
+
+        services = {}
+        merged = {}
+        calls = []
+        for (service, method, job, user), series in sorted(items):
+            totals = services.setdefault(service, {'calls': 0, 'errors': 0, 'retries': 0, 'bytes': 0, 'rate_limited': 0})
+            totals['calls'] += series.calls
+            totals['errors'] += series.errors
+            totals['retries'] += series.retries
+            totals['bytes'] += series.bytes
+            totals['rate_limited'] += series.status_codes.get(429, 0)
+
+            histogram = merged.setdefault(service, _Series())
+            histogram.calls += series.calls
+            histogram.buckets = [a + b for a, b in zip(histogram.buckets, series.buckets)]
+            calls.append({
+                'service': service,
+                'method': method,
+                'job': job,
+                'user': user,
+                'calls': series.calls,
+                'errors': series.errors,
+                'retries': series.retries,
+                'bytes': series.bytes,
+                'status_codes': {str(code): count for code, count in sorted(series.status_codes.items())},
+                'latency_ms': {
+                    'mean': round(series.seconds / series.calls * 1000, 1),
+                    'p50': round(series.percentile(0.50) * 1000, 1),
+                    'p90': round(series.percentile(0.90) * 1000, 1),
+                    'p99': round(series.percentile(0.99) * 1000, 1),
+                }
+            })
+
+        for service, totals in services.items():
+            totals['seconds'] = round(service_seconds.get(service, 0.0), 3)
+            totals['p50_ms'] = round(merged[service].percentile(0.50) * 1000, 1)
+            totals['p99_ms'] = round(merged[service].percentile(0.99) * 1000, 1)
+
+        cache_stats = {
+            name: {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / (hits + misses), 3) if hits + misses else 0.0}
+            for name, (hits, misses) in sorted(caches.items())
+        }
+
+        return {'services': services, 'caches': cache_stats, 'calls': calls}
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        with self._lock:
+            items = sorted(self._series.items())
+            caches = sorted((name, tuple(counts)) for name, counts in self._caches.items())
+
+        lines = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def labels(key: tuple, **extra) -> str:
+            service, method, job, user = key
+            pairs = {'service': service, 'method': method, 'job': job, 'user': user, **extra}
+            return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + '}'
+
+        family('ping_api_calls_total', 'counter', 'External API client method calls')
+        for key, series in items:
+            lines.append(f'ping_api_calls_total{labels(key)} {series.calls}')
+
+        family('ping_api_call_errors_total', 'counter', 'Client method calls that raised')
+        for key, series in items:
+            lines.append(f'ping_api_call_errors_total{labels(key)} {series.errors}')
+
+        family('ping_api_retries_total', 'counter', 'Retried attempts inside client method calls')
+        for key, series in items:
+            lines.append(f'ping_api_retries_total{labels(key)} {series.retries}')
+
+        family('ping_api_response_bytes_total', 'counter', 'HTTP response body bytes received')
+        for key, series in items:
+            lines.append(f'ping_api_response_bytes_total{labels(key)} {series.bytes}')
+
+        family('ping_api_http_responses_total', 'counter', 'HTTP responses by status code')
+        for key, series in items:
+            for code, count in sorted(series.status_codes.items()):
+                lines.append(f'ping_api_http_responses_total{labels(key, code=code)} {count}')
+
+        family('ping_api_call_duration_seconds', 'histogram', 'Client method call latency')
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), series.buckets):
+                cumulative += count
+                lines.append(f'ping_api_call_duration_seconds_bucket{labels(key, le=bound)} {cumulative}')
+            lines.append(f'ping_api_call_duration_seconds_sum{labels(key)} {series.seconds:.6f}')
+            lines.append(f'ping_api_call_duration_seconds_count{labels(key)} {series.calls}')
+
+        family('ping_cache_lookups_total', 'counter', 'Cache lookups by result')
+        for name, (hits, misses) in caches:
+            lines.append(f'ping_cache_lookups_total{{cache="{_escape(name)}",result="hit"}} {hits}')
+            lines.append(f'ping_cache_lookups_total{{cache="{_escape(name)}",result="miss"}} {misses}')
+
+        return '\n'.join(lines) + '\n'
+
+    def spans(self, limit: Optional[int] = None) -> Dict:
+        """
+        Recent spans as an OTLP/JSON ExportTraceServiceRequest
+
+        Args:
+            limit: Only the most recent N spans
+
+        Returns:
+            Payload accepted by an OpenTelemetry collector's /v1/traces endpoint
+        """
+        with self._lock:
+            spans = list(self._spans)
+        if limit:
+            spans = spans[-limit:]
+
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', 'ping-crm')]},
+                'scopeSpans': [{
+                    'scope': {'name': 'src.telemetry'},
+                    'spans': [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide telemetry shared by every session and job"""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = Telemetry(span_buffer=int(os.getenv('TELEMETRY_SPAN_BUFFER', 2048)))
+    return _telemetry
+
+
+def record_cache(name: str, hit: bool) -> None:
+    """Count a lookup in a named cache (see Telemetry.record_cache)"""
+    get_telemetry().record_cache(name, hit)
+
+
+# ============================================================
+# TAGGING
+# ============================================================
+
+def set_tags(**tags: str) -> None:
+    """Merge job/user tags into the current context (e.g. once per Streamlit run)"""
+    _tags.set({**_tags.get(), **{key: str(value) for key, value in tags.items() if value is not None}})
+
+
+def current_tags() -> Dict[str, str]:
+    """Job/user tags of the current context"""
+    return _tags.get()
+
+
+@contextmanager
+def tagged(**tags: str):
+    """Apply job/user tags to API calls made inside the block"""
+    token = _tags.set({**_tags.get(), **{key: str(value) for key, value in tags.items() if value is not None}})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+# ============================================================
+# INSTRUMENTATION
+# ============================================================
+
+def _wrap(fn, service: str, http_retries: bool):
+    # tenacity exposes per-thread attempt statistics on the decorated function
+    retrying = getattr(fn, 'retry', None)
+    method = fn.__name__
+
+    @functools.wraps(fn)
+    def traced_call(*args, **kwargs):
+        if not ENABLED:
+            return fn(*args, **kwargs)
+
+        parent = _current_span.get()
+        span = Span(service, method, parent)
+        token = _current_span.set(span)
+        started = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration_ns = time.perf_counter_ns() - started
+            _current_span.reset(token)
+            if retrying is not None:
+                span.retries = max(retrying.statistics.get('attempt_number', 1) - 1, 0)
+            elif http_retries and span.http_requests > 1:
+                span.retries = span.http_requests - 1
+            get_telemetry().record(span)
+
+    return traced_call
+
+
+def traced(service: str, exclude: tuple = (), http_retries: bool = False):
+    """
+    Class decorator tracing every public method as `service.method`
+
+    Args:
+        service: Service label ('apollo', 'notion', 'llm', ...)
+        exclude: Public methods to leave untraced (pure helpers)
+        http_retries: Count extra HTTP requests within a call as retries
+            (for SDKs that retry internally, like openai)
+    """
+    def decorate(cls):
+        for name, value in list(vars(cls).items()):
+            if name.startswith('_') or name in exclude or not isinstance(value, types.FunctionType):
+                continue
+            setattr(cls, name, _wrap(value, service, http_retries))
+        return cls
+    return decorate
+
+
+def _record_response(status_code: int, size: int) -> None:
+    span = _current_span.get()
+    if span is not None:
+        span.http_requests += 1
+        span.status_code = status_code
+        span.status_codes[status_code] = span.status_codes.get(status_code, 0) + 1
+        span.bytes += size
+
+
+def _requests_hook(response, *args, **kwargs):
+    _record_response(response.status_code, len(response.content or b''))
+
+
+def _httpx_hook(response):
+    # Body isn't read yet when httpx calls response hooks
+    _record_response(response.status_code, int(response.headers.get('content-length') or 0))
+
+
+def instrument_session(session):
+    """Record status codes and bytes of a requests.Session's responses on the active span"""
+    session.hooks.setdefault('response', []).append(_requests_hook)
+    return session
+
+
+def instrument_httpx(client):
+    """Record status codes and bytes of an httpx.Client's responses on the active span"""
+    hooks = client.event_hooks
+    hooks.setdefault('response', []).append(_httpx_hook)
+    client.event_hooks = hooks
+    return client
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Contact Warehouse for Ping CRM
+Local system of record for companies, contacts, enrichment history and Notion
+page ids, with an outbox of changes waiting to be pushed to Notion
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .company_index import normalize_name
+from .records import json_default
+from .retry_queue import PERMANENT_ERROR_CLASSES, _timestamp
+from .sqlite_pool import get_pool
+from .telemetry import current_tags
+
+
+def contact_key(name: str) -> str:
+    """Case- and whitespace-insensitive contact name"""
+    return ' '.join((name or '').lower().split())
+
+
+class Warehouse:
+    """
+    Companies and contacts for one Notion database, plus its sync outbox
+
+    Pipelines write here first and queue the matching Notion call in
+    sync_outbox; src.warehouse_sync.SyncWorker replays the outbox into
+    Notion and stores the resulting page ids.
+    """
+
+    SYNC_BASE_DELAY_SECONDS = 30
+    SYNC_MAX_DELAY_SECONDS = 60 * 60
+    SYNC_MAX_ATTEMPTS = 8
+    # Claimed ops not finished within this are assumed lost (crashed worker)
+    SYNC_CLAIM_TIMEOUT_SECONDS = 10 * 60
+
+    def __init__(self, scope: str = '', db_path: str = None):
+        """
+        Initialize warehouse storage
+
+        Args:
+            scope: Namespace for the records, normally the Notion database id,
+                so users with different databases never share contacts
+            db_path: SQLite file (defaults to data/warehouse.db)
+        """
+        if db_path is None:
+            # Default to data directory
+            db_dir = Path(__file__).parent.parent / 'data'
+            db_dir.mkdir(exist_ok=True)
+            db_path = db_dir / 'warehouse.db'
+
+        self.scope = scope
+        self.db_path = str(db_path)
+        self.pool = get_pool(self.db_path)
+        self.pool.ensure_schema('warehouse', self.init_database)
+
+    def init_database(self):
+        """Create tables if they don't exist"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS companies (
+                    scope TEXT NOT NULL,
+                    company_key TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    apollo_id TEXT,
+                    data TEXT,
+                    tier TEXT,
+                    priority INTEGER,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (scope, company_key)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS contacts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scope TEXT NOT NULL,
+                    name_key TEXT NOT NULL,
+                    company_key TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    company TEXT NOT NULL,
+                    apollo_id TEXT,
+                    email TEXT,
+                    linkedin_url TEXT,
+                    data TEXT,
+                    page_id TEXT,
+                    sync_state TEXT NOT NULL DEFAULT 'pending',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    synced_at TIMESTAMP,
+                    UNIQUE (scope, name_key, company_key)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_contacts_company ON contacts (scope, company_key)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_contacts_page ON contacts (page_id)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS enrichment_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scope TEXT NOT NULL,
+                    contact_id INTEGER,
+                    job TEXT NOT NULL DEFAULT '',
+                    action TEXT NOT NULL,
+                    apollo_id TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sync_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scope TEXT NOT NULL,
+                    contact_id INTEGER,
+                    client TEXT NOT NULL DEFAULT '',
+                    op TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error_class TEXT,
+                    error_message TEXT,
+                    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_outbox_due ON sync_outbox (scope, client, status, next_attempt_at)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sync_meta (
+                    scope TEXT PRIMARY KEY,
+                    backfilled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+    # ============================================================
+    # READS
+    # ============================================================
+
+    def find_contact(self, contact_name: str, company_name: str) -> Optional[Dict]:
+        """
+        Find a contact by name and company
+
+        Returns:
+            Contact dict (with 'id', 'page_id' and decoded 'data') or None
+        """
+        rows = self._fetch('''
+            SELECT * FROM contacts WHERE scope = ? AND name_key = ? AND company_key = ?
+        ''', (self.scope, contact_key(contact_name), normalize_name(company_name)))
+        return rows[0] if rows else None
+
+    def find_by_page_id(self, page_id: str) -> Optional[Dict]:
+        """Find the contact synced to a Notion page"""
+        rows = self._fetch('SELECT * FROM contacts WHERE scope = ? AND page_id = ?', (self.scope, page_id))
+        return rows[0] if rows else None
+
+    def company_contacts(self, company_name: str) -> List[Dict]:
+        """All contacts stored for a company"""
+        return self._fetch('''
+            SELECT * FROM contacts WHERE scope = ? AND company_key = ? ORDER BY name
+        ''', (self.scope, normalize_name(company_name)))
+
+    def has_company(self, company_name: str) -> bool:
+        """True if any contact from the company is stored"""
+        with self.pool.connection() as conn:
+            result = conn.execute('''
+                SELECT 1 FROM contacts WHERE scope = ? AND company_key = ? LIMIT 1
+            ''', (self.scope, normalize_name(company_name))).fetchone()
+        return result is not None
+
+    def history(self, contact_id: int) -> List[Dict]:
+        """Enrichment events for a contact, newest first"""
+        return self._fetch_raw('''
+            SELECT job, action, apollo_id, created_at FROM enrichment_history
+            WHERE scope = ? AND contact_id = ? ORDER BY id DESC
+        ''', (self.scope, contact_id))
+
+    def counts(self) -> Dict[str, int]:
+        """Contacts per sync state plus the outbox backlog"""
+        with self.pool.connection() as conn:
+            states = conn.execute('''
+                SELECT sync_state, COUNT(*) FROM contacts WHERE scope = ? GROUP BY sync_state
+            ''', (self.scope,)).fetchall()
+            outbox = conn.execute('''
+                SELECT status, COUNT(*) FROM sync_outbox WHERE scope = ? GROUP BY status
+            ''', (self.scope,)).fetchall()
+
+        counts = {'synced': 0, 'pending': 0, 'failed': 0}
+        counts.update(dict(states))
+        counts['contacts'] = sum(count for _, count in states)
+        outbox = dict(outbox)
+        counts['outbox_pending'] = outbox.get('pending', 0) + outbox.get('running', 0)
+        counts['outbox_dead'] = outbox.get('dead', 0)
+        return counts
+
+    def backlog(self, all_scopes: bool = False) -> int:
+        """Changes not yet pushed to Notion (for this database, or every database)"""
+        query = "SELECT COUNT(*) FROM sync_outbox WHERE status IN ('pending', 'running')"
+        params = ()
+        if not all_scopes:
+            query += ' AND scope = ?'
+            params = (self.scope,)
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def is_backfilled(self) -> bool:
+        """True once existing Notion pages have been imported (see import_page)"""
+        with self.pool.connection() as conn:
+            result = conn.execute('SELECT 1 FROM sync_meta WHERE scope = ?', (self.scope,)).fetchone()
+        return result is not None
+
+    def mark_backfilled(self) -> None:
+        """Record that the Notion database has been imported"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                INSERT INTO sync_meta (scope) VALUES (?)
+                ON CONFLICT (scope) DO UPDATE SET backfilled_at = CURRENT_TIMESTAMP
+            ''', (self.scope,))
+
+    # ============================================================
+    # WRITES
+    # ============================================================
+
+    def save_company(self, company_data: Dict, tier: str = None, priority: int = None) -> None:
+        """Store the latest Apollo record (and tier/priority, if assigned) for a company"""
+        name = company_data.get('name', '')
+        if not name:
+            return
+
+        with self.pool.connection() as conn:
+            conn.execute('''
+                INSERT INTO companies (scope, company_key, name, apollo_id, data, tier, priority)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (scope, company_key) DO UPDATE SET
+                    name = excluded.name,
+                    apollo_id = COALESCE(excluded.apollo_id, companies.apollo_id),
+                    data = excluded.data,
+                    tier = COALESCE(excluded.tier, companies.tier),
+                    priority = COALESCE(excluded.priority, companies.priority),
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (self.scope, normalize_name(name), name, company_data.get('apollo_id'),
+                  json.dumps(company_data, default=json_default), tier, priority))
+
+    def save_contact(
+        self,
+        contact_name: str,
+        company_name: str,
+        enriched_data: Dict,
+        page_id: str = None
+    ) -> Tuple[int, str]:
+        """
+        Insert or update a contact and log the enrichment
+
+        Args:
+            contact_name: Full name of person
+            company_name: Company name
+            enriched_data: Contact data from Apollo (may be partial)
+            page_id: Notion page id, if already known
+
+        Returns:
+            Tuple of (contact_id, action) where action is 'created' or 'updated'
+        """
+        existing = self.find_contact(contact_name, company_name)
+        data = {**(existing['data'] if existing else {}), **(enriched_data or {})}
+
+        with self.pool.connection() as conn:
+            if existing:
+                contact_id, action = existing['id'], 'updated'
+                conn.execute('''
+                    UPDATE contacts
+                    SET apollo_id = COALESCE(?, apollo_id), email = COALESCE(?, email),
+                        linkedin_url = COALESCE(?, linkedin_url), data = ?,
+                        page_id = COALESCE(?, page_id), sync_state = 'pending',
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (data.get('apollo_id'), data.get('email'), data.get('linkedin_url'),
+                      json.dumps(data, default=json_default), page_id, contact_id))
+            else:
+                action = 'created'
+                contact_id = conn.execute('''
+                    INSERT INTO contacts (
+                        scope, name_key, company_key, name, company,
+                        apollo_id, email, linkedin_url, data, page_id
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (self.scope, contact_key(contact_name), normalize_name(company_name),
+                      contact_name, company_name, data.get('apollo_id'), data.get('email'),
+                      data.get('linkedin_url'), json.dumps(data, default=json_default), page_id)).lastrowid
+
+            conn.execute('''
+                INSERT INTO enrichment_history (scope, contact_id, job, action, apollo_id)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (self.scope, contact_id, current_tags().get('job', ''), action, data.get('apollo_id')))
+
+        return contact_id, action
+
+    def mark_synced(self, contact_id: int, page_id: str = None) -> None:
+        """Mark a contact as written to Notion by the caller itself"""
+        with self.pool.connection() as conn:
+            conn.execute('''
+                UPDATE contacts
+                SET page_id = COALESCE(?, page_id), sync_state = 'synced', synced_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (page_id, contact_id))
+
+    def import_page(self, row: Dict, page_id: str) -> bool:
+        """
+        Record a contact that already exists in Notion (warehouse backfill)
+
+        Args:
+            row: Identifiers from NotionClient.page_to_row
+            page_id: Notion page id
+
+        Returns:
+            True if the contact was new to the warehouse
+        """
+        name = row.get('person_name') or ''
+        if not name:
+            return False
+
+        keys = (self.scope, contact_key(name), normalize_name(row.get('company_name', '')))
+        with self.pool.connection() as conn:
+            existing = conn.execute('''
+                SELECT id FROM contacts WHERE scope = ? AND name_key = ? AND company_key = ?
+            ''', keys).fetchone()
+            if existing:
+                conn.execute('UPDATE contacts SET page_id = COALESCE(page_id, ?) WHERE id = ?', (page_id, existing[0]))
+                return False
+
+            conn.execute('''
+                INSERT INTO contacts (
+                    scope, name_key, company_key, name, company,
+                    email, linkedin_url, data, page_id, sync_state, synced_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, '{}', ?, 'synced', CURRENT_TIMESTAMP)
+            ''', (*keys, name, row.get('company_name', ''), row.get('email') or None,
+                  row.get('linkedin_url') or None, page_id))
+        return True
+
+    # ============================================================
+    # SYNC OUTBOX
+    # ============================================================
+
+    def enqueue_sync(self, op: str, payload: Dict, contact_id: int = None, client: str = '') -> None:
+        """
+        Queue a Notion call for the sync worker
+
+        A change still waiting for the same contact and op is replaced, so
+        only the latest version is pushed.
+
+        Args:
+            op: Notion client method to call ('upsert_contact', 'update_contact', ...)
+            payload: Keyword arguments for that method (JSON-serializable)
+            contact_id: Warehouse contact the call writes
+            client: Which Notion client module implements the op (page formats differ)
+        """
+        payload_json = json.dumps(payload, default=json_default)
+
+        with self.pool.connection() as conn:
+            if contact_id is not None:
+                replaced = conn.execute('''
+                    UPDATE sync_outbox
+                    SET payload = ?, attempts = 0, next_attempt_at = CURRENT_TIMESTAMP,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE scope = ? AND contact_id = ? AND client = ? AND op = ? AND status = 'pending'
+                ''', (payload_json, self.scope, contact_id, client, op)).rowcount
+                if replaced:
+                    return
+
+            conn.execute('''
+                INSERT INTO sync_outbox (scope, contact_id, client, op, payload) VALUES (?, ?, ?, ?, ?)
+            ''', (self.scope, contact_id, client, op, payload_json))
+
+    def claim_due(self, client: str = '', limit: int = 20) -> List[Dict]:
+        """
+        Claim a client's due outbox entries for this worker (oldest first)
+
+        Entries claimed by a worker that never finished them are reclaimed
+        after SYNC_CLAIM_TIMEOUT_SECONDS.
+        """
+        now = datetime.now(timezone.utc)
+        stale = _timestamp(now - timedelta(seconds=self.SYNC_CLAIM_TIMEOUT_SECONDS))
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.execute('''
+                UPDATE sync_outbox
+                SET status = 'running', updated_at = CURRENT_TIMESTAMP
+                WHERE id IN (
+                    SELECT id FROM sync_outbox
+                    WHERE scope = ? AND client = ? AND (
+                        (status = 'pending' AND next_attempt_at <= ?)
+                        OR (status = 'running' AND updated_at <= ?)
+                    )
+                    ORDER BY id LIMIT ?
+                )
+                RETURNING *
+            ''', (self.scope, client, _timestamp(now), stale, limit)).fetchall()
+
+        items = []
+        for row in sorted(rows, key=lambda r: r['id']):
+            item = dict(row)
+            item['payload'] = json.loads(item['payload'])
+            items.append(item)
+        return items
+
+    def sync_succeeded(self, item: Dict, page_id: str = None) -> None:
+        """Remove a pushed change and mark its contact synced"""
+        with self.pool.connection() as conn:
+            conn.execute('DELETE FROM sync_outbox WHERE id = ?', (item['id'],))
+            if item['contact_id'] is not None:
+                # Another change may have been queued while this one was in flight
+                conn.execute('''
+                    UPDATE contacts
+                    SET page_id = COALESCE(?, page_id),
+                        sync_state = CASE WHEN EXISTS (
+                            SELECT 1 FROM sync_outbox WHERE contact_id = contacts.id AND status = 'pending'
+                        ) THEN 'pending' ELSE 'synced' END,
+                        synced_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (page_id, item['contact_id']))
+
+    def sync_failed(self, item: Dict, error_class: str, error_message: str) -> None:
+        """Schedule a failed change for retry, or give up on permanent errors"""
+        attempts = item['attempts'] + 1
+        dead = error_class in PERMANENT_ERROR_CLASSES or attempts >= self.SYNC_MAX_ATTEMPTS
+        delay = min(self.SYNC_BASE_DELAY_SECONDS * (2 ** (attempts - 1)), self.SYNC_MAX_DELAY_SECONDS)
+
+        with self.pool.connection() as conn:
+            conn.execute('''
+                UPDATE sync_outbox
+                SET status = ?, attempts = ?, error_class = ?, error_message = ?,
+                    next_attempt_at = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', ('dead' if dead else 'pending', attempts, error_class, error_message,
+                  _timestamp(datetime.now(timezone.utc) + timedelta(seconds=delay)), item['id']))
+            if dead and item['contact_id'] is not None:
+                conn.execute("UPDATE contacts SET sync_state = 'failed' WHERE id = ?", (item['contact_id'],))
+
+    def requeue_failed(self) -> int:
+        """Retry every change the worker gave up on; returns how many"""
+        with self.pool.connection() as conn:
+            count = conn.execute('''
+                UPDATE sync_outbox
+                SET status = 'pending', attempts = 0, next_attempt_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE scope = ? AND status = 'dead'
+            ''', (self.scope,)).rowcount
+            conn.execute('''
+                UPDATE contacts SET sync_state = 'pending' WHERE scope = ? AND sync_state = 'failed'
+            ''', (self.scope,))
+        return count
+
+    def failed_changes(self) -> List[Dict]:
+        """Changes the worker gave up on, newest first"""
+        return self._fetch_raw('''
+            SELECT id, contact_id, client, op, attempts, error_class, error_message, updated_at
+            FROM sync_outbox WHERE scope = ? AND status = 'dead' ORDER BY updated_at DESC
+        ''', (self.scope,))
+
+    def _fetch(self, query: str, params) -> List[Dict]:
+        """Run a contacts SELECT and decode the data column"""
+        items = self._fetch_raw(query, params)
+        for item in items:
+            item['data'] = json.loads(item['data']) if item.get('data') else {}
+        return items
+
+    def _fetch_raw(self, query: str, params) -> List[Dict]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            rows = cursor.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
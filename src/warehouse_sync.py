@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Warehouse -> Notion Sync for Ping CRM
+A Notion-client stand-in that writes to the local warehouse, and a background
+worker that pushes queued changes to Notion at whatever pace Notion allows
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .notion_client import CompanyContacts, UpsertResult, page_to_row
+from .retry_queue import classify_error
+from .telemetry import tagged
+from .warehouse import Warehouse
+
+
+def client_name(notion) -> str:
+    """Outbox label for a Notion client ('notion_client', 'notion_sync_adapted', ...)"""
+    return type(notion).__module__.rsplit('.', 1)[-1]
+
+
+class WarehouseNotion:
+    """
+    Drop-in for a Notion client in the enrichment pipelines
+
+    Dedupe checks are answered by the warehouse and writes are stored there
+    and queued for the SyncWorker, so a pipeline never waits on Notion.
+    Until the Notion database has been imported into the warehouse, dedupe
+    checks still ask Notion so existing pages aren't recreated. Any other
+    attribute (find_stale_contacts, page_to_row, ...) is the wrapped client's.
+    """
+
+    def __init__(self, warehouse: Warehouse, notion, worker: Optional['SyncWorker'] = None):
+        """
+        Args:
+            warehouse: Warehouse scoped to the Notion database
+            notion: Notion client the worker pushes with (used for reads only here)
+            worker: SyncWorker to wake when changes are queued
+        """
+        self.warehouse = warehouse
+        self.notion = notion
+        self.worker = worker
+        self.client = client_name(notion)
+        self.last_error = None  # Writes are local; Notion errors surface in the outbox
+        self._backfilled = False
+
+    def __getattr__(self, name):
+        return getattr(self.notion, name)
+
+    def _local_only(self) -> bool:
+        if not self._backfilled:
+            self._backfilled = self.warehouse.is_backfilled()
+        return self._backfilled
+
+    def _queue(self, op: str, payload: Dict, contact_id: Optional[int]) -> None:
+        self.warehouse.enqueue_sync(op, payload, contact_id, client=self.client)
+        if self.worker:
+            self.worker.notify()
+
+    # ============================================================
+    # READS
+    # ============================================================
+
+    def find_contact(
+        self,
+        contact_name: str,
+        company_name: str,
+        email: Optional[str] = None,
+        linkedin_url: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Warehouse contact (or, before the first import, the Notion page) or None"""
+        contact = self.warehouse.find_contact(contact_name, company_name)
+        if contact or self._local_only():
+            return contact
+        if hasattr(self.notion, 'find_contact'):
+            return self.notion.find_contact(contact_name, company_name, email=email, linkedin_url=linkedin_url)
+        return {'name': contact_name} if self.notion.contact_exists(contact_name, company_name) else None
+
+    def contact_exists(
+        self,
+        contact_name: str,
+        company_name: str,
+        email: Optional[str] = None,
+        linkedin_url: Optional[str] = None
+    ) -> bool:
+        """Check if specific contact exists"""
+        return self.find_contact(contact_name, company_name, email, linkedin_url) is not None
+
+    def prefetch_company(self, company_name: str) -> Optional[CompanyContacts]:
+        """Company's contacts from the warehouse (plus Notion's, before the first import)"""
+        known = CompanyContacts()
+        if not company_name or not company_name.strip():
+            return known
+        if not self._local_only():
+            known = self.notion.prefetch_company(company_name)
+            if known is None:
+                return None
+        for contact in self.warehouse.company_contacts(company_name):
+            known.add(contact['name'], contact['email'], contact['linkedin_url'])
+        return known
+
+    def page_exists(self, company_name: str) -> bool:
+        """Check if any contacts from company exist"""
+        if self.warehouse.has_company(company_name):
+            return True
+        return False if self._local_only() else self.notion.page_exists(company_name)
+
+    # ============================================================
+    # WRITES
+    # ============================================================
+
+    def upsert_contact(
+        self,
+        contact_name: str,
+        company_name: str,
+        enriched_data: Dict,
+        company_data: Optional[Dict] = None,
+        outreach_context: Optional[str] = None,
+        page_id: Optional[str] = None,
+        checked: bool = False
+    ) -> UpsertResult:
+        """
+        Store a contact and queue its Notion upsert
+
+        The queued upsert carries the contact's page id when the warehouse
+        knows it, so the push updates that page without a lookup. checked is
+        accepted for compatibility; the push still looks up unknown pages so
+        a retried create can't duplicate one whose response was lost.
+
+        Returns:
+            UpsertResult(True, action, page_id) - page_id is None until the first push
+        """
+        if company_data:
+            self.warehouse.save_company(company_data)
+        if page_id is None:
+            stored = self.warehouse.find_contact(contact_name, company_name)
+            page_id = stored['page_id'] if stored else None
+
+        contact_id, action = self.warehouse.save_contact(contact_name, company_name, enriched_data, page_id)
+        self._queue('upsert_contact', {
+            'contact_name': contact_name,
+            'company_name': company_name,
+            'enriched_data': enriched_data,
+            'company_data': company_data,
+            'outreach_context': outreach_context,
+            'page_id': page_id
+        }, contact_id)
+        return UpsertResult(True, action, page_id)
+
+    def update_contact(
+        self,
+        page_id: str,
+        enriched_data: Dict,
+        company_data: Optional[Dict] = None
+    ) -> bool:
+        """Store a re-enriched contact and queue the update of its known page"""
+        contact = self.warehouse.find_by_page_id(page_id)
+        contact_id = None
+        if contact:
+            contact_id, _ = self.warehouse.save_contact(contact['name'], contact['company'], enriched_data, page_id)
+        elif enriched_data.get('name'):
+            company_name = (company_data or {}).get('name', '')
+            contact_id, _ = self.warehouse.save_contact(enriched_data['name'], company_name, enriched_data, page_id)
+
+        self._queue('update_contact', {
+            'page_id': page_id,
+            'enriched_data': enriched_data,
+            'company_data': company_data
+        }, contact_id)
+        return True
+
+    def create_contact_pages(
+        self,
+        company_data: Dict,
+        contacts: List[Dict],
+        tier: str,
+        priority: int
+    ) -> List[int]:
+        """
+        Store a company's new contacts and queue one Notion page per contact
+
+        Returns:
+            Warehouse ids of the contacts that were new
+        """
+        company_name = company_data.get('name', '')
+        self.warehouse.save_company(company_data, tier=tier, priority=priority)
+
+        contact_ids = []
+        existing = self.prefetch_company(company_name)
+        for contact in contacts:
+            if existing is not None:
+                exists = existing.contains(contact.get('name', ''), contact.get('email'), contact.get('linkedin_url'))
+            else:
+                exists = self.contact_exists(
+                    contact.get('name', ''),
+                    company_name,
+                    email=contact.get('email'),
+                    linkedin_url=contact.get('linkedin_url')
+                )
+            if exists:
+                continue
+            contact_id, _ = self.warehouse.save_contact(contact.get('name', 'Unknown'), company_name, contact)
+            if existing is not None:
+                existing.add(contact.get('name', ''), contact.get('email'), contact.get('linkedin_url'))
+            self._queue('create_contact_pages', {
+                'company_data': company_data,
+                'contacts': [contact],
+                'tier': tier,
+                'priority': priority
+            }, contact_id)
+            contact_ids.append(contact_id)
+
+        return contact_ids
+
+
+class SyncWorker:
+    """
+    Pushes a warehouse's outbox to Notion on a background thread
+
+    Changes are replayed in order, one at a time, through the real Notion
+    client. Only changes queued for this worker's kind of client are pushed,
+    since the contact and company pipelines write different page formats.
+    Failures are retried with backoff (see Warehouse.sync_failed). Before
+    the first push the worker imports the database's existing pages, after
+    which dedupe checks no longer touch Notion.
+    """
+
+    def __init__(self, warehouse: Warehouse, notion, batch_size: int = 20, idle_seconds: float = 5.0):
+        """
+        Args:
+            warehouse: Warehouse scoped to the Notion database
+            notion: Notion client whose methods the outbox ops name
+            batch_size: Outbox entries claimed at a time
+            idle_seconds: Poll interval when nothing is due
+        """
+        self.warehouse = warehouse
+        self.notion = notion
+        self.client = client_name(notion)
+        self.batch_size = batch_size
+        self.idle_seconds = idle_seconds
+        self.totals = {'synced': 0, 'failed': 0}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> 'SyncWorker':
+        """Start the background thread (once)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='notion-sync', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop after the change in flight"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def notify(self) -> None:
+        """Wake the worker now that a change was queued"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        with tagged(job='notion_sync'):
+            self._ensure_backfilled()
+            while not self._stop.is_set():
+                try:
+                    synced = self.sync_once()
+                except Exception as e:
+                    print(f"Notion sync error: {e}")
+                    synced = {'synced': 0, 'failed': 0}
+
+                if not (synced['synced'] or synced['failed']):
+                    self._wake.wait(self.idle_seconds)
+                    self._wake.clear()
+
+    def _ensure_backfilled(self) -> None:
+        try:
+            if not self.warehouse.is_backfilled():
+                self.backfill()
+        except Exception as e:
+            # Pushing still works; dedupe keeps asking Notion until an import succeeds
+            print(f"Notion import error: {e}")
+
+    def backfill(self) -> int:
+        """
+        Import the database's existing pages into the warehouse
+
+        Returns:
+            Number of contacts that were new to the warehouse
+        """
+        imported = 0
+        start_cursor = None
+        while True:
+            query = {'database_id': self.notion.database_id, 'page_size': 100}
+            if start_cursor:
+                query['start_cursor'] = start_cursor
+            response = self.notion.client.databases.query(**query)
+
+            for page in response['results']:
+                if self.warehouse.import_page(page_to_row(page), page['id']):
+                    imported += 1
+
+            if not response.get('has_more'):
+                break
+            start_cursor = response['next_cursor']
+
+        self.warehouse.mark_backfilled()
+        return imported
+
+    def sync_once(self) -> Dict[str, int]:
+        """Push one batch of due changes; returns synced/failed counts"""
+        summary = {'synced': 0, 'failed': 0}
+
+        for item in self.warehouse.claim_due(self.client, limit=self.batch_size):
+            try:
+                page_id = self._push(item)
+            except Exception as e:
+                error_class, _ = classify_error(e)
+                self.warehouse.sync_failed(item, error_class, str(e))
+                summary['failed'] += 1
+            else:
+                self.warehouse.sync_succeeded(item, page_id)
+                summary['synced'] += 1
+
+        with self._lock:
+            self.totals['synced'] += summary['synced']
+            self.totals['failed'] += summary['failed']
+        return summary
+
+    def _push(self, item: Dict) -> Optional[str]:
+        """Replay one outbox entry; returns the page id if the call reveals it"""
+        result = getattr(self.notion, item['op'])(**item['payload'])
+
+        if item['op'] == 'create_contact_pages':
+            # Empty when the page already existed in Notion
+            return result[0] if result else None
+
+        success = result[0] if isinstance(result, tuple) else result
+        if not success:
+            raise getattr(self.notion, 'last_error', None) or RuntimeError(f"Notion {item['op']} failed")
+        return getattr(result, 'page_id', None) or item['payload'].get('page_id')
+
+    def finish(self, timeout: float = None) -> Dict[str, int]:
+        """Stop the background thread, then push whatever is still due (see drain)"""
+        self.stop()
+        return self.drain(timeout=timeout)
+
+    def drain(self, timeout: float = None, progress: Callable[[int], None] = None) -> Dict[str, int]:
+        """
+        Push changes in the calling thread until none are due (CLI scripts, before exit)
+
+        Args:
+            timeout: Give up after this many seconds
+            progress: Called with the remaining backlog after each batch
+
+        Returns:
+            Synced/failed counts plus the backlog left (changes backing off after errors)
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        summary = {'synced': 0, 'failed': 0}
+
+        with tagged(job='notion_sync'):
+            self._ensure_backfilled()
+            while deadline is None or time.monotonic() < deadline:
+                batch = self.sync_once()
+                summary['synced'] += batch['synced']
+                summary['failed'] += batch['failed']
+                if progress:
+                    progress(self.warehouse.backlog())
+                if not (batch['synced'] or batch['failed']):
+                    break
+
+        summary['remaining'] = self.warehouse.backlog()
+        return summary
+
+
+def open_sync(notion, scope: str, db_path: str = None) -> Tuple[WarehouseNotion, SyncWorker]:
+    """
+    Warehouse-backed client plus a running worker, for CLI scripts
+
+    Args:
+        notion: Notion client to push with
+        scope: Notion database id
+        db_path: Warehouse SQLite file (default data/warehouse.db)
+
+    Returns:
+        Tuple of (client to pass to the pipelines, worker to finish() before exit)
+    """
+    warehouse = Warehouse(scope=scope, db_path=db_path)
+    worker = SyncWorker(warehouse, notion).start()
+    return WarehouseNotion(warehouse, notion, worker), worker